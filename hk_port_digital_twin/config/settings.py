@@ -112,10 +112,10 @@ def get_enhanced_simulation_config():
     
     try:
         # Import here to avoid circular imports
-        from hk_port_digital_twin.src.utils.data_loader import extract_historical_simulation_parameters
+        from hk_port_digital_twin.src.utils.data_loader import load_historical_simulation_parameters
         
-        # Extract historical parameters
-        historical_params = extract_historical_simulation_parameters()
+        # Historical parameters from their snapshot (re-extracted when the data changes)
+        historical_params = load_historical_simulation_parameters()
         
         if historical_params:
             # Update ship arrival rate with historical data
@@ -11,6 +11,7 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from collections import deque
 import logging
 from enum import Enum
 
@@ -20,6 +21,22 @@ from .predictive_models import ShipArrivalPredictor, ProcessingTimeEstimator, Qu
 
 logger = logging.getLogger(__name__)
 
+# Human readable names of the performance metrics checked against thresholds
+PERFORMANCE_METRIC_DESCRIPTIONS = {
+    'berth_utilization': 'berth utilization rate',
+    'average_waiting_time': 'average ship waiting time',
+    'throughput_efficiency': 'container throughput efficiency',
+    'cost_per_container': 'cost per container handled',
+    'customer_satisfaction': 'customer satisfaction score',
+    'equipment_availability': 'equipment availability rate'
+}
+
+# Performance metrics where higher values are better (others: lower is better)
+HIGHER_IS_BETTER_METRICS = ['berth_utilization', 'throughput_efficiency', 'customer_satisfaction', 'equipment_availability']
+
+# Sort rank of recommendation priorities (higher = more urgent)
+PRIORITY_ORDER = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+
 class RecommendationType(Enum):
     """Types of recommendations the system can provide"""
     BERTH_ALLOCATION = "berth_allocation"
@@ -80,9 +97,11 @@ class DecisionSupportEngine:
         self.processing_estimator = ProcessingTimeEstimator()
         self.queue_forecaster = QueueLengthForecaster()
         
-        # Recommendation tracking
+        # Recommendation tracking (bounded: oldest entries are dropped)
+        self.max_active_recommendations = 1000
         self.active_recommendations = []
         self.recommendation_history = []
+        self.timeline_history = deque(maxlen=20)  # recent analyze_timeline() tables
         self.performance_metrics = {}
         
         # Configuration
@@ -151,6 +170,8 @@ class DecisionSupportEngine:
             
             # Update tracking
             self.active_recommendations.extend(recommendations)
+            if len(self.active_recommendations) > self.max_active_recommendations:
+                del self.active_recommendations[:-self.max_active_recommendations]
             
             logger.info(f"Generated {len(recommendations)} recommendations")
             
@@ -159,6 +180,179 @@ class DecisionSupportEngine:
             
         return recommendations
     
+    def analyze_timeline(self, contexts: pd.DataFrame, key_columns: Optional[List[str]] = None,
+                         max_per_context: int = 10) -> pd.DataFrame:
+        """Generate recommendations for many decision contexts at once
+        
+        Batch counterpart of analyze_situation() for timelines such as every
+        hour of a simulated month, for each Monte Carlo replication. Contexts
+        are given column-wise, one row per context:
+        
+        - ``current_time``: timestamp of the context
+        - ``queue_length``: number of active ships
+        - ``max_waiting_time``: longest waiting time of an active ship (hours)
+        - ``available_berths``: number of available berths
+        - ``resource_<name>``: resource utilization, e.g. ``resource_cranes``
+        - ``weather_impact_score``: weather impact score
+        - one column per performance metric in ``self.thresholds``
+        
+        Missing columns and NaN values behave like missing entries in a
+        DecisionContext. The same rules and thresholds as analyze_situation()
+        are evaluated as vectorized masks over all rows; contexts_to_frame()
+        converts DecisionContext objects into this layout.
+        
+        Args:
+            contexts: Columnar decision contexts
+            key_columns: Extra columns copied into the result (e.g. 'replication')
+            max_per_context: Maximum recommendations kept per context
+            
+        Returns:
+            DataFrame with one row per recommendation, ordered by context and
+            priority. ``context_index`` is the row position in ``contexts``;
+            rule, type, priority and title are categorical.
+        """
+        n_contexts = len(contexts)
+        rules = self.recommendation_rules
+        
+        def column(name: str) -> np.ndarray:
+            if name not in contexts:
+                return np.zeros(n_contexts)
+            return contexts[name].to_numpy(dtype=float, na_value=np.nan)
+        
+        def filled(name: str) -> np.ndarray:
+            return np.nan_to_num(column(name), nan=0.0)
+        
+        current_time = (pd.to_datetime(contexts['current_time']).to_numpy()
+                        if 'current_time' in contexts else np.full(n_contexts, np.datetime64('NaT', 'ns')))
+        queue_length = filled('queue_length')
+        max_waiting_time = filled('max_waiting_time')
+        available_berths = filled('available_berths')
+        weather_impact = filled('weather_impact_score')
+        
+        # Coefficient of variation across the resource columns present per row
+        resource_columns = [c for c in contexts.columns if str(c).startswith('resource_')]
+        resource_imbalance = np.zeros(n_contexts)
+        if len(resource_columns) >= 2:
+            resources = np.column_stack([column(c) for c in resource_columns])
+            present = ~np.isnan(resources)
+            counts = present.sum(axis=1)
+            values = np.where(present, resources, 0.0)
+            means = values.sum(axis=1) / np.maximum(counts, 1)
+            stds = np.sqrt(np.where(present, (resources - means[:, None]) ** 2, 0.0).sum(axis=1) / np.maximum(counts, 1))
+            balanced = (counts < 2) | (means <= 0)
+            resource_imbalance = np.where(balanced, 0.0, stds / np.where(balanced, 1.0, means))
+        
+        capacity = available_berths * 24  # ships per day capacity
+        predicted_peak = queue_length * rules['capacity_planning']['peak_threshold']
+        
+        parts = []
+        
+        def add_rule(mask, rule, rec_type, priority, title, value, threshold,
+                     cost, savings, confidence, expires_hours=None):
+            index = np.flatnonzero(mask)
+            if not len(index):
+                return
+            expires_at = (current_time[index] + np.timedelta64(int(expires_hours * 3600), 's')
+                          if expires_hours is not None else np.full(len(index), np.datetime64('NaT', 'ns')))
+            parts.append(pd.DataFrame({
+                'context_index': index,
+                'rule': rule,
+                'type': rec_type.value,
+                'priority': np.broadcast_to(priority, mask.shape)[index],
+                'title': title,
+                'value': np.broadcast_to(value, mask.shape)[index],
+                'threshold': threshold,
+                'estimated_cost': np.broadcast_to(cost, mask.shape)[index],
+                'estimated_savings': np.broadcast_to(savings, mask.shape)[index],
+                'confidence': confidence,
+                'expires_at': expires_at
+            }))
+        
+        # Berth allocation
+        threshold = rules['berth_allocation']['queue_length_threshold']
+        add_rule(queue_length > threshold, 'berth_queue', RecommendationType.BERTH_ALLOCATION,
+                 Priority.HIGH.value, "Optimize Berth Allocation for Long Queue",
+                 queue_length, threshold, 5000.0, 25000.0, 0.8)
+        threshold = rules['berth_allocation']['utilization_threshold']
+        berth_utilization = filled('resource_berths')
+        add_rule(berth_utilization > threshold, 'berth_util', RecommendationType.CAPACITY_PLANNING,
+                 Priority.MEDIUM.value, "Consider Additional Berth Capacity",
+                 berth_utilization, threshold, 500000.0, 200000.0, 0.7)
+        
+        # Resource utilization
+        threshold = rules['resource_optimization']['crane_utilization_threshold']
+        crane_utilization = filled('resource_cranes')
+        add_rule(crane_utilization > threshold, 'crane_opt', RecommendationType.RESOURCE_OPTIMIZATION,
+                 Priority.HIGH.value, "Optimize Crane Allocation",
+                 crane_utilization, threshold, 10000.0, 50000.0, 0.85)
+        add_rule(resource_imbalance > 0.3, 'resource_balance', RecommendationType.RESOURCE_OPTIMIZATION,
+                 Priority.MEDIUM.value, "Rebalance Resource Allocation",
+                 resource_imbalance, 0.3, 15000.0, 75000.0, 0.75)
+        
+        # Capacity planning
+        capacity_threshold = capacity * (1 - rules['capacity_planning']['capacity_buffer'])
+        add_rule((queue_length > 0) & (predicted_peak > capacity_threshold), 'capacity_plan',
+                 RecommendationType.CAPACITY_PLANNING, Priority.MEDIUM.value, "Plan for Capacity Expansion",
+                 predicted_peak, np.nan, 2000000.0, 500000.0, 0.6)
+        
+        # Performance issues
+        for metric, threshold in self.thresholds.items():
+            current = filled(metric)
+            if metric in HIGHER_IS_BETTER_METRICS:
+                mask, action = current < threshold, "improve"
+            else:
+                mask, action = current > threshold, "reduce"
+            gap_percent = np.abs(current - threshold) / threshold * 100
+            description = PERFORMANCE_METRIC_DESCRIPTIONS.get(metric, metric)
+            add_rule(mask, f'perf_{metric}', RecommendationType.PERFORMANCE_IMPROVEMENT,
+                     np.where(gap_percent < 20, Priority.MEDIUM.value, Priority.HIGH.value),
+                     f"{action.title()} {description.title()}",
+                     current, threshold, gap_percent * 1000, gap_percent * 5000, 0.7)
+        
+        # Emergency situations
+        threshold = rules['emergency_response']['critical_waiting_time']
+        add_rule((queue_length > 0) & (max_waiting_time > threshold), 'emergency_wait',
+                 RecommendationType.EMERGENCY_RESPONSE, Priority.CRITICAL.value, "Critical Waiting Time Alert",
+                 max_waiting_time, threshold, 20000.0, 100000.0, 0.95, expires_hours=2)
+        threshold = rules['emergency_response']['severe_weather_threshold']
+        add_rule(weather_impact > threshold, 'weather_emergency', RecommendationType.EMERGENCY_RESPONSE,
+                 Priority.HIGH.value, "Severe Weather Response",
+                 weather_impact, threshold, 50000.0, 500000.0, 0.9, expires_hours=6)
+        
+        columns = ['context_index', 'current_time', *(key_columns or []), 'rule', 'type', 'priority', 'title',
+                   'value', 'threshold', 'estimated_cost', 'estimated_savings', 'confidence', 'expires_at']
+        if not parts:
+            table = pd.DataFrame(columns=columns)
+        else:
+            table = pd.concat(parts, ignore_index=True)
+            table['current_time'] = current_time[table['context_index'].to_numpy()]
+            
+            # Filter out expired recommendations
+            expires_at = table['expires_at'].to_numpy()
+            table = table[np.isnat(expires_at) | (expires_at > table['current_time'].to_numpy())]
+            
+            # Same ordering as _prioritize_recommendations, per context
+            priority_rank = table['priority'].map(PRIORITY_ORDER).to_numpy()
+            order = np.lexsort((
+                table['estimated_cost'].to_numpy(),
+                -table['confidence'].to_numpy(),
+                -priority_rank,
+                table['context_index'].to_numpy()
+            ))
+            table = table.iloc[order]
+            table = table[table.groupby('context_index').cumcount() < max_per_context]
+            
+            for key in key_columns or []:
+                table[key] = contexts[key].to_numpy()[table['context_index'].to_numpy()]
+            table = table[columns].reset_index(drop=True)
+        
+        for name in ('rule', 'type', 'priority', 'title'):
+            table[name] = table[name].astype('category')
+        
+        self.timeline_history.append(table)
+        logger.info(f"Generated {len(table)} recommendations for {n_contexts} contexts")
+        return table
+    
     def _analyze_berth_allocation(self, context: DecisionContext) -> List[Recommendation]:
         """Analyze berth allocation and generate recommendations"""
         recommendations = []
@@ -350,7 +544,7 @@ class DecisionSupportEngine:
                 current_value = context.performance_metrics.get(metric, 0.0)
                 
                 # Determine if performance is below threshold
-                if metric in ['berth_utilization', 'throughput_efficiency', 'customer_satisfaction', 'equipment_availability']:
+                if metric in HIGHER_IS_BETTER_METRICS:
                     # Higher is better
                     if current_value < threshold:
                         recommendations.append(self._create_performance_recommendation(
@@ -446,16 +640,7 @@ class DecisionSupportEngine:
                                          context: DecisionContext, action: str) -> Recommendation:
         """Create a performance improvement recommendation"""
         
-        metric_descriptions = {
-            'berth_utilization': 'berth utilization rate',
-            'average_waiting_time': 'average ship waiting time',
-            'throughput_efficiency': 'container throughput efficiency',
-            'cost_per_container': 'cost per container handled',
-            'customer_satisfaction': 'customer satisfaction score',
-            'equipment_availability': 'equipment availability rate'
-        }
-        
-        description = metric_descriptions.get(metric, metric)
+        description = PERFORMANCE_METRIC_DESCRIPTIONS.get(metric, metric)
         gap = abs(current - threshold)
         gap_percent = (gap / threshold) * 100
         
@@ -505,11 +690,9 @@ class DecisionSupportEngine:
             return []
             
         # Sort by priority and confidence
-        priority_order = {Priority.CRITICAL: 4, Priority.HIGH: 3, Priority.MEDIUM: 2, Priority.LOW: 1}
-        
         sorted_recommendations = sorted(
             recommendations,
-            key=lambda r: (priority_order[r.priority], r.confidence, -r.estimated_cost),
+            key=lambda r: (PRIORITY_ORDER[r.priority.value], r.confidence, -r.estimated_cost),
             reverse=True
         )
         
@@ -559,6 +742,22 @@ class DecisionSupportEngine:
             'net_benefit': total_savings - total_cost
         }
 
+def contexts_to_frame(contexts: List[DecisionContext]) -> pd.DataFrame:
+    """Convert decision contexts into the columnar layout of analyze_timeline()"""
+    rows = []
+    for context in contexts:
+        row = {
+            'current_time': context.current_time,
+            'queue_length': len(context.active_ships),
+            'max_waiting_time': max([ship.get('waiting_time', 0) for ship in context.active_ships], default=0.0),
+            'available_berths': len(context.available_berths),
+            'weather_impact_score': (context.weather_conditions or {}).get('impact_score', 0.0)
+        }
+        row.update({f'resource_{name}': value for name, value in context.resource_utilization.items()})
+        row.update(context.performance_metrics)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
 def create_sample_decision_context() -> DecisionContext:
     """Create sample decision context for testing"""
     return DecisionContext(
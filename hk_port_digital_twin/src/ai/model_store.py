@@ -0,0 +1,220 @@
+# Comments for context:
+# This module persists the trained state of the predictive models (pattern
+# tables, fitted statistics and coefficients) so they can be restored at
+# startup instead of being re-trained from raw data frames every time.
+#
+# Approach: each model exposes get_state()/set_state() with JSON-serializable
+# state. The store writes one versioned JSON artifact per model, tagged with a
+# fingerprint of the training data, and only re-trains when the fingerprint,
+# the model class or its state version changes.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Version of the artifact layout written by ModelStore
+MODEL_STORE_FORMAT_VERSION = 1
+
+# Default location of persisted model artifacts
+DEFAULT_MODEL_DIR = (Path(__file__).parent.parent.parent / "data" / "models").resolve()
+
+
+def data_fingerprint(*frames: Optional[pd.DataFrame]) -> str:
+    """Compute a stable fingerprint of one or more training data frames
+
+    The fingerprint covers column names, dtypes and every row value, so any
+    change in the underlying data produces a different fingerprint.
+
+    Args:
+        frames: Training data frames (None counts as an empty frame)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        if frame is None:
+            frame = pd.DataFrame()
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode())
+        digest.update(str(len(frame)).encode())
+        if not frame.empty:
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def to_serializable(value: Any) -> Any:
+    """Convert numpy and pandas values in model state to plain JSON types"""
+    if isinstance(value, dict):
+        return {str(key): to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_serializable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_serializable(value.tolist())
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return None if np.isnan(value) else value
+    return value
+
+
+class ModelStore:
+    """Persists trained predictive model state as versioned JSON artifacts"""
+
+    def __init__(self, directory: Union[str, Path] = None):
+        self.directory = Path(directory) if directory is not None else DEFAULT_MODEL_DIR
+        self.stats = {'hits': 0, 'misses': 0, 'saves': 0}
+
+    def artifact_path(self, name: str) -> Path:
+        """Path of the artifact for a named model"""
+        return self.directory / f"{name}.json"
+
+    def save(self, name: str, model: Any, fingerprint: str) -> Path:
+        """Serialize a model's trained state to disk
+
+        The artifact is written to a temporary file and atomically moved into
+        place so readers never see a partially written file.
+
+        Args:
+            name: Artifact name, e.g. 'ship_arrival_predictor'
+            model: Model exposing get_state()
+            fingerprint: Fingerprint of the data the model was trained on
+
+        Returns:
+            Path of the written artifact
+        """
+        artifact = {
+            'format_version': MODEL_STORE_FORMAT_VERSION,
+            'model_class': type(model).__name__,
+            'state_version': getattr(model, 'STATE_VERSION', 1),
+            'fingerprint': fingerprint,
+            'saved_at': datetime.now().isoformat(),
+            'state': to_serializable(model.get_state())
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.artifact_path(name)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(artifact, f)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self.stats['saves'] += 1
+        logger.info(f"Saved model artifact {path}")
+        return path
+
+    def read_artifact(self, name: str) -> Optional[Dict]:
+        """Read a raw artifact, or None if it is missing or unreadable"""
+        path = self.artifact_path(name)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading model artifact {path}: {e}")
+            return None
+
+    def load(self, name: str, model: Any, fingerprint: Optional[str] = None) -> bool:
+        """Restore a model's trained state from disk
+
+        Args:
+            name: Artifact name
+            model: Model exposing set_state()
+            fingerprint: Expected training data fingerprint; None accepts any
+
+        Returns:
+            True if the state was restored, False if the artifact is missing,
+            stale or was written for another model class or version
+        """
+        artifact = self.read_artifact(name)
+        if artifact is None:
+            self.stats['misses'] += 1
+            return False
+
+        stale_reason = None
+        if artifact.get('format_version') != MODEL_STORE_FORMAT_VERSION:
+            stale_reason = 'store format version changed'
+        elif artifact.get('model_class') != type(model).__name__:
+            stale_reason = f"artifact belongs to {artifact.get('model_class')}"
+        elif artifact.get('state_version') != getattr(model, 'STATE_VERSION', 1):
+            stale_reason = 'model state version changed'
+        elif fingerprint is not None and artifact.get('fingerprint') != fingerprint:
+            stale_reason = 'training data changed'
+
+        if stale_reason:
+            logger.info(f"Model artifact {name} is stale: {stale_reason}")
+            self.stats['misses'] += 1
+            return False
+
+        try:
+            model.set_state(artifact['state'])
+        except Exception as e:
+            logger.error(f"Error restoring model artifact {name}: {e}")
+            self.stats['misses'] += 1
+            return False
+
+        self.stats['hits'] += 1
+        logger.info(f"Loaded model artifact {name}")
+        return True
+
+    def load_or_train(self, name: str, model: Any, train: Callable[[], None],
+                      *frames: Optional[pd.DataFrame]) -> bool:
+        """Restore a model from disk, re-training only when its data changed
+
+        Args:
+            name: Artifact name
+            model: Model exposing get_state()/set_state()
+            train: Callable that trains the model from the given frames
+            frames: Training data frames used for the fingerprint
+
+        Returns:
+            True if the model was re-trained, False if it was loaded from disk
+        """
+        fingerprint = data_fingerprint(*frames)
+        if self.load(name, model, fingerprint):
+            return False
+
+        train()
+        try:
+            self.save(name, model, fingerprint)
+        except Exception as e:
+            logger.error(f"Error saving model artifact {name}: {e}")
+        return True
+
+    def list_artifacts(self) -> List[Dict]:
+        """Summarize the artifacts in the store directory"""
+        if not self.directory.exists():
+            return []
+
+        summaries = []
+        for path in sorted(self.directory.glob('*.json')):
+            artifact = self.read_artifact(path.stem)
+            if artifact is None:
+                continue
+            summaries.append({
+                'name': path.stem,
+                'model_class': artifact.get('model_class'),
+                'state_version': artifact.get('state_version'),
+                'fingerprint': artifact.get('fingerprint'),
+                'saved_at': artifact.get('saved_at'),
+                'size_bytes': path.stat().st_size
+            })
+        return summaries
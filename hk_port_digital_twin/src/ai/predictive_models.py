@@ -16,10 +16,65 @@ from scipy import stats
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 import warnings
+from collections import OrderedDict
 warnings.filterwarnings('ignore')
 
+try:
+    from .model_store import ModelStore
+except ImportError:
+    from model_store import ModelStore
+
 logger = logging.getLogger(__name__)
 
+# Number of record keys remembered by the online update() methods, so the
+# same live snapshot can be folded in repeatedly without double counting
+MAX_SEEN_UPDATE_KEYS = 10000
+
+def _merge_running_stats(stats: Optional[Dict], values) -> Dict:
+    """Fold a batch of values into running count/mean/M2 statistics
+    
+    Uses the pairwise form of Welford's algorithm (Chan et al.) so a whole
+    batch is merged in one step. NaN values are skipped.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    stats = stats or {'count': 0, 'mean': np.nan, 'm2': 0.0}
+    if values.size == 0:
+        return stats
+    
+    batch_count = values.size
+    batch_mean = values.mean()
+    batch_m2 = float(((values - batch_mean) ** 2).sum())
+    if stats['count'] == 0:
+        return {'count': batch_count, 'mean': float(batch_mean), 'm2': batch_m2}
+    
+    total = stats['count'] + batch_count
+    delta = batch_mean - stats['mean']
+    return {
+        'count': total,
+        'mean': float(stats['mean'] + delta * batch_count / total),
+        'm2': float(stats['m2'] + batch_m2 + delta ** 2 * stats['count'] * batch_count / total)
+    }
+
+def _running_std(stats: Dict) -> float:
+    """Sample standard deviation of running statistics (NaN below two values)"""
+    if stats['count'] < 2:
+        return np.nan
+    return float(np.sqrt(stats['m2'] / (stats['count'] - 1)))
+
+def _filter_unseen_rows(rows: pd.DataFrame, key_columns: List[str], seen_keys: OrderedDict) -> pd.DataFrame:
+    """Drop rows whose key was already folded in and remember the new keys"""
+    keys = list(rows[key_columns].astype(str).itertuples(index=False, name=None))
+    is_new = ~pd.Index(keys).duplicated() & np.array([key not in seen_keys for key in keys], dtype=bool)
+    
+    for key, new in zip(keys, is_new):
+        if new:
+            seen_keys[key] = True
+    while len(seen_keys) > MAX_SEEN_UPDATE_KEYS:
+        seen_keys.popitem(last=False)
+    
+    return rows[is_new]
+
 @dataclass
 class ArrivalPrediction:
     """Prediction result for ship arrivals"""
@@ -49,12 +104,36 @@ class QueueForecast:
 class ShipArrivalPredictor:
     """Predicts ship arrivals based on historical patterns and external factors"""
     
+    # Version of the trained state layout persisted by the model store
+    STATE_VERSION = 2
+    
     def __init__(self):
         self.historical_data = pd.DataFrame()
         self.seasonal_patterns = {}
         self.ship_type_patterns = {}
         self.is_trained = False
         
+        # Dense lookup tables precomputed at train time, indexed by
+        # hour (0-23), weekday (0=Monday) and month - 1
+        self.hourly_factors = np.ones(24)
+        self.daily_factors = np.ones(7)
+        self.monthly_factors = np.ones(12)
+        self.history_days = 1
+        self.overall_arrivals_per_day = 0.0
+        self.training_records = 0
+        
+        # Running statistics behind the patterns, extended by update():
+        # arrival counts by hour/weekday/month and per ship type by hour,
+        # size statistics per ship type and the observed time span
+        self.hourly_counts = np.zeros(24)
+        self.daily_counts = np.zeros(7)
+        self.monthly_counts = np.zeros(12)
+        self.type_hour_counts = {}
+        self.size_stats = {}
+        self.first_arrival = None
+        self.last_arrival = None
+        self._seen_update_keys = OrderedDict()
+        
     def load_historical_data(self, vessel_data: pd.DataFrame) -> None:
         """Load historical vessel arrival data for training"""
         try:
@@ -88,33 +167,175 @@ class ShipArrivalPredictor:
             return
             
         try:
-            # Hourly patterns
-            hourly_arrivals = self.historical_data.groupby('hour').size()
-            self.seasonal_patterns['hourly'] = hourly_arrivals.to_dict()
-            
-            # Daily patterns (day of week)
-            daily_arrivals = self.historical_data.groupby('day_of_week').size()
-            self.seasonal_patterns['daily'] = daily_arrivals.to_dict()
-            
-            # Monthly patterns
-            monthly_arrivals = self.historical_data.groupby('month').size()
-            self.seasonal_patterns['monthly'] = monthly_arrivals.to_dict()
-            
-            # Ship type patterns
-            for ship_type in self.historical_data['ship_type'].unique():
-                type_data = self.historical_data[self.historical_data['ship_type'] == ship_type]
-                if len(type_data) > 0:
-                    self.ship_type_patterns[ship_type] = {
-                        'avg_arrivals_per_day': len(type_data) / max(1, (self.historical_data['arrival_time'].max() - self.historical_data['arrival_time'].min()).days),
-                        'preferred_hours': type_data.groupby('hour').size().idxmax() if len(type_data) > 0 else 12,
-                        'avg_size': type_data['size'].mean() if 'size' in type_data.columns else 1000
-                    }
+            self._reset_running_stats()
+            self._fold_arrivals(self.historical_data)
+            self.training_records = len(self.historical_data)
+            self._refresh_patterns()
             
             logger.info("Seasonal pattern analysis completed")
             
         except Exception as e:
             logger.error(f"Error in seasonal pattern analysis: {e}")
     
+    def update(self, new_rows: pd.DataFrame, key_columns: Optional[List[str]] = None) -> int:
+        """Fold new arrival records into the trained patterns without a full retrain
+        
+        Args:
+            new_rows: New arrivals with 'arrival_time' and 'ship_type' columns
+                ('size' is optional)
+            key_columns: Columns identifying a vessel call, e.g.
+                ['call_sign', 'arrival_time']. Rows already folded in are
+                skipped, so the same live snapshot can be passed repeatedly.
+                
+        Returns:
+            Number of arrivals folded into the model
+        """
+        try:
+            if new_rows is None or new_rows.empty:
+                return 0
+            if not all(col in new_rows.columns for col in ['arrival_time', 'ship_type']):
+                logger.warning("Missing required columns for arrival model update")
+                return 0
+            
+            rows = new_rows.copy()
+            rows['arrival_time'] = pd.to_datetime(rows['arrival_time'], errors='coerce')
+            rows = rows[rows['arrival_time'].notna()]
+            if key_columns:
+                rows = _filter_unseen_rows(rows, key_columns, self._seen_update_keys)
+            if rows.empty:
+                return 0
+            
+            rows['hour'] = rows['arrival_time'].dt.hour
+            rows['day_of_week'] = rows['arrival_time'].dt.dayofweek
+            rows['month'] = rows['arrival_time'].dt.month
+            
+            self._fold_arrivals(rows)
+            self.training_records += len(rows)
+            self._refresh_patterns()
+            self.is_trained = True
+            
+            logger.debug(f"Folded {len(rows)} new arrivals into the arrival model")
+            return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Error updating arrival model: {e}")
+            return 0
+    
+    def _reset_running_stats(self) -> None:
+        """Clear the running statistics before a full retrain"""
+        self.hourly_counts = np.zeros(24)
+        self.daily_counts = np.zeros(7)
+        self.monthly_counts = np.zeros(12)
+        self.type_hour_counts = {}
+        self.size_stats = {}
+        self.first_arrival = None
+        self.last_arrival = None
+    
+    def _fold_arrivals(self, rows: pd.DataFrame) -> None:
+        """Add arrival records (with hour/day_of_week/month columns) to the running statistics"""
+        rows = rows[rows['arrival_time'].notna()]
+        if rows.empty:
+            return
+        
+        self.hourly_counts += np.bincount(rows['hour'].to_numpy(dtype=int), minlength=24)
+        self.daily_counts += np.bincount(rows['day_of_week'].to_numpy(dtype=int), minlength=7)
+        self.monthly_counts += np.bincount(rows['month'].to_numpy(dtype=int) - 1, minlength=12)
+        
+        for ship_type, type_rows in rows.groupby('ship_type', sort=False):
+            hour_counts = self.type_hour_counts.setdefault(ship_type, np.zeros(24))
+            hour_counts += np.bincount(type_rows['hour'].to_numpy(dtype=int), minlength=24)
+            if 'size' in type_rows.columns:
+                self.size_stats[ship_type] = _merge_running_stats(self.size_stats.get(ship_type), type_rows['size'])
+        
+        first, last = rows['arrival_time'].min(), rows['arrival_time'].max()
+        self.first_arrival = first if self.first_arrival is None else min(self.first_arrival, first)
+        self.last_arrival = last if self.last_arrival is None else max(self.last_arrival, last)
+    
+    def _refresh_patterns(self) -> None:
+        """Derive the pattern dictionaries and lookup tables from the running statistics"""
+        # Hourly, daily (day of week) and monthly patterns
+        self.seasonal_patterns['hourly'] = {hour: int(count) for hour, count in enumerate(self.hourly_counts) if count}
+        self.seasonal_patterns['daily'] = {day: int(count) for day, count in enumerate(self.daily_counts) if count}
+        self.seasonal_patterns['monthly'] = {month + 1: int(count) for month, count in enumerate(self.monthly_counts) if count}
+        
+        # Span of the history in days
+        if self.first_arrival is not None:
+            self.history_days = max(1, (self.last_arrival - self.first_arrival).days)
+        self.overall_arrivals_per_day = self.training_records / self.history_days
+        
+        # Ship type patterns
+        for ship_type, hour_counts in self.type_hour_counts.items():
+            self.ship_type_patterns[ship_type] = {
+                'avg_arrivals_per_day': hour_counts.sum() / self.history_days,
+                'preferred_hours': int(np.argmax(hour_counts)),
+                'avg_size': self.size_stats.get(ship_type, {}).get('mean', np.nan)
+            }
+        
+        self._build_lookup_tables()
+    
+    def _build_lookup_tables(self) -> None:
+        """Precompute normalized hourly, daily and monthly factors as dense arrays
+        
+        Slots without observations count as one arrival and each table is
+        normalized by the mean count of the observed slots (at least 1).
+        """
+        for pattern_name, size, first_key, attribute in (
+            ('hourly', 24, 0, 'hourly_factors'),
+            ('daily', 7, 0, 'daily_factors'),
+            ('monthly', 12, 1, 'monthly_factors')
+        ):
+            pattern = self.seasonal_patterns.get(pattern_name, {})
+            table = np.ones(size)
+            for key, count in pattern.items():
+                table[int(key) - first_key] = count
+            normalizer = max(1, np.mean(list(pattern.values()))) if pattern else 1
+            setattr(self, attribute, table / normalizer)
+    
+    def get_state(self) -> Dict:
+        """Trained state for the model store"""
+        return {
+            'seasonal_patterns': self.seasonal_patterns,
+            'ship_type_patterns': self.ship_type_patterns,
+            'hourly_factors': self.hourly_factors,
+            'daily_factors': self.daily_factors,
+            'monthly_factors': self.monthly_factors,
+            'history_days': self.history_days,
+            'overall_arrivals_per_day': self.overall_arrivals_per_day,
+            'training_records': self.training_records,
+            'hourly_counts': self.hourly_counts,
+            'daily_counts': self.daily_counts,
+            'monthly_counts': self.monthly_counts,
+            'type_hour_counts': self.type_hour_counts,
+            'size_stats': self.size_stats,
+            'first_arrival': self.first_arrival.isoformat() if self.first_arrival is not None else None,
+            'last_arrival': self.last_arrival.isoformat() if self.last_arrival is not None else None,
+            'is_trained': self.is_trained
+        }
+    
+    def set_state(self, state: Dict) -> None:
+        """Restore trained state saved by get_state()"""
+        self.seasonal_patterns = {
+            pattern_name: {int(key): count for key, count in pattern.items()}
+            for pattern_name, pattern in state['seasonal_patterns'].items()
+        }
+        self.ship_type_patterns = state['ship_type_patterns']
+        self.hourly_factors = np.asarray(state['hourly_factors'], dtype=float)
+        self.daily_factors = np.asarray(state['daily_factors'], dtype=float)
+        self.monthly_factors = np.asarray(state['monthly_factors'], dtype=float)
+        self.history_days = state['history_days']
+        self.overall_arrivals_per_day = state['overall_arrivals_per_day']
+        self.training_records = state['training_records']
+        self.hourly_counts = np.asarray(state['hourly_counts'], dtype=float)
+        self.daily_counts = np.asarray(state['daily_counts'], dtype=float)
+        self.monthly_counts = np.asarray(state['monthly_counts'], dtype=float)
+        self.type_hour_counts = {ship_type: np.asarray(counts, dtype=float)
+                                 for ship_type, counts in state['type_hour_counts'].items()}
+        self.size_stats = {ship_type: {name: np.nan if value is None else value for name, value in stats.items()}
+                           for ship_type, stats in state['size_stats'].items()}
+        self.first_arrival = pd.Timestamp(state['first_arrival']) if state['first_arrival'] else None
+        self.last_arrival = pd.Timestamp(state['last_arrival']) if state['last_arrival'] else None
+        self.is_trained = state['is_trained']
+    
     def train_arrival_model(self) -> None:
         """Train the arrival prediction model"""
         if self.historical_data.empty:
@@ -153,20 +374,12 @@ class ShipArrivalPredictor:
                 base_rate = self.ship_type_patterns[ship_type]['avg_arrivals_per_day']
             else:
                 # Overall average arrival rate
-                total_days = max(1, (self.historical_data['arrival_time'].max() - self.historical_data['arrival_time'].min()).days)
-                base_rate = len(self.historical_data) / total_days
-            
-            # Adjust for time of day
-            current_hour = current_time.hour
-            hourly_factor = self.seasonal_patterns.get('hourly', {}).get(current_hour, 1) / max(1, np.mean(list(self.seasonal_patterns.get('hourly', {1: 1}).values())))
-            
-            # Adjust for day of week
-            current_dow = current_time.weekday()
-            daily_factor = self.seasonal_patterns.get('daily', {}).get(current_dow, 1) / max(1, np.mean(list(self.seasonal_patterns.get('daily', {1: 1}).values())))
+                base_rate = self.overall_arrivals_per_day
             
-            # Adjust for month
-            current_month = current_time.month
-            monthly_factor = self.seasonal_patterns.get('monthly', {}).get(current_month, 1) / max(1, np.mean(list(self.seasonal_patterns.get('monthly', {1: 1}).values())))
+            # Adjust for time of day, day of week and month
+            hourly_factor = float(self.hourly_factors[current_time.hour])
+            daily_factor = float(self.daily_factors[current_time.weekday()])
+            monthly_factor = float(self.monthly_factors[current_time.month - 1])
             
             # Combined adjustment factor
             adjustment_factor = (hourly_factor + daily_factor + monthly_factor) / 3
@@ -188,7 +401,7 @@ class ShipArrivalPredictor:
             )
             
             # Calculate probability based on model confidence
-            probability = min(0.9, 0.5 + (len(self.historical_data) / 1000) * 0.4)
+            probability = min(0.9, 0.5 + (self.training_records / 1000) * 0.4)
             
             factors = {
                 'base_rate': base_rate,
@@ -218,9 +431,93 @@ class ShipArrivalPredictor:
                 factors={'error_fallback': 1.0}
             )
 
+    def predict_arrivals(self, times, ship_types=None,
+                         rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+        """Predict the next arrival for many query times in one call
+        
+        Vectorized counterpart of predict_next_arrival() for the dashboard and
+        optimizers: rate factors come from the lookup tables built at train
+        time and all arrival times are sampled in one draw.
+        
+        Args:
+            times: Query timestamps (anything accepted by pd.to_datetime)
+            ship_types: None (all ship types), one ship type for every query,
+                or one ship type per query
+            rng: Optional random generator for the sampled arrival times
+            
+        Returns:
+            DataFrame with one row per query: query_time, ship_type,
+            predicted_time, lower_bound, upper_bound, expected_hours,
+            probability, base_rate and the hourly/daily/monthly/adjustment factors
+        """
+        query_times = pd.DatetimeIndex(pd.to_datetime(times))
+        n_queries = len(query_times)
+        sampler = rng if rng is not None else np.random
+        
+        if ship_types is None or isinstance(ship_types, str):
+            requested_types = pd.Series([ship_types] * n_queries, dtype=object)
+        else:
+            requested_types = pd.Series(list(ship_types), dtype=object)
+        reported_types = requested_types.where(requested_types.notna() & (requested_types != ''), 'container')
+        
+        if not self.is_trained:
+            logger.warning("Model not trained, using default predictions")
+            hours_until_arrival = sampler.uniform(2, 6, n_queries)
+            predicted_times = query_times + pd.to_timedelta(hours_until_arrival, unit='h')
+            return pd.DataFrame({
+                'query_time': query_times,
+                'ship_type': reported_types.to_numpy(),
+                'predicted_time': predicted_times,
+                'lower_bound': predicted_times - pd.Timedelta(hours=1),
+                'upper_bound': predicted_times + pd.Timedelta(hours=1),
+                'expected_hours': np.full(n_queries, 4.0),
+                'probability': np.full(n_queries, 0.5),
+                'base_rate': np.nan,
+                'hourly_factor': np.nan,
+                'daily_factor': np.nan,
+                'monthly_factor': np.nan,
+                'adjustment_factor': np.nan
+            })
+        
+        type_rates = {ship_type: pattern['avg_arrivals_per_day'] for ship_type, pattern in self.ship_type_patterns.items()}
+        base_rate = requested_types.map(type_rates).fillna(self.overall_arrivals_per_day).to_numpy(dtype=float)
+        
+        hourly_factor = self.hourly_factors[query_times.hour.to_numpy()]
+        daily_factor = self.daily_factors[query_times.dayofweek.to_numpy()]
+        monthly_factor = self.monthly_factors[query_times.month.to_numpy() - 1]
+        adjustment_factor = (hourly_factor + daily_factor + monthly_factor) / 3
+        adjusted_rate = base_rate * adjustment_factor
+        
+        # Time until next arrival (exponential distribution), 4 hours without a rate
+        has_rate = adjusted_rate > 0
+        expected_hours = np.where(has_rate, 24 / np.where(has_rate, adjusted_rate, 1.0), 4.0)
+        hours_until_arrival = np.where(has_rate, sampler.exponential(expected_hours), 4.0)
+        
+        predicted_times = query_times + pd.to_timedelta(hours_until_arrival, unit='h')
+        uncertainty = pd.to_timedelta(hours_until_arrival * 0.25, unit='h')
+        probability = min(0.9, 0.5 + (self.training_records / 1000) * 0.4)
+        
+        return pd.DataFrame({
+            'query_time': query_times,
+            'ship_type': reported_types.to_numpy(),
+            'predicted_time': predicted_times,
+            'lower_bound': predicted_times - uncertainty,
+            'upper_bound': predicted_times + uncertainty,
+            'expected_hours': expected_hours,
+            'probability': np.full(n_queries, probability),
+            'base_rate': base_rate,
+            'hourly_factor': hourly_factor,
+            'daily_factor': daily_factor,
+            'monthly_factor': monthly_factor,
+            'adjustment_factor': adjustment_factor
+        })
+
 class ProcessingTimeEstimator:
     """Estimates ship processing times based on ship characteristics and historical data"""
     
+    # Version of the trained state layout persisted by the model store
+    STATE_VERSION = 2
+    
     def __init__(self):
         self.historical_processing_times = {}
         self.size_factors = {}
@@ -233,6 +530,10 @@ class ProcessingTimeEstimator:
             'ro-ro': 1.1
         }
         self.is_trained = False
+        
+        # Running processing time statistics per ship type, extended by update()
+        self.processing_stats = {}
+        self._seen_update_keys = OrderedDict()
     
     def load_processing_data(self, processing_data: pd.DataFrame) -> None:
         """Load historical processing time data"""
@@ -247,6 +548,7 @@ class ProcessingTimeEstimator:
                         'median': type_data.median(),
                         'count': len(type_data)
                     }
+                    self.processing_stats[ship_type] = _merge_running_stats(None, type_data)
                 
                 # Analyze size factors if size data is available
                 if 'size' in processing_data.columns:
@@ -265,6 +567,81 @@ class ProcessingTimeEstimator:
         except Exception as e:
             logger.error(f"Error loading processing data: {e}")
     
+    def update(self, new_rows: pd.DataFrame, key_columns: Optional[List[str]] = None) -> int:
+        """Fold completed processing records into the statistics without a full retrain
+        
+        Means and standard deviations are updated exactly with Welford's
+        algorithm. Medians and size factors keep their values from the last
+        full load_processing_data() call (new ship types start from the mean).
+        
+        Args:
+            new_rows: Completed calls with 'ship_type' and 'processing_time'
+                (hours) columns
+            key_columns: Columns identifying a completed call, e.g.
+                ['call_sign', 'departure_time']. Rows already folded in are
+                skipped.
+                
+        Returns:
+            Number of processing records folded into the model
+        """
+        try:
+            if new_rows is None or new_rows.empty:
+                return 0
+            if not all(col in new_rows.columns for col in ['ship_type', 'processing_time']):
+                logger.warning("Missing required columns for processing time model update")
+                return 0
+            
+            rows = new_rows[new_rows['processing_time'].notna() & new_rows['ship_type'].notna()]
+            if key_columns:
+                rows = _filter_unseen_rows(rows, key_columns, self._seen_update_keys)
+            if rows.empty:
+                return 0
+            
+            for ship_type, type_rows in rows.groupby('ship_type', sort=False):
+                stats = _merge_running_stats(self.processing_stats.get(ship_type), type_rows['processing_time'])
+                self.processing_stats[ship_type] = stats
+                previous = self.historical_processing_times.get(ship_type, {})
+                self.historical_processing_times[ship_type] = {
+                    'mean': stats['mean'],
+                    'std': _running_std(stats),
+                    'median': previous.get('median', stats['mean']),
+                    'count': stats['count']
+                }
+            
+            self.is_trained = True
+            logger.debug(f"Folded {len(rows)} processing records into the processing time model")
+            return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Error updating processing time model: {e}")
+            return 0
+    
+    def get_state(self) -> Dict:
+        """Trained state for the model store"""
+        return {
+            'historical_processing_times': self.historical_processing_times,
+            'size_factors': self.size_factors,
+            'type_factors': self.type_factors,
+            'processing_stats': self.processing_stats,
+            'is_trained': self.is_trained
+        }
+    
+    def set_state(self, state: Dict) -> None:
+        """Restore trained state saved by get_state()"""
+        # Missing statistics (e.g. the std of a single record) are stored as null
+        self.historical_processing_times = {
+            ship_type: {name: np.nan if value is None else value for name, value in stats.items()}
+            for ship_type, stats in state['historical_processing_times'].items()
+        }
+        self.size_factors = {size_bin: np.nan if factor is None else factor
+                             for size_bin, factor in state['size_factors'].items()}
+        self.type_factors = state['type_factors']
+        self.processing_stats = {
+            ship_type: {name: np.nan if value is None else value for name, value in stats.items()}
+            for ship_type, stats in state['processing_stats'].items()
+        }
+        self.is_trained = state['is_trained']
+    
     def estimate_processing_time(self, ship_type: str, ship_size: float = None, 
                                containers: int = 0, cargo_volume: float = 0) -> ProcessingTimePrediction:
         """Estimate processing time for a ship"""
@@ -355,12 +732,51 @@ class ProcessingTimeEstimator:
 class QueueLengthForecaster:
     """Forecasts port queue length and waiting times"""
     
-    def __init__(self):
+    # Arrival factors indexed by hour of day (peak hours have more arrivals)
+    # and by day of week (weekdays vs weekends, 0=Monday)
+    HOUR_ARRIVAL_FACTORS = np.array([0.1, 0.1, 0.1, 0.1, 0.2, 0.3, 0.5, 0.8, 1.2, 1.5, 1.3, 1.1,
+                                     1.0, 1.1, 1.3, 1.2, 1.0, 0.8, 0.6, 0.4, 0.3, 0.2, 0.2, 0.1])
+    DAY_ARRIVAL_FACTORS = np.array([1.2, 1.3, 1.2, 1.1, 1.0, 0.7, 0.6])
+    
+    # Departures per hour: steady processing during business hours (6-22),
+    # reduced processing at night
+    HOURLY_DEPARTURES = np.where((np.arange(24) >= 6) & (np.arange(24) <= 22), 0.6, 0.2)
+    
+    # Berth efficiency by hour: day shift (6-18), evening shift (to 22), night shift
+    SHIFT_EFFICIENCY = np.select([np.arange(24) < 6, np.arange(24) <= 18, np.arange(24) <= 22],
+                                 [0.6, 1.0, 0.8], 0.6)
+    
+    # Version of the trained state layout persisted by the model store
+    STATE_VERSION = 1
+    
+    DEFAULT_ARRIVAL_RATE = 0.5  # ships per hour
+    AVG_PROCESSING_TIME = 4.0  # hours
+    NUM_BERTHS = 3  # default number of active berths
+    
+    def __init__(self, num_berths: Optional[int] = None, avg_processing_time: Optional[float] = None):
+        """Initialize the forecaster
+        
+        Args:
+            num_berths: Active berths used for waiting time estimates; see
+                PortQueueModel.berth_capacity() for values derived from the
+                berth configuration
+            avg_processing_time: Average berth occupancy per ship in hours
+        """
+        self.num_berths = num_berths if num_berths is not None else self.NUM_BERTHS
+        self.avg_processing_time = (avg_processing_time if avg_processing_time is not None
+                                    else self.AVG_PROCESSING_TIME)
         self.historical_queue_data = pd.DataFrame()
         self.arrival_predictor = ShipArrivalPredictor()
         self.processing_estimator = ProcessingTimeEstimator()
         self.current_queue = []
         
+        # Hourly baselines precomputed at load time: base arrival rate per
+        # hour of day and expected arrivals per (weekday, hour)
+        self.hourly_base_rates = np.full(24, self.DEFAULT_ARRIVAL_RATE)
+        self.expected_arrivals_table = np.ones((7, 24))
+        self.data_confidence = 0.3
+        self._build_hourly_baselines()
+        
     def load_queue_history(self, queue_data: pd.DataFrame) -> None:
         """Load historical queue length data"""
         try:
@@ -369,12 +785,57 @@ class QueueLengthForecaster:
                 self.historical_queue_data['timestamp'] = pd.to_datetime(self.historical_queue_data['timestamp'])
                 self.historical_queue_data['hour'] = self.historical_queue_data['timestamp'].dt.hour
                 self.historical_queue_data['day_of_week'] = self.historical_queue_data['timestamp'].dt.dayofweek
-                
+            
+            self._build_hourly_baselines()
+            
             logger.info(f"Loaded {len(self.historical_queue_data)} queue history records")
             
         except Exception as e:
             logger.error(f"Error loading queue history: {e}")
     
+    def _build_hourly_baselines(self) -> None:
+        """Precompute the hourly arrival baselines from the queue history
+        
+        The base rate for an hour is the mean of the historical 'arrivals' at
+        that hour (the default rate for hours without history), scaled by the
+        hour and weekday factors into a (7, 24) table of expected arrivals.
+        """
+        base_rates = np.full(24, self.DEFAULT_ARRIVAL_RATE)
+        history = self.historical_queue_data
+        
+        if not history.empty and 'arrivals' in history.columns and 'hour' in history.columns:
+            hourly_means = history.groupby('hour')['arrivals'].mean().dropna()
+            base_rates[hourly_means.index.to_numpy(dtype=int)] = hourly_means.to_numpy(dtype=float)
+        
+        self.hourly_base_rates = base_rates
+        
+        # Confidence adjustment for historical data availability
+        if not history.empty:
+            self.data_confidence = min(1.0, len(history) / 100)
+        else:
+            self.data_confidence = 0.3
+        
+        self._build_arrivals_table()
+    
+    def _build_arrivals_table(self) -> None:
+        """Scale the hourly base rates into the (weekday, hour) expected arrivals table"""
+        self.expected_arrivals_table = (
+            self.DAY_ARRIVAL_FACTORS[:, np.newaxis] * (self.hourly_base_rates * self.HOUR_ARRIVAL_FACTORS)[np.newaxis, :]
+        )
+    
+    def get_state(self) -> Dict:
+        """Trained state for the model store"""
+        return {
+            'hourly_base_rates': self.hourly_base_rates,
+            'data_confidence': self.data_confidence
+        }
+    
+    def set_state(self, state: Dict) -> None:
+        """Restore trained state saved by get_state()"""
+        self.hourly_base_rates = np.asarray(state['hourly_base_rates'], dtype=float)
+        self.data_confidence = state['data_confidence']
+        self._build_arrivals_table()
+    
     def update_current_queue(self, current_ships: List[Dict]) -> None:
         """Update the current queue state"""
         self.current_queue = current_ships.copy()
@@ -385,54 +846,21 @@ class QueueLengthForecaster:
         if current_time is None:
             current_time = datetime.now()
             
-        forecasts = []
+        current_queue_length = len(self.current_queue)
         
         try:
-            # Current queue length
-            current_queue_length = len(self.current_queue)
-            current_waiting_time = self._estimate_current_waiting_time()
+            paths = self._forecast_paths([current_time], hours_ahead, np.array([current_queue_length], dtype=float))
             
-            # Generate hourly forecasts
-            for hour in range(hours_ahead):
-                forecast_time = current_time + timedelta(hours=hour)
-                
-                # Predict arrivals for this hour
-                expected_arrivals = self._predict_hourly_arrivals(forecast_time)
-                
-                # Predict departures (ships finishing processing)
-                expected_departures = self._predict_hourly_departures(forecast_time)
-                
-                # Update queue length
-                predicted_queue_length = max(0, current_queue_length + expected_arrivals - expected_departures)
-                
-                # Estimate waiting time
-                predicted_waiting_time = self._estimate_waiting_time(predicted_queue_length, forecast_time)
-                
-                # Determine trend
-                if hour > 0:
-                    prev_length = forecasts[-1].predicted_queue_length
-                    if predicted_queue_length > prev_length * 1.1:
-                        trend = 'increasing'
-                    elif predicted_queue_length < prev_length * 0.9:
-                        trend = 'decreasing'
-                    else:
-                        trend = 'stable'
-                else:
-                    trend = 'stable'
-                
-                # Calculate confidence based on historical data availability
-                confidence = self._calculate_forecast_confidence(forecast_time)
-                
-                forecast = QueueForecast(
-                    timestamp=forecast_time,
-                    predicted_queue_length=int(predicted_queue_length),
-                    predicted_waiting_time=predicted_waiting_time,
-                    confidence=confidence,
-                    trend=trend
+            forecasts = [
+                QueueForecast(
+                    timestamp=current_time + timedelta(hours=hour),
+                    predicted_queue_length=int(paths['queue_length'][0, hour]),
+                    predicted_waiting_time=float(paths['waiting_time'][0, hour]),
+                    confidence=float(paths['confidence'][0, hour]),
+                    trend=str(paths['trend'][0, hour])
                 )
-                
-                forecasts.append(forecast)
-                current_queue_length = predicted_queue_length
+                for hour in range(hours_ahead)
+            ]
             
             logger.info(f"Generated {len(forecasts)} queue forecasts")
             return forecasts
@@ -448,46 +876,154 @@ class QueueLengthForecaster:
                 trend='stable'
             ) for i in range(hours_ahead)]
     
-    def _predict_hourly_arrivals(self, forecast_time: datetime) -> float:
-        """Predict number of arrivals in a given hour"""
-        # Simple model based on historical patterns
-        hour = forecast_time.hour
-        day_of_week = forecast_time.weekday()
-        
-        # Base arrival rate (ships per hour)
-        base_rate = 0.5  # default
-        
-        if not self.historical_queue_data.empty and 'arrivals' in self.historical_queue_data.columns:
-            # Use historical data if available
-            hour_data = self.historical_queue_data[self.historical_queue_data['hour'] == hour]
-            if not hour_data.empty:
-                base_rate = hour_data['arrivals'].mean()
-        
-        # Adjust for time patterns
-        time_factors = {
-            # Hour factors (peak hours have more arrivals)
-            'hour': {6: 0.5, 7: 0.8, 8: 1.2, 9: 1.5, 10: 1.3, 11: 1.1, 12: 1.0,
-                    13: 1.1, 14: 1.3, 15: 1.2, 16: 1.0, 17: 0.8, 18: 0.6, 19: 0.4,
-                    20: 0.3, 21: 0.2, 22: 0.2, 23: 0.1, 0: 0.1, 1: 0.1, 2: 0.1,
-                    3: 0.1, 4: 0.2, 5: 0.3},
-            # Day of week factors (weekdays vs weekends)
-            'day': {0: 1.2, 1: 1.3, 2: 1.2, 3: 1.1, 4: 1.0, 5: 0.7, 6: 0.6}
+    def forecast_queue_batch(self, start_times, hours_ahead: int = 24,
+                             initial_queue_lengths=None) -> pd.DataFrame:
+        """Forecast queue paths from many start times in one call
+        
+        Vectorized counterpart of forecast_queue_length() for backtesting and
+        long horizons (a week or more): every path is computed as one
+        cumulative array operation over a (start times, hours) matrix.
+        
+        Args:
+            start_times: Forecast start timestamps (anything accepted by pd.to_datetime)
+            hours_ahead: Number of hourly steps per path
+            initial_queue_lengths: Queue length at each start time, either one
+                value for every path or one per start time. Defaults to the
+                current queue length.
+            
+        Returns:
+            Long DataFrame with one row per (start_time, step): start_time,
+            step, timestamp, expected_arrivals, expected_departures,
+            predicted_queue_length, predicted_waiting_time, confidence, trend
+        """
+        start_index = pd.DatetimeIndex(pd.to_datetime(start_times))
+        n_paths = len(start_index)
+        
+        if initial_queue_lengths is None:
+            initial_queue_lengths = len(self.current_queue)
+        initial_queue = np.broadcast_to(np.asarray(initial_queue_lengths, dtype=float), (n_paths,))
+        
+        paths = self._forecast_paths(start_index, hours_ahead, initial_queue)
+        steps = np.arange(hours_ahead)
+        
+        return pd.DataFrame({
+            'start_time': start_index.repeat(hours_ahead),
+            'step': np.tile(steps, n_paths),
+            'timestamp': paths['timestamps'].ravel(),
+            'expected_arrivals': paths['arrivals'].ravel(),
+            'expected_departures': paths['departures'].ravel(),
+            'predicted_queue_length': paths['queue_length'].ravel(),
+            'predicted_waiting_time': paths['waiting_time'].ravel(),
+            'confidence': paths['confidence'].ravel(),
+            'trend': pd.Categorical(paths['trend'].ravel(), categories=['increasing', 'decreasing', 'stable'])
+        })
+    
+    def forecast_queue_bands(self, hours_ahead: int = 72, current_time: datetime = None,
+                             n_paths: int = 2000, percentiles: Tuple[float, ...] = (10, 50, 90),
+                             rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+        """Probabilistic queue forecast from Monte Carlo sample paths
+
+        Hourly arrivals and departures are drawn as an (n_paths, hours) matrix
+        of Poisson counts around the expected rates of forecast_queue_length(),
+        and all paths are rolled forward at once with the same queue update.
+
+        Args:
+            hours_ahead: Number of hourly steps to forecast
+            current_time: Forecast start time (defaults to now)
+            n_paths: Number of simulated sample paths
+            percentiles: Percentiles reported for every hour
+            rng: Optional random generator for reproducible paths
+
+        Returns:
+            DataFrame with one row per hour: timestamp, step, queue_mean,
+            waiting_mean and queue_p<q>/waiting_p<q> columns for each
+            requested percentile (e.g. queue_p10, queue_p50, queue_p90)
+        """
+        if current_time is None:
+            current_time = datetime.now()
+        sampler = rng if rng is not None else np.random.default_rng()
+
+        start_index = pd.DatetimeIndex([current_time])
+        hours, days = self._step_calendar(start_index, hours_ahead)
+        hours, days = hours[0], days[0]
+
+        arrivals = sampler.poisson(self.expected_arrivals_table[days, hours], size=(n_paths, hours_ahead))
+        departures = sampler.poisson(self.HOURLY_DEPARTURES[hours], size=(n_paths, hours_ahead))
+
+        initial_queue = np.full(n_paths, float(len(self.current_queue)))
+        queue_length = _clipped_queue_paths((arrivals - departures).astype(float), initial_queue)
+        waiting_time = self._waiting_time_array(queue_length, hours)
+
+        bands = {
+            'timestamp': start_index[0] + pd.to_timedelta(np.arange(hours_ahead), unit='h'),
+            'step': np.arange(hours_ahead),
+            'queue_mean': queue_length.mean(axis=0),
+            'waiting_mean': waiting_time.mean(axis=0)
         }
+        queue_percentiles = np.percentile(queue_length, percentiles, axis=0)
+        waiting_percentiles = np.percentile(waiting_time, percentiles, axis=0)
+        for index, percentile in enumerate(percentiles):
+            bands[f'queue_p{percentile:g}'] = queue_percentiles[index]
+            bands[f'waiting_p{percentile:g}'] = waiting_percentiles[index]
+
+        logger.info(f"Simulated {n_paths} queue paths over {hours_ahead} hours")
+        return pd.DataFrame(bands)
+
+    def _forecast_paths(self, start_times, hours_ahead: int, initial_queue: np.ndarray) -> Dict[str, np.ndarray]:
+        """Compute forecast paths as (start times, hours) arrays
+        
+        The hourly queue update is a cumulative array operation over each
+        path (see _clipped_queue_paths). Confidence decays with the hours
+        ahead of each path's start time.
+        """
+        start_index = pd.DatetimeIndex(pd.to_datetime(start_times))
+        steps = np.arange(hours_ahead)
+        hours, days = self._step_calendar(start_index, hours_ahead)
+        
+        arrivals = self.expected_arrivals_table[days, hours]
+        departures = self.HOURLY_DEPARTURES[hours]
+        
+        queue_length = _clipped_queue_paths(arrivals - departures, initial_queue)
+        waiting_time = self._waiting_time_array(queue_length, hours)
         
-        hour_factor = time_factors['hour'].get(hour, 1.0)
-        day_factor = time_factors['day'].get(day_of_week, 1.0)
+        # Trend against the previous hour's (whole-ship) queue length
+        trend = np.full(queue_length.shape, 'stable', dtype=object)
+        previous = np.floor(queue_length[:, :-1])
+        trend[:, 1:][queue_length[:, 1:] > previous * 1.1] = 'increasing'
+        trend[:, 1:][queue_length[:, 1:] < previous * 0.9] = 'decreasing'
         
-        return base_rate * hour_factor * day_factor
+        timestamps = start_index.to_numpy()[:, np.newaxis] + steps[np.newaxis, :] * np.timedelta64(1, 'h')
+        
+        return {
+            'timestamps': timestamps,
+            'arrivals': arrivals,
+            'departures': departures,
+            'queue_length': queue_length,
+            'waiting_time': waiting_time,
+            'confidence': np.broadcast_to(self._calculate_horizon_confidence(steps), queue_length.shape),
+            'trend': trend
+        }
+    
+    @staticmethod
+    def _step_calendar(start_index: pd.DatetimeIndex, hours_ahead: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Hour of day and weekday of every hourly step, counted from each start time"""
+        hour_offsets = start_index.hour.to_numpy()[:, np.newaxis] + np.arange(hours_ahead)[np.newaxis, :]
+        hours = hour_offsets % 24
+        days = (start_index.dayofweek.to_numpy()[:, np.newaxis] + hour_offsets // 24) % 7
+        return hours, days
+    
+    def _waiting_time_array(self, queue_length: np.ndarray, hours: np.ndarray) -> np.ndarray:
+        """Waiting time at the effective processing rate of each shift"""
+        processing_rate = self.num_berths * self.SHIFT_EFFICIENCY[hours] / self.avg_processing_time
+        return np.where(queue_length > 0, queue_length / processing_rate, 0.0)
+    
+    def _predict_hourly_arrivals(self, forecast_time: datetime) -> float:
+        """Predict number of arrivals in a given hour"""
+        return float(self.expected_arrivals_table[forecast_time.weekday(), forecast_time.hour])
     
     def _predict_hourly_departures(self, forecast_time: datetime) -> float:
         """Predict number of departures in a given hour"""
-        # Assume steady processing rate during business hours
-        hour = forecast_time.hour
-        
-        if 6 <= hour <= 22:  # Business hours
-            return 0.6  # ships per hour
-        else:  # Night hours
-            return 0.2  # reduced processing
+        return float(self.HOURLY_DEPARTURES[forecast_time.hour])
     
     def _estimate_current_waiting_time(self) -> float:
         """Estimate current average waiting time"""
@@ -495,66 +1031,75 @@ class QueueLengthForecaster:
             return 0.0
             
         # Simple estimate: queue length * average processing time
-        avg_processing_time = 4.0  # hours
-        return len(self.current_queue) * avg_processing_time / 3  # assuming 3 berths
+        return len(self.current_queue) * self.avg_processing_time / self.num_berths
     
     def _estimate_waiting_time(self, queue_length: int, forecast_time: datetime) -> float:
         """Estimate waiting time for a given queue length"""
         if queue_length <= 0:
             return 0.0
-            
-        # Factors affecting waiting time
-        avg_processing_time = 4.0  # hours
-        num_berths = 3  # assume 3 active berths
         
-        # Adjust for time of day (efficiency varies)
-        hour = forecast_time.hour
-        if 6 <= hour <= 18:  # Day shift
-            efficiency = 1.0
-        elif 18 <= hour <= 22:  # Evening shift
-            efficiency = 0.8
-        else:  # Night shift
-            efficiency = 0.6
-        
-        effective_processing_rate = num_berths * efficiency / avg_processing_time
+        # Efficiency varies with the time of day
+        efficiency = self.SHIFT_EFFICIENCY[forecast_time.hour]
+        effective_processing_rate = self.num_berths * efficiency / self.avg_processing_time
         waiting_time = queue_length / effective_processing_rate
         
-        return max(0.0, waiting_time)
+        return max(0.0, float(waiting_time))
     
     def _calculate_forecast_confidence(self, forecast_time: datetime) -> float:
         """Calculate confidence level for forecast"""
         # Confidence decreases with time horizon
         hours_ahead = (forecast_time - datetime.now()).total_seconds() / 3600
-        
+        return float(self._calculate_horizon_confidence(np.array([hours_ahead]))[0])
+    
+    def _calculate_horizon_confidence(self, hours_ahead: np.ndarray) -> np.ndarray:
+        """Calculate confidence levels for an array of forecast horizons in hours"""
         # Base confidence decreases exponentially with time
-        base_confidence = np.exp(-hours_ahead / 24)  # 24-hour half-life
+        base_confidence = np.exp(-np.asarray(hours_ahead, dtype=float) / 24)  # 24-hour half-life
         
         # Adjust based on historical data availability
-        if not self.historical_queue_data.empty:
-            data_confidence = min(1.0, len(self.historical_queue_data) / 100)
-        else:
-            data_confidence = 0.3
-        
-        return max(0.1, base_confidence * data_confidence)
+        return np.maximum(0.1, base_confidence * self.data_confidence)
 
-def create_sample_predictions() -> Dict:
-    """Create sample predictions for testing and demonstration"""
+def _clipped_queue_paths(net_change: np.ndarray, initial_queue: np.ndarray) -> np.ndarray:
+    """Queue lengths of q = max(0, q + net change) along the last axis
+    
+    Solved in closed form with S the cumulative net change along each path:
+    q_t = S_t - min(-q_0, min_{k<=t} S_k).
+    """
+    cumulative_change = np.cumsum(net_change, axis=-1)
+    running_min = np.minimum.accumulate(cumulative_change, axis=-1)
+    return cumulative_change - np.minimum(running_min, -np.asarray(initial_queue)[..., np.newaxis])
+
+def create_sample_predictions(model_store: Optional[ModelStore] = None) -> Dict:
+    """Create sample predictions for testing and demonstration
+    
+    Args:
+        model_store: Optional model store. Trained models are restored from it
+            and only re-trained when the sample history changes.
+    """
     
     # Initialize predictors
     arrival_predictor = ShipArrivalPredictor()
     processing_estimator = ProcessingTimeEstimator()
     queue_forecaster = QueueLengthForecaster()
     
-    # Create sample historical data
+    # Create sample historical data (fixed seed keeps the data fingerprint stable)
+    sample_rng = np.random.default_rng(42)
     sample_arrivals = pd.DataFrame({
-        'arrival_time': pd.date_range(start='2024-01-01', periods=100, freq='6H'),
-        'ship_type': np.random.choice(['container', 'bulk', 'tanker'], 100),
-        'size': np.random.uniform(1000, 8000, 100)
+        'arrival_time': pd.date_range(start='2024-01-01', periods=100, freq='6h'),
+        'ship_type': sample_rng.choice(['container', 'bulk', 'tanker'], 100),
+        'size': sample_rng.uniform(1000, 8000, 100)
     })
     
     # Train models
-    arrival_predictor.load_historical_data(sample_arrivals)
-    arrival_predictor.train_arrival_model()
+    def train_arrival_predictor():
+        arrival_predictor.load_historical_data(sample_arrivals)
+        arrival_predictor.train_arrival_model()
+    
+    if model_store is not None:
+        model_store.load_or_train('ship_arrival_predictor', arrival_predictor,
+                                  train_arrival_predictor, sample_arrivals)
+    else:
+        train_arrival_predictor()
     
     # Generate predictions
     current_time = datetime.now()
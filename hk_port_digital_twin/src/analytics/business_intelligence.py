@@ -17,6 +17,11 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 
+try:
+    from ..utils.forecasting import fit_linear_trends
+except ImportError:
+    from utils.forecasting import fit_linear_trends
+
 class KPICategory(Enum):
     """Categories of Key Performance Indicators."""
     FINANCIAL = "financial"
@@ -628,24 +633,23 @@ class BusinessIntelligenceEngine:
     def _generate_linear_forecast(self, values: List[float], periods: int) -> Dict[str, Any]:
         """Generate linear forecast for given values."""
         x = np.arange(len(values))
-        y = np.array(values)
         
         # Fit linear model
-        coeffs = np.polyfit(x, y, 1)
+        fit = fit_linear_trends(x, np.array(values, dtype=float)[None, :])
         
-        # Generate forecast
+        # Generate forecast with 95% prediction intervals
         forecast_x = np.arange(len(values), len(values) + periods)
-        forecast_y = np.polyval(coeffs, forecast_x)
+        forecast_y = fit.predict(forecast_x)[0]
+        lower, upper = fit.prediction_interval(forecast_x)
         
-        # Calculate confidence (simplified)
-        residuals = y - np.polyval(coeffs, x)
-        mse = np.mean(residuals ** 2)
-        confidence = max(0, 1 - (mse / np.var(y))) if np.var(y) > 0 else 0
+        # Confidence is the share of variance explained by the trend
+        confidence = max(0, fit.r_squared[0]) if np.var(values) > 0 else 0
         
         return {
             "forecast": forecast_y.tolist(),
+            "prediction_interval": {"lower": lower[0].tolist(), "upper": upper[0].tolist(), "level": 0.95},
             "confidence": confidence,
-            "trend_slope": coeffs[0],
+            "trend_slope": fit.slopes[0],
             "periods": periods
         }
     
@@ -21,6 +21,24 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from config.settings import SHIP_TYPES
 
+# Minimum processing time for any ship (6 minutes)
+MIN_PROCESSING_TIME = 0.1
+
+
+def crane_efficiency(crane_count: float) -> float:
+    """Effective crane multiplier for a berth
+    
+    More cranes mean faster processing with diminishing returns: the first
+    four cranes work at 80% efficiency and any further cranes at 30%.
+    
+    Args:
+        crane_count: Number of cranes working the ship
+        
+    Returns:
+        Effective number of full-speed cranes
+    """
+    return min(crane_count, 4) * 0.8 + max(0, crane_count - 4) * 0.3
+
 
 class ContainerHandler:
     """Handles container operations at berths
@@ -78,10 +96,10 @@ class ContainerHandler:
         
         # Adjust for number of cranes (more cranes = faster processing)
         # Use diminishing returns: efficiency decreases with more cranes
-        crane_efficiency = min(crane_count, 4) * 0.8 + max(0, crane_count - 4) * 0.3
-        processing_time = base_time / crane_efficiency if crane_efficiency > 0 else base_time
+        efficiency = crane_efficiency(crane_count)
+        processing_time = base_time / efficiency if efficiency > 0 else base_time
         
-        return max(0.1, processing_time)  # Minimum 0.1 hours (6 minutes)
+        return max(MIN_PROCESSING_TIME, processing_time)
         
     def process_ship(self, ship, berth):
         """Simulate container loading/unloading process
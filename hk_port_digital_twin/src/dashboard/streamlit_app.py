@@ -31,7 +31,7 @@ project_root = find_project_root()
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from hk_port_digital_twin.src.utils.data_loader import RealTimeDataConfig, get_real_time_manager, load_container_throughput, load_vessel_arrivals, load_berth_configurations, initialize_vessel_data_pipeline, load_all_vessel_data, get_comprehensive_vessel_analysis, load_combined_vessel_data
+from hk_port_digital_twin.src.utils.data_loader import RealTimeDataConfig, get_real_time_manager, load_container_throughput, load_vessel_arrivals, load_berth_configurations, load_all_vessel_data, get_comprehensive_vessel_analysis, load_combined_vessel_data
 from hk_port_digital_twin.config.settings import SIMULATION_CONFIG, get_enhanced_simulation_config
 from hk_port_digital_twin.src.core.port_simulation import PortSimulation
 from hk_port_digital_twin.src.core.simulation_controller import SimulationController
@@ -290,13 +290,6 @@ def initialize_session_state():
                 manager.start_real_time_updates()
                 st.session_state.real_time_manager = manager
                 
-                # Initialize vessel data pipeline
-                try:
-                    initialize_vessel_data_pipeline()
-                    logging.info("Vessel data pipeline initialized successfully")
-                except Exception as e:
-                    logging.warning(f"Could not initialize vessel data pipeline: {e}")
-                
             except Exception as e:
                 print(f"Warning: Could not initialize real-time data manager: {e}")
                 st.session_state.real_time_manager = None
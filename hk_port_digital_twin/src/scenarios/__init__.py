@@ -44,6 +44,11 @@ from .scenario_optimizer import (
     ScenarioAwareBerthOptimizer
 )
 
+from .analytic_queueing import (
+    PortQueueModel,
+    QueueMetrics
+)
+
 __all__ = [
     # Scenario Parameters
     'ScenarioParameters',
@@ -60,6 +65,10 @@ __all__ = [
     # Scenario Optimizer
     'ScenarioAwareBerthOptimizer',
     
+    # Analytic Queueing
+    'PortQueueModel',
+    'QueueMetrics',
+    
     # Multi-Scenario Optimizer
     'MultiScenarioOptimizer',
     'OptimizationObjective',
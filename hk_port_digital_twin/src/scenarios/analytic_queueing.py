@@ -0,0 +1,417 @@
+"""Comments for context:
+This module provides an analytic fast path for what-if questions about berth
+queues. Instead of running a full PortSimulation, each berth class (container,
+bulk, mixed) is treated as a multi-server queue and solved in closed form.
+
+Approach:
+- Arrival rates come from ScenarioParameters (arrival rate multiplier and ship
+  type distribution) applied to the simulation's base inter-arrival time
+- Service-time distributions come from ContainerHandler's rate model: the
+  container-count distribution used by PortSimulation for each ship type,
+  processed at the ship type's rate with the berth's crane efficiency
+- Each berth class is an M/G/c queue: Erlang-C gives the exact M/M/c result
+  and the Allen-Cunneen correction scales it by the service-time variability
+
+Assumptions:
+- Ships are only served by berths of their own class (no overflow to mixed
+  berths), which makes the estimates slightly pessimistic
+- Arrivals are Poisson, matching the exponential inter-arrival times used by
+  PortSimulation; peak-hour and weekend patterns are averaged out
+
+A full PortSimulation run is only started by simulate(). PortSimulation has no
+settings for the what-if factors, so it runs the scenario as configured.
+"""
+
+import logging
+import math
+import os
+import sys
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from config.settings import BERTH_CONFIGS, SHIP_TYPES, SIMULATION_CONFIG
+
+try:
+    from .scenario_parameters import ScenarioParameters, get_scenario_parameters
+    from ..core.container_handler import crane_efficiency, MIN_PROCESSING_TIME
+except ImportError:
+    # Fallback for testing or standalone usage
+    sys.path.append(os.path.dirname(__file__))
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+    from scenario_parameters import ScenarioParameters, get_scenario_parameters
+    from container_handler import crane_efficiency, MIN_PROCESSING_TIME
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueueMetrics:
+    """Steady-state queue metrics for one berth class (times in hours)"""
+    berth_class: str
+    arrival_rate: float  # ships per hour
+    service_rate: float  # ships per hour per berth
+    servers: int
+    utilization: float
+    probability_of_waiting: float
+    expected_waiting_time: float  # time in queue before berthing
+    expected_queue_length: float  # ships waiting for a berth
+    expected_time_in_system: float  # waiting plus processing time
+    expected_ships_in_system: float
+    service_time_scv: float  # squared coefficient of variation of service times
+    stable: bool
+
+    def to_dict(self) -> Dict:
+        """Convert to a plain dictionary"""
+        return asdict(self)
+
+
+def erlang_c(servers: int, offered_load: float) -> float:
+    """Probability that an arriving ship has to wait in an M/M/c queue
+
+    Uses the numerically stable Erlang-B recursion rather than factorials.
+
+    Args:
+        servers: Number of berths
+        offered_load: Arrival rate divided by the per-berth service rate
+
+    Returns:
+        Erlang-C waiting probability (1.0 if the queue is unstable)
+    """
+    if servers <= 0 or offered_load >= servers:
+        return 1.0
+    if offered_load <= 0:
+        return 0.0
+
+    erlang_b = 1.0
+    for k in range(1, servers + 1):
+        erlang_b = offered_load * erlang_b / (k + offered_load * erlang_b)
+
+    utilization = offered_load / servers
+    return erlang_b / (1.0 - utilization * (1.0 - erlang_b))
+
+
+def multi_server_metrics(arrival_rate: float, service_rate: float, servers: int,
+                         service_time_scv: float = 1.0, arrival_scv: float = 1.0,
+                         berth_class: str = '') -> QueueMetrics:
+    """Solve a multi-server queue with the Allen-Cunneen approximation
+
+    With exponential inter-arrival and service times (both squared
+    coefficients of variation equal to 1) this is the exact M/M/c result.
+
+    Args:
+        arrival_rate: Ships per hour
+        service_rate: Ships per hour served by one berth
+        servers: Number of berths
+        service_time_scv: Squared coefficient of variation of service times
+        arrival_scv: Squared coefficient of variation of inter-arrival times
+        berth_class: Label for the result
+
+    Returns:
+        QueueMetrics; unstable queues report infinite waiting and queue length
+    """
+    capacity = servers * service_rate
+    utilization = arrival_rate / capacity if capacity > 0 else (math.inf if arrival_rate > 0 else 0.0)
+    stable = utilization < 1.0
+    service_time = 1.0 / service_rate if service_rate > 0 else math.inf
+
+    if stable:
+        prob_wait = erlang_c(servers, arrival_rate / service_rate) if arrival_rate > 0 else 0.0
+        variability = (arrival_scv + service_time_scv) / 2.0
+        waiting_time = prob_wait / (capacity - arrival_rate) * variability
+        queue_length = arrival_rate * waiting_time
+    else:
+        prob_wait = 1.0
+        waiting_time = math.inf
+        queue_length = math.inf
+
+    return QueueMetrics(
+        berth_class=berth_class,
+        arrival_rate=arrival_rate,
+        service_rate=service_rate,
+        servers=servers,
+        utilization=utilization,
+        probability_of_waiting=prob_wait,
+        expected_waiting_time=waiting_time,
+        expected_queue_length=queue_length,
+        expected_time_in_system=waiting_time + service_time,
+        expected_ships_in_system=queue_length + arrival_rate * service_time,
+        service_time_scv=service_time_scv,
+        stable=stable
+    )
+
+
+def _uniform_pmf(low: int, high: int) -> Tuple[int, np.ndarray]:
+    """Offset and probabilities of a discrete uniform on [low, high]"""
+    return low, np.full(high - low + 1, 1.0 / (high - low + 1))
+
+
+@lru_cache(maxsize=None)
+def container_count_distribution(ship_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Distribution of containers handled per call for a ship type
+
+    Mirrors the container counts drawn by PortSimulation._generate_random_ship:
+    a uniformly chosen typical size, then independent uniform unload and load
+    counts. The total is the convolution of the two uniform distributions.
+
+    Args:
+        ship_type: Ship type from SHIP_TYPES
+
+    Returns:
+        Tuple of (container counts, probabilities)
+    """
+    if ship_type not in SHIP_TYPES:
+        raise ValueError(f"Unknown ship type: {ship_type}")
+
+    if ship_type == 'bulk':
+        # Bulk carrier counts do not depend on size
+        count_ranges = [((10, 100), (5, 80))]
+    else:
+        divisor, unload, load = (50, (0.3, 0.8), (0.2, 0.7)) if ship_type == 'container' \
+            else (80, (0.2, 0.6), (0.1, 0.5))
+        count_ranges = []
+        for size in SHIP_TYPES[ship_type]['typical_sizes']:
+            base = size // divisor
+            count_ranges.append(((int(base * unload[0]), int(base * unload[1])),
+                                 (int(base * load[0]), int(base * load[1]))))
+
+    totals: Dict[int, float] = {}
+    size_weight = 1.0 / len(count_ranges)
+    for unload_range, load_range in count_ranges:
+        unload_low, unload_pmf = _uniform_pmf(*unload_range)
+        load_low, load_pmf = _uniform_pmf(*load_range)
+        total_pmf = np.convolve(unload_pmf, load_pmf)
+        for offset, probability in enumerate(total_pmf):
+            count = unload_low + load_low + offset
+            totals[count] = totals.get(count, 0.0) + probability * size_weight
+
+    counts = np.array(sorted(totals))
+    return counts, np.array([totals[count] for count in counts])
+
+
+def service_time_moments(ship_type: str, crane_counts: List[float],
+                         volume_multiplier: float = 1.0,
+                         processing_rate_multiplier: float = 1.0) -> Tuple[float, float]:
+    """First two moments of berth occupancy time for a ship type
+
+    Processing time follows ContainerHandler.calculate_processing_time. Ships
+    are assumed equally likely to use any of the given berths.
+
+    Args:
+        ship_type: Ship type from SHIP_TYPES
+        crane_counts: Effective crane count of each berth in the class
+        volume_multiplier: Scaling of containers handled per call
+        processing_rate_multiplier: Scaling of the per-crane handling rate
+
+    Returns:
+        Tuple of (mean, second moment) of the service time in hours
+    """
+    counts, probabilities = container_count_distribution(ship_type)
+    rate = SHIP_TYPES[ship_type]['processing_rate'] * processing_rate_multiplier
+    base_times = counts * volume_multiplier / rate
+
+    efficiencies = np.array([crane_efficiency(cranes) for cranes in crane_counts])
+    times = np.maximum(MIN_PROCESSING_TIME, base_times[np.newaxis, :] / efficiencies[:, np.newaxis])
+    mean = float((times @ probabilities).mean())
+    second_moment = float(((times ** 2) @ probabilities).mean())
+    return mean, second_moment
+
+
+class PortQueueModel:
+    """Analytic queueing model of the port's berth classes
+
+    Each berth class serves the ships of the matching type. The model answers
+    what-if questions in microseconds by scaling berth capacity, processing
+    times and arrival rates relative to a scenario.
+    """
+
+    def __init__(self, scenario: Union[str, ScenarioParameters, None] = 'normal',
+                 berth_configs: Optional[List[Dict]] = None,
+                 base_interarrival_hours: Optional[float] = None):
+        """Initialize the model
+
+        Args:
+            scenario: Scenario name or parameters; None uses unscaled defaults
+            berth_configs: Berth configurations (defaults to BERTH_CONFIGS)
+            base_interarrival_hours: Mean hours between arrivals before the
+                scenario multiplier (defaults to the simulation setting)
+        """
+        self.scenario_name = scenario if isinstance(scenario, str) else None
+        if isinstance(scenario, str):
+            scenario = get_scenario_parameters(scenario)
+            if scenario is None:
+                raise ValueError(f"Unknown scenario: {self.scenario_name}")
+        self.scenario = scenario
+        self.berth_configs = berth_configs if berth_configs is not None else BERTH_CONFIGS
+        self.base_interarrival_hours = (base_interarrival_hours if base_interarrival_hours is not None
+                                        else SIMULATION_CONFIG['ship_arrival_rate'])
+
+        # Berth classes and the crane counts of their berths
+        self.berth_classes: Dict[str, List[int]] = {}
+        for berth in self.berth_configs:
+            self.berth_classes.setdefault(berth['berth_type'], []).append(berth['crane_count'])
+
+    def _scenario_value(self, name: str, default=1.0):
+        return getattr(self.scenario, name) if self.scenario is not None else default
+
+    def arrival_rates(self, arrival_rate_factor: float = 1.0) -> Dict[str, float]:
+        """Ship arrivals per hour for each ship type"""
+        total_rate = self._scenario_value('arrival_rate_multiplier') * arrival_rate_factor \
+            / self.base_interarrival_hours
+        distribution = self._scenario_value(
+            'ship_type_distribution',
+            {ship_type: config['arrival_probability'] for ship_type, config in SHIP_TYPES.items()}
+        )
+        total_weight = sum(distribution.values())
+        return {ship_type: total_rate * share / total_weight for ship_type, share in distribution.items()}
+
+    def evaluate(self, capacity_factor: float = 1.0, processing_time_factor: float = 1.0,
+                 arrival_rate_factor: float = 1.0) -> Dict[str, QueueMetrics]:
+        """Solve every berth class
+
+        Args:
+            capacity_factor: Fraction of the scenario's available berths in use
+            processing_time_factor: Multiplier on processing times
+            arrival_rate_factor: Multiplier on the scenario's arrival rate
+
+        Returns:
+            Dictionary mapping berth class to its QueueMetrics
+        """
+        arrivals = self.arrival_rates(arrival_rate_factor)
+        availability = self._scenario_value('berth_availability_factor') * capacity_factor
+        crane_multiplier = self._scenario_value('crane_efficiency_multiplier')
+        processing_multiplier = self._scenario_value('processing_rate_multiplier')
+        volume_multipliers = self._scenario_value('container_volume_multipliers', {})
+
+        results = {}
+        for berth_class, crane_counts in self.berth_classes.items():
+            if berth_class not in SHIP_TYPES:
+                continue
+            mean, second_moment = service_time_moments(
+                berth_class,
+                [cranes * crane_multiplier for cranes in crane_counts],
+                volume_multipliers.get(berth_class, 1.0),
+                processing_multiplier
+            )
+            mean *= processing_time_factor
+            second_moment *= processing_time_factor ** 2
+            service_scv = max(0.0, second_moment / mean ** 2 - 1.0)
+            servers = int(round(len(crane_counts) * availability))
+
+            results[berth_class] = multi_server_metrics(
+                arrivals.get(berth_class, 0.0), 1.0 / mean, servers,
+                service_time_scv=service_scv, berth_class=berth_class
+            )
+        return results
+
+    @staticmethod
+    def summarize(metrics: Dict[str, QueueMetrics]) -> Dict[str, float]:
+        """Port-wide totals: summed queue length, arrival-weighted waiting time
+        and berth utilization weighted by the number of berths"""
+        total_arrivals = sum(m.arrival_rate for m in metrics.values())
+        total_servers = sum(m.servers for m in metrics.values())
+        busy_berths = sum(m.arrival_rate / m.service_rate for m in metrics.values())
+        return {
+            'arrival_rate': total_arrivals,
+            'berths': total_servers,
+            'utilization': busy_berths / total_servers if total_servers > 0 else math.inf,
+            'queue_length': sum(m.expected_queue_length for m in metrics.values()),
+            'waiting_time': (sum(m.arrival_rate * m.expected_waiting_time for m in metrics.values())
+                             / total_arrivals if total_arrivals > 0 else 0.0),
+            'stable': all(m.stable for m in metrics.values())
+        }
+
+    def berth_capacity(self) -> Dict[str, float]:
+        """Available berths and arrival-weighted processing time for the whole port
+
+        Suitable for QueueLengthForecaster(**model.berth_capacity()).
+        """
+        metrics = self.evaluate()
+        total_arrivals = sum(m.arrival_rate for m in metrics.values())
+        return {
+            'num_berths': sum(m.servers for m in metrics.values()),
+            'avg_processing_time': (sum(m.arrival_rate / m.service_rate for m in metrics.values())
+                                    / total_arrivals if total_arrivals > 0 else 0.0)
+        }
+
+    def transient_queue(self, elapsed_hours: float, capacity_factor: float = 1.0,
+                        processing_time_factor: float = 1.0,
+                        arrival_rate_factor: float = 1.0) -> Dict[str, float]:
+        """Port-wide queue length and waiting time after a period of operation
+
+        Stable berth classes are at their steady state. Overloaded classes
+        accumulate a backlog at the rate arrivals exceed capacity (fluid
+        approximation), which then has to be worked off by the available berths.
+
+        Args:
+            elapsed_hours: Hours the conditions have been in force
+            capacity_factor: Fraction of the scenario's available berths in use
+            processing_time_factor: Multiplier on processing times
+            arrival_rate_factor: Multiplier on the scenario's arrival rate
+
+        Returns:
+            Dictionary with 'queue_length' and 'waiting_time' (hours)
+        """
+        metrics = self.evaluate(capacity_factor, processing_time_factor, arrival_rate_factor)
+        queue_length = 0.0
+        weighted_wait = 0.0
+        total_arrivals = 0.0
+        for m in metrics.values():
+            if m.stable:
+                queue, wait = m.expected_queue_length, m.expected_waiting_time
+            else:
+                capacity = m.servers * m.service_rate
+                queue = (m.arrival_rate - capacity) * max(0.0, elapsed_hours)
+                wait = queue / capacity if capacity > 0 else max(0.0, elapsed_hours)
+            queue_length += queue
+            weighted_wait += m.arrival_rate * wait
+            total_arrivals += m.arrival_rate
+
+        return {
+            'queue_length': queue_length,
+            'waiting_time': weighted_wait / total_arrivals if total_arrivals > 0 else 0.0
+        }
+
+    def what_if(self, capacity_factor: float = 1.0, processing_time_factor: float = 1.0,
+                arrival_rate_factor: float = 1.0) -> Dict:
+        """Answer a what-if question analytically
+
+        Args:
+            capacity_factor: Fraction of the scenario's available berths in use
+            processing_time_factor: Multiplier on processing times
+            arrival_rate_factor: Multiplier on the scenario's arrival rate
+
+        Returns:
+            Dictionary with per-class 'berth_classes' and port-wide 'summary'
+        """
+        metrics = self.evaluate(capacity_factor, processing_time_factor, arrival_rate_factor)
+        return {
+            'berth_classes': {name: m.to_dict() for name, m in metrics.items()},
+            'summary': self.summarize(metrics)
+        }
+
+    def simulate(self, duration: float = 168.0) -> Dict:
+        """Run the full discrete-event simulation for this model's berths and scenario
+
+        The what-if factors are not applied; compare the report with what_if()
+        at its default factors.
+
+        Args:
+            duration: Hours to simulate
+
+        Returns:
+            PortSimulation's final report
+        """
+        try:
+            from ..core.port_simulation import PortSimulation
+        except ImportError:
+            from core.port_simulation import PortSimulation
+
+        simulation = PortSimulation({'berths': self.berth_configs})
+        if self.scenario_name:
+            simulation.set_scenario(self.scenario_name)
+        return simulation.run_simulation(duration)
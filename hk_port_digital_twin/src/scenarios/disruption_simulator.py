@@ -21,6 +21,11 @@ import json
 import os
 from pathlib import Path
 
+try:
+    from .analytic_queueing import PortQueueModel
+except ImportError:
+    from analytic_queueing import PortQueueModel
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -122,6 +127,9 @@ class DisruptionSimulator:
         self.scenario_templates: Dict[str, ScenarioTemplate] = {}
         self.scenarios_dir = Path(scenarios_dir) if scenarios_dir else Path("scenarios")
         self.scenarios_dir.mkdir(exist_ok=True)
+        # Analytic berth queue model used to estimate queueing under disruption
+        self.queue_model = PortQueueModel()
+        self.baseline_queue_state = self.queue_model.transient_queue(0.0)
         self._initialize_recovery_strategies()
         self._initialize_scenario_templates()
         self._load_saved_scenarios()
@@ -511,8 +519,8 @@ class DisruptionSimulator:
                 processing_impact = 1.0 + event.processing_time_increase
                 
                 # Calculate ripple effects
-                queue_impact = self._calculate_queue_impact(event, current_time)
-                waiting_time_impact = self._calculate_waiting_time_impact(event, current_time)
+                queue_impact = self._calculate_queue_impact(event, current_time, baseline_metrics)
+                waiting_time_impact = self._calculate_waiting_time_impact(event, current_time, baseline_metrics)
                 
             else:
                 # Recovery period
@@ -544,25 +552,42 @@ class DisruptionSimulator:
             'recovery_recommendations': self._generate_recovery_recommendations(event)
         }
     
-    def _calculate_queue_impact(self, event: DisruptionEvent, current_time: datetime) -> float:
-        """Calculate impact on vessel queue length"""
-        base_queue = 3.0  # Baseline queue length
-        
-        if event.disruption_type == DisruptionType.CONGESTION:
-            return base_queue * (1.0 + event.capacity_reduction * 2)
-        elif event.disruption_type == DisruptionType.EQUIPMENT_FAILURE:
-            return base_queue * (1.0 + event.capacity_reduction * 1.5)
-        else:
-            return base_queue * (1.0 + event.capacity_reduction)
+    def _calculate_disrupted_queue_state(self, event: DisruptionEvent, current_time: datetime) -> Dict[str, float]:
+        """Analytic queue length and waiting time under the disruption's capacity and processing impact"""
+        elapsed_hours = (current_time - event.start_time).total_seconds() / 3600
+        return self.queue_model.transient_queue(
+            elapsed_hours,
+            capacity_factor=1.0 - event.capacity_reduction,
+            processing_time_factor=1.0 + event.processing_time_increase
+        )
     
-    def _calculate_waiting_time_impact(self, event: DisruptionEvent, current_time: datetime) -> float:
-        """Calculate impact on vessel waiting times"""
-        base_waiting = 4.0  # Baseline waiting time in hours
-        
-        # Waiting time increases more dramatically with capacity reduction
-        waiting_multiplier = 1.0 + (event.capacity_reduction * 3) + (event.processing_time_increase * 2)
-        
-        return base_waiting * waiting_multiplier
+    def _calculate_queue_impact(self, event: DisruptionEvent, current_time: datetime,
+                                baseline_metrics: Optional[Dict[str, float]] = None) -> float:
+        """Calculate impact on vessel queue length
+        
+        Without baseline metrics the analytic queue length is returned; otherwise
+        the analytic increase over normal operations is added to the baseline.
+        """
+        queue_length = self._calculate_disrupted_queue_state(event, current_time)['queue_length']
+        if baseline_metrics is None:
+            return queue_length
+        
+        increase = queue_length - self.baseline_queue_state['queue_length']
+        return baseline_metrics.get('average_queue_length', 0) + increase
+    
+    def _calculate_waiting_time_impact(self, event: DisruptionEvent, current_time: datetime,
+                                       baseline_metrics: Optional[Dict[str, float]] = None) -> float:
+        """Calculate impact on vessel waiting times
+        
+        Without baseline metrics the analytic waiting time is returned; otherwise
+        the analytic increase over normal operations is added to the baseline.
+        """
+        waiting_time = self._calculate_disrupted_queue_state(event, current_time)['waiting_time']
+        if baseline_metrics is None:
+            return waiting_time
+        
+        increase = waiting_time - self.baseline_queue_state['waiting_time']
+        return baseline_metrics.get('average_waiting_time', 0) + increase
     
     def _calculate_recovery_factor(self, current_time: datetime, disruption_end: datetime, severity: DisruptionSeverity) -> float:
         """Calculate recovery factor based on time since disruption ended"""
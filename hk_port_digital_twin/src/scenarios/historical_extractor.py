@@ -13,19 +13,17 @@ from dataclasses import asdict
 
 try:
     from hk_port_digital_twin.src.utils.data_loader import (
-        get_time_series_data,
+        get_cargo_time_series,
         forecast_cargo_throughput,
         get_enhanced_cargo_analysis,
-        _analyze_seasonal_patterns,
-        load_focused_cargo_statistics
+        _analyze_seasonal_patterns
     )
 except ImportError:
     logging.warning("Could not import data_loader functions. Historical extraction will use default values.")
-    get_time_series_data = None
+    get_cargo_time_series = None
     forecast_cargo_throughput = None
     get_enhanced_cargo_analysis = None
     _analyze_seasonal_patterns = None
-    load_focused_cargo_statistics = None
 
 from .scenario_parameters import ScenarioParameters, ALL_SCENARIOS
 
@@ -48,18 +46,12 @@ class HistoricalParameterExtractor:
             True if data was loaded successfully, False otherwise
         """
         try:
-            if not get_time_series_data or not load_focused_cargo_statistics:
+            if not get_cargo_time_series:
                 logger.warning("Data loader functions not available. Using predefined parameters.")
                 return False
                 
-            # Load cargo statistics first
-            cargo_stats = load_focused_cargo_statistics()
-            if not cargo_stats:
-                logger.warning("No cargo statistics data available")
-                return False
-                
-            # Get time series data with cargo_stats parameter
-            time_series_data = get_time_series_data(cargo_stats)
+            # Time series of the focused cargo statistics (memoized by the data loader)
+            time_series_data = get_cargo_time_series()
             if not time_series_data:
                 logger.warning("No time series data available")
                 return False
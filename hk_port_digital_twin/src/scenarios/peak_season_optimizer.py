@@ -16,11 +16,15 @@ with machine learning-based predictions to maximize throughput during peak seaso
 """
 
 import logging
+import os
+import time
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util as multiprocessing_util
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from copy import deepcopy
 import random
 from enum import Enum
@@ -35,9 +39,10 @@ sys.path.insert(0, str(parent_dir))
 
 try:
     from optimization import BerthAllocationOptimizer, Ship, Berth, OptimizationResult
-    from strategic_simulations import StrategicScenarioParameters, StrategicBusinessMetrics
 except ImportError as e:
     logging.warning(f"Import warning: {e}")
+    BerthAllocationOptimizer = None  # Greedy seeding of the genetic algorithm is skipped
+    
     # Define minimal classes for standalone operation
     @dataclass
     class Ship:
@@ -60,6 +65,11 @@ except ImportError as e:
         current_ship: Optional[str] = None
         available_from: Optional[datetime] = None
 
+try:
+    from strategic_simulations import StrategicScenarioParameters, StrategicBusinessMetrics
+except ImportError as e:
+    logging.warning(f"Import warning: {e}")
+
 logger = logging.getLogger(__name__)
 
 class PeakSeasonStrategy(Enum):
@@ -103,6 +113,115 @@ class OptimizationConfiguration:
     enable_dynamic_adjustment: bool = True
     queue_threshold: int = 10
     waiting_time_threshold: float = 4.0  # hours
+    random_seed: Optional[int] = None
+    time_limit_seconds: Optional[float] = None  # wall-clock deadline for the genetic algorithm
+    island_count: int = 1  # >1 runs an island-model genetic algorithm in worker processes
+    migration_interval: int = 10  # generations between elite migrations
+    migration_size: int = 2  # elites sent to the neighbouring island
+    max_workers: Optional[int] = None  # defaults to min(island_count, CPU count)
+    warm_start: bool = True  # seed the population with the previous best assignment
+    greedy_seeding: bool = True  # seed with priority-based and greedy berth allocations
+    stagnation_window: Optional[int] = None  # stop after this many generations without improvement
+
+@dataclass
+class PeakSeasonProblem:
+    """Dense array form of a berth allocation problem for the genetic algorithm
+
+    Ships and berths are addressed by their index in the optimizer lists and all
+    times are hours relative to the optimizer's current time, so a whole
+    population of chromosomes (rows) can be scored without datetime arithmetic.
+    """
+    suitability: np.ndarray  # (ships, berths) bool
+    service_times: np.ndarray  # (ships, berths) hours, 0 where unsuitable
+    arrival_hours: np.ndarray  # (ships,) arrival relative to current time
+    containers: np.ndarray  # (ships,) containers to load + unload
+    suitable_berths: np.ndarray  # (ships, max suitable) berth indices, padded with 0
+    suitable_counts: np.ndarray  # (ships,) number of suitable berths
+
+    @property
+    def n_ships(self) -> int:
+        return self.suitability.shape[0]
+
+    @property
+    def n_berths(self) -> int:
+        return self.suitability.shape[1]
+
+    def random_genes(self, rows: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw a random suitable berth for every ship in ``rows`` chromosomes
+
+        Ships without any suitable berth get berth 0, which the fitness
+        function penalizes as an unsuitable assignment.
+        """
+        picks = (rng.random((rows, self.n_ships)) * np.maximum(self.suitable_counts, 1)).astype(np.int64)
+        return self.suitable_berths[np.arange(self.n_ships), picks]
+
+    def evaluate(self, population: np.ndarray, efficiency_weight: float) -> np.ndarray:
+        """Evaluate fitness of every chromosome in a population
+
+        Args:
+            population: (chromosomes, ships) array of berth indices
+            efficiency_weight: Weight of the average waiting time penalty
+
+        Returns:
+            (chromosomes,) array of fitness scores (higher is better)
+        """
+        population = np.asarray(population, dtype=np.int64)
+        n_rows, n_ships = population.shape
+        ship_idx = np.arange(n_ships)
+        suitable = self.suitability[ship_idx, population]
+        service = np.where(suitable, self.service_times[ship_idx, population], 0.0)
+
+        # Every (chromosome, berth) pair is a FIFO queue served in ship order.
+        # Unsuitable assignments never occupy a berth, so they go to an extra
+        # dummy queue per chromosome whose timings are ignored.
+        queue = np.where(suitable, population, self.n_berths)
+        queue_key = (np.arange(n_rows)[:, None] * (self.n_berths + 1) + queue).ravel()
+        order = np.argsort(queue_key, kind='stable')
+        sorted_key = queue_key[order]
+        duration = service.ravel()[order]
+        # Berths are free from the current time onwards
+        ready = np.maximum(self.arrival_hours, 0.0)[order % n_ships]
+
+        first_in_queue = np.ones(len(sorted_key), dtype=bool)
+        first_in_queue[1:] = sorted_key[1:] != sorted_key[:-1]
+        queue_id = np.cumsum(first_in_queue) - 1
+
+        # With C_k the cumulative service time up to job k of a queue, job k
+        # ends at C_k + max_{j<=k}(ready_j - C_{j-1}): a running maximum that
+        # restarts at each queue. Offsetting each queue by a span larger than
+        # the value range keeps a single accumulate from leaking across queues.
+        cumulative = np.cumsum(duration)
+        queue_cumulative = cumulative - (cumulative - duration)[first_in_queue][queue_id]
+        slack = ready - (queue_cumulative - duration)
+        low = slack.min()
+        span = slack.max() - low + 1.0
+        running_max = np.maximum.accumulate(slack - low + queue_id * span) - queue_id * span + low
+        start = np.empty(len(order))
+        start[order] = queue_cumulative + running_max - duration
+        start = start.reshape(n_rows, n_ships)
+
+        # Heavy penalty for unsuitable assignments
+        waiting = np.where(suitable, start - self.arrival_hours, 24.0)
+        total_revenue = (suitable * self.containers).sum(axis=1) * 50  # $50 per container
+        avg_waiting_time = waiting.sum(axis=1) / n_ships
+        avg_berth_utilization = service.sum(axis=1) / self.n_berths
+
+        # Fitness function (higher is better)
+        return (
+            total_revenue * 0.4 -  # Maximize revenue
+            avg_waiting_time * 1000 * efficiency_weight -  # Minimize waiting
+            (24 - avg_berth_utilization) * 100  # Maximize utilization
+        )
+
+@dataclass
+class EvolutionResult:
+    """State of one population after a run of genetic algorithm generations"""
+    population: np.ndarray
+    fitness_scores: np.ndarray
+    best_solution: np.ndarray
+    best_fitness: float
+    generations: int
+    converged: bool
 
 class PeakSeasonOptimizer:
     """Advanced optimizer for peak season capacity management"""
@@ -120,6 +239,9 @@ class PeakSeasonOptimizer:
         self.berths: List[Berth] = []
         self.current_time = datetime.now()
         self.optimization_history: List[Dict] = []
+        # Best genetic algorithm assignment (ship ID -> berth ID), kept across
+        # clear() so the next re-plan can warm-start from it
+        self.best_assignment: Dict[str, str] = {}
         
         logger.info(f"Initialized PeakSeasonOptimizer with strategy: {self.config.strategy.value}")
     
@@ -197,208 +319,370 @@ class PeakSeasonOptimizer:
         estimated_time = (base_time + container_time * size_factor * type_factor) * congestion_factor
         return max(estimated_time, 0.5)
     
+    def build_problem(self) -> PeakSeasonProblem:
+        """Precompute the array form of the current ships and berths
+        
+        Suitability and service times are evaluated once per ship/berth pair
+        here, so the genetic algorithm never calls back into Python per gene.
+        
+        Returns:
+            PeakSeasonProblem for the current ships, berths and current time
+        """
+        n_ships, n_berths = len(self.ships), len(self.berths)
+        suitability = np.zeros((n_ships, n_berths), dtype=bool)
+        service_times = np.zeros((n_ships, n_berths))
+        
+        for i, ship in enumerate(self.ships):
+            for j, berth in enumerate(self.berths):
+                if self._is_berth_suitable(ship, berth):
+                    suitability[i, j] = True
+                    service_times[i, j] = self.estimate_service_time_advanced(ship, berth)
+        
+        arrival_hours = np.array(
+            [(ship.arrival_time - self.current_time).total_seconds() / 3600 for ship in self.ships],
+            dtype=float
+        )
+        containers = np.array(
+            [ship.containers_to_load + ship.containers_to_unload for ship in self.ships],
+            dtype=float
+        )
+        
+        # Suitable berth indices per ship, left-aligned and padded with berth 0
+        suitable_counts = suitability.sum(axis=1)
+        suitable_berths = np.zeros((n_ships, max(1, int(suitable_counts.max(initial=0)))), dtype=np.int64)
+        for i in range(n_ships):
+            indices = np.flatnonzero(suitability[i])
+            suitable_berths[i, :len(indices)] = indices
+        
+        return PeakSeasonProblem(
+            suitability=suitability,
+            service_times=service_times,
+            arrival_hours=arrival_hours,
+            containers=containers,
+            suitable_berths=suitable_berths,
+            suitable_counts=suitable_counts
+        )
+    
     def genetic_algorithm_optimization(self) -> Dict[str, str]:
         """Use genetic algorithm for optimal berth allocation
         
+        The population is a 2D integer array (chromosome x ship -> berth index)
+        and every generation is scored, selected, recombined and mutated with
+        array operations over the whole population. With ``island_count > 1``
+        the search runs as an island model across worker processes.
+        
         Returns:
             Dictionary mapping ship IDs to berth IDs
         """
         if not self.ships or not self.berths:
             return {}
         
-        logger.info("Starting genetic algorithm optimization")
+        problem = self.build_problem()
+        rng = np.random.default_rng(self.config.random_seed)
+        seed_solutions = self._seed_solutions(problem, rng)
+        
+        if self.config.island_count > 1:
+            logger.info(f"Starting island-model genetic algorithm with {self.config.island_count} islands")
+            best_solution, best_fitness, generations = self._island_model_optimization(problem, seed_solutions)
+        else:
+            logger.info("Starting genetic algorithm optimization")
+            population = self._create_initial_population(problem, rng, seed_solutions)
+            result = self._evolve(problem, population, self.config.max_iterations, rng,
+                                  deadline=self._optimization_deadline())
+            best_solution, best_fitness, generations = result.best_solution, result.best_fitness, result.generations
         
-        # Initialize population
-        population = self._create_initial_population()
+        logger.info(f"Genetic algorithm completed with fitness: {best_fitness:.3f} after {generations} generations")
+        self.best_assignment = self._solution_to_assignment(best_solution)
+        return dict(self.best_assignment)
+    
+    def _optimization_deadline(self) -> Optional[float]:
+        """Wall-clock deadline (``time.monotonic``) for the genetic algorithm"""
+        if self.config.time_limit_seconds is None:
+            return None
+        return time.monotonic() + self.config.time_limit_seconds
+    
+    def _evolve(self, problem: PeakSeasonProblem, population: np.ndarray, generations: int,
+                rng: np.random.Generator, start_generation: int = 0,
+                deadline: Optional[float] = None) -> EvolutionResult:
+        """Run up to ``generations`` generations on a single population
+        
+        Args:
+            problem: Array form of the allocation problem
+            population: Initial (chromosomes, ships) population
+            generations: Maximum number of generations to run
+            rng: Random generator for the genetic operators
+            start_generation: Generations already run on this population
+            deadline: Optional ``time.monotonic`` deadline
+            
+        Returns:
+            EvolutionResult with the last evaluated population and best solution
+        """
+        # Evaluate fitness for the whole population at once
+        fitness_scores = problem.evaluate(population, self.config.efficiency_weight)
         best_solution = None
         best_fitness = float('-inf')
+        converged = False
+        generation = 0
+        last_improvement = 0
+        stagnation_window = self.config.stagnation_window
         
-        for generation in range(self.config.max_iterations):
-            # Evaluate fitness for each solution
-            fitness_scores = [self._evaluate_fitness(solution) for solution in population]
-            
+        for generation in range(generations):
             # Track best solution
-            max_fitness_idx = np.argmax(fitness_scores)
+            max_fitness_idx = int(np.argmax(fitness_scores))
+            if fitness_scores[max_fitness_idx] > best_fitness + self.config.convergence_threshold:
+                last_improvement = generation
             if fitness_scores[max_fitness_idx] > best_fitness:
-                best_fitness = fitness_scores[max_fitness_idx]
+                best_fitness = float(fitness_scores[max_fitness_idx])
                 best_solution = population[max_fitness_idx].copy()
             
             # Check convergence
-            if generation > 10 and abs(best_fitness - np.mean(fitness_scores)) < self.config.convergence_threshold:
-                logger.info(f"Converged at generation {generation}")
+            if (start_generation + generation > 10
+                    and abs(best_fitness - np.mean(fitness_scores)) < self.config.convergence_threshold):
+                logger.info(f"Converged at generation {start_generation + generation}")
+                converged = True
+                break
+            if stagnation_window and generation - last_improvement >= stagnation_window:
+                logger.info(f"No improvement for {stagnation_window} generations, "
+                            f"stopping at generation {start_generation + generation}")
+                converged = True
+                break
+            
+            if generation == generations - 1:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.info(f"Time limit reached at generation {start_generation + generation}")
                 break
             
             # Create next generation
-            population = self._create_next_generation(population, fitness_scores)
-        
-        logger.info(f"Genetic algorithm completed with fitness: {best_fitness:.3f}")
-        return self._solution_to_assignment(best_solution)
-    
-    def _create_initial_population(self) -> List[List[int]]:
-        """Create initial population for genetic algorithm"""
-        population = []
-        
-        for _ in range(self.config.population_size):
-            # Each solution is a list where index=ship, value=berth_index
-            solution = []
-            for ship in self.ships:
-                # Find suitable berths for this ship
-                suitable_berths = [i for i, berth in enumerate(self.berths) 
-                                 if self._is_berth_suitable(ship, berth)]
-                if suitable_berths:
-                    solution.append(random.choice(suitable_berths))
-                else:
-                    solution.append(0)  # Default to first berth
-            population.append(solution)
+            population = self._create_next_generation(problem, population, fitness_scores, rng)
+            fitness_scores = problem.evaluate(population, self.config.efficiency_weight)
         
-        return population
-    
-    def _is_berth_suitable(self, ship: Ship, berth: Berth) -> bool:
-        """Check if berth is suitable for ship"""
-        if ship.size > berth.capacity:
-            return False
-        if berth.suitable_ship_types and ship.ship_type not in berth.suitable_ship_types:
-            return False
-        return True
+        return EvolutionResult(
+            population=population,
+            fitness_scores=fitness_scores,
+            best_solution=best_solution,
+            best_fitness=best_fitness,
+            generations=generation + 1,
+            converged=converged
+        )
     
-    def _evaluate_fitness(self, solution: List[int]) -> float:
-        """Evaluate fitness of a solution
+    def _island_model_optimization(self, problem: PeakSeasonProblem,
+                                   seed_solutions: np.ndarray) -> Tuple[np.ndarray, float, int]:
+        """Island-model genetic algorithm across a pool of worker processes
+        
+        Each island evolves its own population for ``migration_interval``
+        generations in a worker process, reading the problem matrices from
+        shared memory. Between epochs the best chromosomes of every island
+        replace the worst of its neighbour (ring topology). The run stops on
+        ``max_iterations``, a global convergence test over all islands, the
+        stagnation window or the configured time limit.
         
         Args:
-            solution: List mapping ship index to berth index
-            
+            problem: Array form of the allocation problem
+            seed_solutions: Warm-start chromosomes placed in every island
+        
         Returns:
-            Fitness score (higher is better)
+            Tuple of (best solution, best fitness, generations run) across all islands
         """
-        total_waiting_time = 0
-        total_revenue = 0
-        berth_utilization = {i: 0 for i in range(len(self.berths))}
+        config = self.config
+        island_count = config.island_count
+        island_seeds = np.random.SeedSequence(config.random_seed).spawn(island_count)
+        populations = [
+            self._create_initial_population(problem, np.random.default_rng(seed), seed_solutions)
+            for seed in island_seeds
+        ]
+        max_workers = config.max_workers or min(island_count, os.cpu_count() or 1)
+        deadline = self._optimization_deadline()
         
-        # Simulate the schedule
-        berth_schedules = {i: [] for i in range(len(self.berths))}
+        best_solution = None
+        best_fitness = float('-inf')
+        generation = 0
+        last_improvement = 0
+        problem_spec, shared_blocks = _share_problem(problem)
         
-        for ship_idx, berth_idx in enumerate(solution):
-            if ship_idx >= len(self.ships) or berth_idx >= len(self.berths):
-                continue
-                
-            ship = self.ships[ship_idx]
-            berth = self.berths[berth_idx]
-            
-            if not self._is_berth_suitable(ship, berth):
-                total_waiting_time += 24  # Heavy penalty for unsuitable assignment
-                continue
-            
-            # Calculate when ship can start service
-            service_time = self.estimate_service_time_advanced(ship, berth)
-            
-            if not berth_schedules[berth_idx]:
-                start_time = max(ship.arrival_time, self.current_time)
-            else:
-                last_end_time = berth_schedules[berth_idx][-1]['end_time']
-                start_time = max(ship.arrival_time, last_end_time)
-            
-            end_time = start_time + timedelta(hours=service_time)
-            
-            # Calculate waiting time
-            waiting_time = (start_time - ship.arrival_time).total_seconds() / 3600
-            total_waiting_time += max(0, waiting_time)
-            
-            # Add to berth schedule
-            berth_schedules[berth_idx].append({
-                'ship_id': ship.id,
-                'start_time': start_time,
-                'end_time': end_time,
-                'service_time': service_time
-            })
-            
-            # Calculate revenue (simplified)
-            container_revenue = (ship.containers_to_load + ship.containers_to_unload) * 50  # $50 per container
-            total_revenue += container_revenue
-            
-            # Update berth utilization
-            berth_utilization[berth_idx] += service_time
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_island_worker,
+                                     initargs=(problem_spec, config)) as pool:
+                while generation < config.max_iterations:
+                    epoch_length = min(max(1, config.migration_interval), config.max_iterations - generation)
+                    time_remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    futures = [
+                        pool.submit(_evolve_island, populations[i], island_seeds[i].spawn(1)[0],
+                                    epoch_length, generation, time_remaining)
+                        for i in range(island_count)
+                    ]
+                    results = [future.result() for future in futures]
+                    generation += epoch_length
+                    
+                    epoch_best = max(results, key=lambda result: result.best_fitness)
+                    if epoch_best.best_fitness > best_fitness + config.convergence_threshold:
+                        last_improvement = generation
+                    if epoch_best.best_fitness > best_fitness:
+                        best_fitness = epoch_best.best_fitness
+                        best_solution = epoch_best.best_solution
+                    
+                    # Global convergence test over the union of all islands
+                    all_fitness = np.concatenate([result.fitness_scores for result in results])
+                    if generation > 10 and abs(best_fitness - np.mean(all_fitness)) < config.convergence_threshold:
+                        logger.info(f"Islands converged at generation {generation}")
+                        break
+                    if config.stagnation_window and generation - last_improvement >= config.stagnation_window:
+                        logger.info(f"No improvement for {config.stagnation_window} generations, "
+                                    f"stopping at generation {generation}")
+                        break
+                    if deadline is not None and time.monotonic() >= deadline:
+                        logger.info(f"Time limit reached at generation {generation}")
+                        break
+                    
+                    populations = self._migrate(results)
+        finally:
+            for block in shared_blocks:
+                block.close()
+                block.unlink()
         
-        # Calculate fitness components
-        avg_waiting_time = total_waiting_time / len(self.ships) if self.ships else 0
-        avg_berth_utilization = np.mean(list(berth_utilization.values()))
+        return best_solution, best_fitness, generation
+    
+    def _migrate(self, results: List[EvolutionResult]) -> List[np.ndarray]:
+        """Ring migration of elites: island i sends its best chromosomes to island i+1"""
+        populations = [result.population.copy() for result in results]
+        migration_size = min(self.config.migration_size, min(len(p) for p in populations) - 1)
+        if migration_size <= 0:
+            return populations
         
-        # Fitness function (higher is better)
-        fitness = (
-            total_revenue * 0.4 -  # Maximize revenue
-            avg_waiting_time * 1000 * self.config.efficiency_weight -  # Minimize waiting
-            (24 - avg_berth_utilization) * 100  # Maximize utilization
-        )
+        for i, result in enumerate(results):
+            target = (i + 1) % len(results)
+            elites = result.population[np.argsort(result.fitness_scores)[-migration_size:]]
+            worst = np.argsort(results[target].fitness_scores)[:migration_size]
+            populations[target][worst] = elites
+        return populations
+    
+    def _create_initial_population(self, problem: PeakSeasonProblem, rng: np.random.Generator,
+                                   seed_solutions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create initial population from seed solutions topped up with random suitable berths"""
+        population = problem.random_genes(self.config.population_size, rng)
+        if seed_solutions is not None and len(seed_solutions):
+            seed_count = min(len(seed_solutions), len(population))
+            population[:seed_count] = seed_solutions[:seed_count]
+        return population
+    
+    def _seed_solutions(self, problem: PeakSeasonProblem, rng: np.random.Generator) -> np.ndarray:
+        """Build warm-start chromosomes for the initial population
+        
+        Seeds are the previous best assignment (warm start) and, with greedy
+        seeding, the priority-based allocation and the greedy
+        BerthAllocationOptimizer plan. Each is repaired against the current
+        ships and berths.
+        
+        Returns:
+            (seeds, ships) array of berth indices, possibly empty
+        """
+        assignments = []
+        if self.config.warm_start and self.best_assignment:
+            assignments.append(self.best_assignment)
+        if self.config.greedy_seeding:
+            assignments.append(self._priority_based_allocation())
+            if BerthAllocationOptimizer is not None:
+                greedy_optimizer = BerthAllocationOptimizer()
+                for ship in self.ships:
+                    greedy_optimizer.add_ship(ship)
+                for berth in self.berths:
+                    greedy_optimizer.add_berth(berth)
+                greedy_result = greedy_optimizer.optimize_berth_allocation(self.current_time)
+                assignments.append(greedy_result.ship_berth_assignments)
+        
+        seeds = [self._assignment_to_solution(problem, assignment, rng) for assignment in assignments]
+        return np.array(seeds, dtype=np.int64).reshape(len(seeds), problem.n_ships)
+    
+    def _assignment_to_solution(self, problem: PeakSeasonProblem, assignment: Dict[str, str],
+                                rng: np.random.Generator) -> np.ndarray:
+        """Convert a ship-berth assignment into a chromosome, repairing stale genes
+        
+        Ships that were removed since the assignment was made are dropped.
+        Ships that were added, or whose berth is gone or no longer suitable,
+        get a random suitable berth.
+        """
+        berth_index = {berth.id: j for j, berth in enumerate(self.berths)}
+        solution = problem.random_genes(1, rng)[0]
+        repaired = 0
+        
+        for i, ship in enumerate(self.ships):
+            j = berth_index.get(assignment.get(ship.id))
+            if j is not None and problem.suitability[i, j]:
+                solution[i] = j
+            else:
+                repaired += 1
         
-        return fitness
+        if repaired:
+            logger.debug(f"Repaired {repaired} of {len(self.ships)} genes in seed solution")
+        return solution
     
-    def _create_next_generation(self, population: List[List[int]], fitness_scores: List[float]) -> List[List[int]]:
+    def _is_berth_suitable(self, ship: Ship, berth: Berth) -> bool:
+        """Check if berth is suitable for ship"""
+        if ship.size > berth.capacity:
+            return False
+        if berth.suitable_ship_types and ship.ship_type not in berth.suitable_ship_types:
+            return False
+        return True
+    
+    def _create_next_generation(self, problem: PeakSeasonProblem, population: np.ndarray,
+                                fitness_scores: np.ndarray, rng: np.random.Generator) -> np.ndarray:
         """Create next generation using selection, crossover, and mutation"""
-        next_generation = []
+        population_size = self.config.population_size
         
         # Keep best solutions (elitism)
-        elite_count = max(1, self.config.population_size // 10)
-        elite_indices = np.argsort(fitness_scores)[-elite_count:]
-        for idx in elite_indices:
-            next_generation.append(population[idx].copy())
-        
-        # Generate rest through crossover and mutation
-        while len(next_generation) < self.config.population_size:
-            # Tournament selection
-            parent1 = self._tournament_selection(population, fitness_scores)
-            parent2 = self._tournament_selection(population, fitness_scores)
-            
-            # Crossover
-            if random.random() < self.config.crossover_rate:
-                child1, child2 = self._crossover(parent1, parent2)
-            else:
-                child1, child2 = parent1.copy(), parent2.copy()
-            
-            # Mutation
-            if random.random() < self.config.mutation_rate:
-                child1 = self._mutate(child1)
-            if random.random() < self.config.mutation_rate:
-                child2 = self._mutate(child2)
-            
-            next_generation.extend([child1, child2])
+        elite_count = max(1, population_size // 10)
+        elites = population[np.argsort(fitness_scores)[-elite_count:]]
         
-        return next_generation[:self.config.population_size]
+        # Generate rest through crossover and mutation, two children per pair
+        pair_count = (population_size - elite_count + 1) // 2
+        parent1 = self._tournament_selection(population, fitness_scores, pair_count, rng)
+        parent2 = self._tournament_selection(population, fitness_scores, pair_count, rng)
+        child1, child2 = self._crossover(parent1, parent2, rng)
+        children = self._mutate(problem, np.concatenate([child1, child2]), rng)
+        
+        return np.concatenate([elites, children])[:population_size]
     
-    def _tournament_selection(self, population: List[List[int]], fitness_scores: List[float]) -> List[int]:
-        """Tournament selection for genetic algorithm"""
-        tournament_size = 3
-        tournament_indices = random.sample(range(len(population)), min(tournament_size, len(population)))
-        best_idx = max(tournament_indices, key=lambda i: fitness_scores[i])
-        return population[best_idx].copy()
+    def _tournament_selection(self, population: np.ndarray, fitness_scores: np.ndarray,
+                              count: int, rng: np.random.Generator) -> np.ndarray:
+        """Tournament selection for genetic algorithm, ``count`` winners at once"""
+        tournament_size = min(3, len(population))
+        contestants = rng.integers(0, len(population), size=(count, tournament_size))
+        winners = contestants[np.arange(count), np.argmax(fitness_scores[contestants], axis=1)]
+        return population[winners]
     
-    def _crossover(self, parent1: List[int], parent2: List[int]) -> Tuple[List[int], List[int]]:
-        """Single-point crossover"""
-        if len(parent1) <= 1:
+    def _crossover(self, parent1: np.ndarray, parent2: np.ndarray,
+                   rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Single-point crossover applied row-wise to pairs of parents"""
+        pair_count, gene_count = parent1.shape
+        if gene_count <= 1:
             return parent1.copy(), parent2.copy()
         
-        crossover_point = random.randint(1, len(parent1) - 1)
-        child1 = parent1[:crossover_point] + parent2[crossover_point:]
-        child2 = parent2[:crossover_point] + parent1[crossover_point:]
+        crossover_points = rng.integers(1, gene_count, size=pair_count)
+        # Pairs that skip crossover keep every gene from their own parent
+        crossover_points[rng.random(pair_count) >= self.config.crossover_rate] = gene_count
+        from_own_parent = np.arange(gene_count) < crossover_points[:, None]
+        child1 = np.where(from_own_parent, parent1, parent2)
+        child2 = np.where(from_own_parent, parent2, parent1)
         return child1, child2
     
-    def _mutate(self, solution: List[int]) -> List[int]:
-        """Mutate solution by randomly changing berth assignments"""
-        mutated = solution.copy()
-        for i in range(len(mutated)):
-            if random.random() < 0.1:  # 10% chance to mutate each gene
-                if i < len(self.ships):
-                    ship = self.ships[i]
-                    suitable_berths = [j for j, berth in enumerate(self.berths) 
-                                     if self._is_berth_suitable(ship, berth)]
-                    if suitable_berths:
-                        mutated[i] = random.choice(suitable_berths)
-        return mutated
-    
-    def _solution_to_assignment(self, solution: List[int]) -> Dict[str, str]:
+    def _mutate(self, problem: PeakSeasonProblem, population: np.ndarray,
+                rng: np.random.Generator) -> np.ndarray:
+        """Mutate solutions by randomly changing berth assignments"""
+        mutated_rows = rng.random(len(population)) < self.config.mutation_rate
+        # 10% chance to mutate each gene, only for ships that have a suitable berth
+        mutated_genes = (
+            (rng.random(population.shape) < 0.1)
+            & mutated_rows[:, None]
+            & (problem.suitable_counts > 0)[None, :]
+        )
+        return np.where(mutated_genes, problem.random_genes(len(population), rng), population)
+    
+    def _solution_to_assignment(self, solution: np.ndarray) -> Dict[str, str]:
         """Convert genetic algorithm solution to ship-berth assignment"""
         assignment = {}
         for ship_idx, berth_idx in enumerate(solution):
             if ship_idx < len(self.ships) and berth_idx < len(self.berths):
-                assignment[self.ships[ship_idx].id] = self.berths[berth_idx].id
+                assignment[self.ships[ship_idx].id] = self.berths[int(berth_idx)].id
         return assignment
     
     def optimize_peak_season(self, current_time: datetime = None) -> Dict[str, Any]:
@@ -624,12 +908,80 @@ class PeakSeasonOptimizer:
         }
     
     def clear(self) -> None:
-        """Clear ships and berths for new optimization run"""
+        """Clear ships and berths for new optimization run
+        
+        The best assignment is kept so the next run can warm-start from it.
+        """
         self.ships.clear()
         self.berths.clear()
         logger.info("Cleared ships and berths for new optimization")
 
 
+# Island-model worker state. Each worker process attaches to the shared problem
+# matrices once in its initializer, reuses them for every epoch it runs and
+# closes them when it exits.
+_island_problem: Optional[PeakSeasonProblem] = None
+_island_optimizer: Optional[PeakSeasonOptimizer] = None
+_island_shared_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _share_problem(problem: PeakSeasonProblem) -> Tuple[Dict[str, Tuple[str, Tuple[int, ...], str]],
+                                                          List[shared_memory.SharedMemory]]:
+    """Copy the problem matrices into shared memory blocks
+    
+    Returns:
+        Tuple of (spec mapping field name to (block name, shape, dtype), blocks).
+        The caller owns the blocks and must close and unlink them.
+    """
+    spec = {}
+    blocks = []
+    for field in fields(PeakSeasonProblem):
+        array = np.ascontiguousarray(getattr(problem, field.name))
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        spec[field.name] = (block.name, array.shape, array.dtype.str)
+        blocks.append(block)
+    return spec, blocks
+
+
+def _init_island_worker(problem_spec: Dict[str, Tuple[str, Tuple[int, ...], str]],
+                        config: OptimizationConfiguration) -> None:
+    """Process pool initializer: attach to the shared problem matrices"""
+    global _island_problem, _island_optimizer
+    arrays = {}
+    for name, (block_name, shape, dtype) in problem_spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _island_shared_blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    _island_problem = PeakSeasonProblem(**arrays)
+    _island_optimizer = PeakSeasonOptimizer(config)
+    # Pool workers leave through os._exit, which skips atexit handlers but runs multiprocessing finalizers
+    multiprocessing_util.Finalize(None, _release_island_worker, exitpriority=10)
+
+
+def _release_island_worker() -> None:
+    """Drop the worker's views of the shared problem matrices and close the blocks
+    
+    The parent process unlinks the blocks once the pool has shut down.
+    """
+    global _island_problem, _island_optimizer
+    # The arrays must go first; a block with exported buffers cannot be closed
+    _island_problem = None
+    _island_optimizer = None
+    while _island_shared_blocks:
+        _island_shared_blocks.pop().close()
+
+
+def _evolve_island(population: np.ndarray, seed: np.random.SeedSequence, generations: int,
+                   start_generation: int, time_remaining: Optional[float]) -> EvolutionResult:
+    """Run one island epoch inside a worker process"""
+    deadline = None if time_remaining is None else time.monotonic() + time_remaining
+    return _island_optimizer._evolve(
+        _island_problem, population, generations, np.random.default_rng(seed),
+        start_generation=start_generation, deadline=deadline
+    )
+
+
 def create_sample_peak_season_scenario() -> Dict[str, Any]:
     """Create a sample peak season scenario for testing
     
@@ -0,0 +1,186 @@
+# Comments for context:
+# This module memoizes the derived analytics of the data layer (throughput
+# trends, cargo time series and forecasts, historical simulation parameters).
+# They used to be recomputed from scratch on every call, and several of them
+# call each other, so a single dashboard rerun repeated the same analyses
+# many times over.
+#
+# Approach: every derived result is a node of a small dependency graph. Source
+# nodes wrap the raw data loaders (which have their own file caches) and are
+# versioned by a fingerprint of the data they return. A derived node's version
+# combines the versions of its inputs, so it is computed once and reused until
+# the data behind one of its upstream raw files changes.
+
+import hashlib
+import logging
+import pickle
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    from .single_flight import SingleFlight
+except ImportError:
+    from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def data_fingerprint(value: Any) -> str:
+    """Content hash of a loaded data value (DataFrames, Series, dicts, lists, scalars)
+
+    Args:
+        value: Data returned by a loader
+
+    Returns:
+        Hex digest that changes whenever the data changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(digest, value)
+    return digest.hexdigest()
+
+
+def _update_fingerprint(digest, value: Any):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode())
+            digest.update(repr([str(dtype) for dtype in value.dtypes]).encode())
+        else:
+            digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(repr(list(value.index.names)).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cells (e.g. lists) - fall back to the pickled frame
+            digest.update(pickle.dumps(value))
+    elif isinstance(value, dict):
+        digest.update(b'dict')
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update_fingerprint(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(type(value).__name__.encode())
+        for item in value:
+            _update_fingerprint(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    return value is None or (isinstance(value, (dict, list, tuple)) and len(value) == 0)
+
+
+@dataclass
+class AnalysisNode:
+    """A loader or analysis in the graph
+
+    Source nodes take no inputs and are re-run on every evaluation; their
+    version is the fingerprint of the data they return. Derived nodes are
+    called with the values of their inputs, in order.
+    """
+    name: str
+    compute: Callable[..., Any]
+    inputs: List[str] = field(default_factory=list)
+    source: bool = False
+
+
+class AnalysisGraph:
+    """Dependency graph of memoized analyses keyed by the versions of their inputs"""
+
+    def __init__(self):
+        self.nodes: Dict[str, AnalysisNode] = {}
+        self.results: Dict[str, tuple] = {}
+        self.lock = threading.Lock()
+        self.flights = SingleFlight()
+        self.stats = {'hits': 0, 'misses': 0, 'source_loads': 0}
+
+    def add_node(self, name: str, compute: Callable[..., Any], inputs: Sequence[str] = (),
+                 source: bool = False) -> AnalysisNode:
+        """Register a node
+
+        Args:
+            name: Unique node name
+            compute: Loader (source nodes) or function of the input values
+            inputs: Names of the nodes whose values compute receives
+            source: Whether the node loads raw data rather than deriving it
+
+        Returns:
+            The registered node
+        """
+        if source and inputs:
+            raise ValueError(f"Source node {name} cannot have inputs")
+        missing = [input_name for input_name in inputs if input_name not in self.nodes]
+        if missing:
+            raise ValueError(f"Node {name} depends on unknown nodes: {missing}")
+        node = AnalysisNode(name=name, compute=compute, inputs=list(inputs), source=source)
+        with self.lock:
+            self.nodes[name] = node
+            self.results.pop(name, None)
+        return node
+
+    def get(self, name: str) -> Any:
+        """Value of a node, computing it and its stale upstream nodes as needed"""
+        return self._evaluate(name, {})[1]
+
+    def version(self, name: str) -> str:
+        """Current version of a node (evaluates it)"""
+        return self._evaluate(name, {})[0]
+
+    def _evaluate(self, name: str, evaluated: Dict[str, tuple]) -> tuple:
+        """Return (version, value) of a node; evaluated memoizes nodes within one call"""
+        if name in evaluated:
+            return evaluated[name]
+        node = self.nodes[name]
+
+        if node.source:
+            value = node.compute()
+            result = (data_fingerprint(value), value)
+            with self.lock:
+                self.stats['source_loads'] += 1
+            evaluated[name] = result
+            return result
+
+        upstream = [self._evaluate(input_name, evaluated) for input_name in node.inputs]
+        version = hashlib.blake2b(
+            repr((name, [input_version for input_version, _ in upstream])).encode(), digest_size=16
+        ).hexdigest()
+
+        with self.lock:
+            cached = self.results.get(name)
+            if cached is not None and cached[0] == version:
+                self.stats['hits'] += 1
+                evaluated[name] = cached
+                return cached
+            self.stats['misses'] += 1
+
+        # Callers missing the same node version at once share one computation
+        value = self.flights.do((name, version), lambda: node.compute(*[input_value for _, input_value in upstream]))
+        result = (version, value)
+        # Empty results usually mean a failed analysis; retry those next time
+        if not _is_empty(value):
+            with self.lock:
+                self.results[name] = result
+        evaluated[name] = result
+        return result
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop the memoized value of a node, or of every node"""
+        with self.lock:
+            if name is None:
+                self.results.clear()
+            else:
+                self.results.pop(name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics and the memoized nodes"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['cached_nodes'] = sorted(self.results)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
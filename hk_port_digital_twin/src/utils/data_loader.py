@@ -10,18 +10,22 @@ This module provides functions to load and process various data sources includin
 import pandas as pd
 import numpy as np
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Callable
 import logging
 from datetime import datetime, timedelta
 from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error
 import xml.etree.ElementTree as ET
 import warnings
 import threading
 import time
+import hashlib
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, wraps
 warnings.filterwarnings('ignore')
 
 # Configure logging
@@ -50,6 +54,50 @@ except ImportError:
     VesselDataFetcher = None
     VesselDataScheduler = None
 
+try:
+    from .forecasting import fit_linear_trends
+except ImportError:
+    from forecasting import fit_linear_trends
+
+# On-disk cache of cleaned statistics tables (needs pyarrow)
+try:
+    from .table_cache import table_cache, table_cache_enabled
+except ImportError:
+    table_cache = None
+    table_cache_enabled = None
+
+try:
+    from .refresh_scheduler import RefreshScheduler
+except ImportError:
+    from refresh_scheduler import RefreshScheduler
+
+try:
+    from .single_flight import SingleFlight, single_flight
+except ImportError:
+    from single_flight import SingleFlight, single_flight
+
+try:
+    from .vessel_diff import VesselDiffEngine
+except ImportError:
+    from vessel_diff import VesselDiffEngine
+
+# Local SQLite history of every vessel movement seen in the feeds
+try:
+    from .vessel_history import vessel_history
+except ImportError:
+    from vessel_history import vessel_history
+
+# Persisted snapshot of the historical simulation parameters
+try:
+    from .parameter_snapshot import parameter_snapshot
+except ImportError:
+    from parameter_snapshot import parameter_snapshot
+
+try:
+    from .analysis_graph import AnalysisGraph
+except ImportError:
+    from analysis_graph import AnalysisGraph
+
 # Data file paths
 RAW_DATA_DIR = (Path(__file__).parent.parent.parent / ".." / "raw_data").resolve()
 CONTAINER_THROUGHPUT_FILE = RAW_DATA_DIR / "Total_container_throughput_by_mode_of_transport_(EN).csv"
@@ -65,12 +113,302 @@ VESSEL_XML_FILES = [
     'Expected_departures.xml'
 ]
 
+# Size of the chunks read when hashing a source file
+PARSE_CACHE_HASH_CHUNK_SIZE = 1 << 20
+
+def _file_signature(path) -> Optional[Tuple[int, int]]:
+    """Get the (mtime in nanoseconds, size) signature of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except (OSError, TypeError, ValueError):
+        return None
+
+def _share_parsed(value):
+    """Hand out a cached parse result without letting callers modify the cached copy.
+    
+    Shallow DataFrame copies share their data until either side writes to it
+    (copy-on-write, always on since pandas 3, which the requirements pin), so
+    this is cheap.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {key: _share_parsed(item) for key, item in value.items()}
+    return value
+
+def _parsed_size(value) -> int:
+    """Estimate the memory held by a parse result in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_parsed_size(item) for item in value.values())
+    return 0
+
+class ParseCache:
+    """Cache of parsed raw data files keyed by source file and change signature.
+    
+    An entry stays valid while every source file keeps its (mtime, size)
+    signature. When only the modification time changed - e.g. a feed was
+    downloaded again with the same content - a content hash confirms the
+    entry before the file is re-parsed.
+    """
+    
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.flights = SingleFlight()
+        self.stats = {'hits': 0, 'misses': 0, 'hash_confirmations': 0, 'bytes_parsed': 0, 'bytes_hashed': 0}
+    
+    def _hash_files(self, paths: List[Path]) -> str:
+        """Hash the contents of the source files."""
+        digest = hashlib.sha256()
+        bytes_hashed = 0
+        for path in paths:
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(PARSE_CACHE_HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    bytes_hashed += len(chunk)
+        with self.lock:
+            self.stats['bytes_hashed'] += bytes_hashed
+        return digest.hexdigest()
+    
+    def get_or_parse(self, key, paths: List[Path], parse: Callable[[], any]) -> any:
+        """Return the cached result for key, parsing the source files only if they changed.
+        
+        Args:
+            key: Hashable cache key identifying the parse function and its arguments
+            paths: Source files the result is parsed from
+            parse: Function producing the result from the source files
+            
+        Returns:
+            The parse result. DataFrames are shallow copies of the cached frames.
+        """
+        paths = list(paths)
+        signatures = [_file_signature(path) for path in paths]
+        if not paths or None in signatures:
+            # Missing files are reported by the loaders themselves and never cached
+            return parse()
+        
+        with self.lock:
+            entry = self.entries.get(key)
+        
+        digest = None
+        if entry is not None:
+            if entry['signatures'] == signatures:
+                with self.lock:
+                    self.stats['hits'] += 1
+                return _share_parsed(entry['value'])
+            
+            same_sizes = [signature[1] for signature in entry['signatures']] == [signature[1] for signature in signatures]
+            if entry['paths'] == paths and same_sizes:
+                digest = self._hash_files(paths)
+            if digest is not None and digest == entry['digest']:
+                with self.lock:
+                    entry['signatures'] = signatures
+                    self.stats['hits'] += 1
+                    self.stats['hash_confirmations'] += 1
+                return _share_parsed(entry['value'])
+        
+        # Concurrent misses for the same key wait for a single parse
+        return _share_parsed(self.flights.do(key, lambda: self._parse(key, paths, signatures, parse, digest)))
+    
+    def _parse(self, key, paths: List[Path], signatures: List[Tuple[int, int]], parse: Callable[[], any],
+               digest: Optional[str] = None) -> any:
+        """Parse the source files and cache the result.
+        
+        The content hash is reused when get_or_parse already computed it.
+        """
+        if digest is None:
+            digest = self._hash_files(paths)
+        value = parse()
+        
+        with self.lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_parsed'] += sum(signature[1] for signature in signatures)
+            # Results from a failed or empty parse are retried on the next call, and a
+            # file that changed while it was parsed is picked up again next time
+            if _parsed_size(value) > 0 and [_file_signature(path) for path in paths] == signatures:
+                self.entries[key] = {
+                    'paths': paths,
+                    'signatures': signatures,
+                    'digest': digest,
+                    'value': value,
+                    'size_bytes': _parsed_size(value)
+                }
+        return value
+    
+    def invalidate(self, key) -> None:
+        """Remove a cached result."""
+        with self.lock:
+            self.entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Clear all cached results."""
+        with self.lock:
+            self.entries.clear()
+    
+    def get_stats(self) -> Dict[str, any]:
+        """Get cache statistics."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['cached_items'] = len(self.entries)
+            stats['cached_bytes'] = sum(entry['size_bytes'] for entry in self.entries.values())
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+# Global parse cache instance
+parse_cache = ParseCache()
+
+def cached_file_parse(source_paths: Callable[..., List[Path]]):
+    """Decorate a loader so its result is cached until its source files change.
+    
+    Args:
+        source_paths: Function of the loader's arguments returning the files it
+            reads. It is called on every load, so module-level paths patched at
+            runtime are honoured.
+    """
+    def decorator(loader):
+        @wraps(loader)
+        def wrapper(*args, **kwargs):
+            key = (loader.__name__, repr(args), repr(sorted(kwargs.items())))
+            return parse_cache.get_or_parse(key, source_paths(*args, **kwargs),
+                                            lambda: loader(*args, **kwargs))
+        return wrapper
+    return decorator
+
+# Upper bound on the threads used to load independent raw data files
+LOADER_MAX_WORKERS = 8
+
+# Column dtypes of the cargo statistics tables, keyed by regular expressions over column names
+_CARGO_THROUGHPUT_DTYPES = {
+    r'^Port_cargo_throughput_\d{4}$': 'int64',
+    r'^Port_cargo_throughput_percentage_distribution_\d{4}$': 'float64',
+    r'^Port_cargo_throughput_average_annual_rate_of_change_\d{4}_\d{4}$': 'float64'
+}
+CARGO_STATISTICS_DTYPES = {
+    'Table_1_Eng': {r'^Shipment_type$': 'str', **_CARGO_THROUGHPUT_DTYPES},
+    'Table_2_Eng': {r'^Transport_mode$': 'str', **_CARGO_THROUGHPUT_DTYPES}
+}
+
+# Wall-clock seconds spent loading each file in the last parallel load, by loader
+_load_timings = {}
+
+def get_load_timings() -> Dict[str, Dict[str, float]]:
+    """Get the per-file load times of the last parallel load of each loader.
+    
+    Returns:
+        Dict[str, Dict[str, float]]: Seconds per file name, keyed by loader name
+    """
+    return {loader: dict(timings) for loader, timings in _load_timings.items()}
+
+def _load_in_parallel(loader_name: str, tasks: Dict[str, Callable[[], any]],
+                      max_workers: Optional[int] = None) -> Dict[str, any]:
+    """Run independent file loads on a bounded thread pool.
+    
+    Reading and parsing release the GIL in parts, so loading several files
+    at once overlaps their I/O and native parsing. Each task reports its own
+    errors; the per-file timings are kept for get_load_timings().
+    
+    Args:
+        loader_name: Name the timings are recorded under
+        tasks: Load functions keyed by file name
+        max_workers: Maximum number of threads (defaults to LOADER_MAX_WORKERS)
+        
+    Returns:
+        Dict[str, any]: Results keyed by file name, in the order of tasks
+    """
+    def timed(task):
+        start = time.perf_counter()
+        result = task()
+        return result, time.perf_counter() - start
+    
+    workers = max(1, min(max_workers or LOADER_MAX_WORKERS, len(tasks)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=loader_name) as executor:
+        futures = {name: executor.submit(timed, task) for name, task in tasks.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    
+    timings = {name: round(elapsed, 4) for name, (_, elapsed) in outcomes.items()}
+    _load_timings[loader_name] = timings
+    logger.info(f"{loader_name}: loaded {len(tasks)} files in {time.perf_counter() - start:.3f}s "
+                f"on {workers} threads ({timings})")
+    return {name: result for name, (result, _) in outcomes.items()}
+
+def _cargo_statistics_dtypes(table_name: str, columns: List[str]) -> Dict[str, str]:
+    """Resolve the configured dtypes of a cargo statistics table for its actual columns."""
+    patterns = CARGO_STATISTICS_DTYPES.get(table_name, {})
+    dtypes = {}
+    for column in columns:
+        for pattern, dtype in patterns.items():
+            if re.match(pattern, column):
+                dtypes[column] = dtype
+                break
+    return dtypes
+
+def _read_cargo_statistics_csv(csv_file: Path, table_name: str) -> pd.DataFrame:
+    """Read a cargo statistics CSV with its explicit dtype map.
+    
+    Falls back to dtype inference if the file has values the map does not
+    allow, e.g. '-' placeholders in a numeric column.
+    """
+    dtypes = _cargo_statistics_dtypes(table_name, list(pd.read_csv(csv_file, nrows=0).columns))
+    if dtypes:
+        try:
+            return pd.read_csv(csv_file, dtype=dtypes)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"{table_name} does not match its dtype map, inferring dtypes: {e}")
+    return pd.read_csv(csv_file)
+
+def _cargo_statistics_files() -> List[Path]:
+    """List the port cargo statistics CSV files."""
+    return sorted(PORT_CARGO_STATS_DIR.glob("*.CSV"))
+
+def _load_cached_table(name: str, source_paths: List[Path], build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Load a cleaned table from the on-disk table cache, building it from the raw files when stale.
+    
+    Falls back to building the table directly when the table cache is
+    unavailable or disabled, or a source file is missing.
+    """
+    if table_cache is None or not table_cache_enabled() or not all(Path(path).exists() for path in source_paths):
+        return build()
+    return table_cache.load_or_build(name, source_paths, build)
+
+def build_table_cache(rebuild: bool = False) -> Dict[str, int]:
+    """Materialize the cleaned statistics tables in the on-disk table cache.
+    
+    Args:
+        rebuild: Discard the existing cached tables first
+        
+    Returns:
+        Dict[str, int]: Row count of every cached table
+    """
+    if table_cache is None or not table_cache_enabled():
+        logger.warning("Table cache is unavailable or disabled")
+        return {}
+    
+    if rebuild:
+        table_cache.clear()
+    parse_cache.clear()
+    
+    load_container_throughput()
+    load_annual_container_throughput()
+    load_port_cargo_statistics()
+    
+    return {name: entry['rows'] for name, entry in table_cache.read_manifest()['tables'].items()}
+
+@cached_file_parse(lambda: [CONTAINER_THROUGHPUT_FILE])
 def load_container_throughput() -> pd.DataFrame:
     """Load and process container throughput time series data.
     
     Returns:
         pd.DataFrame: Processed container throughput data with datetime index
     """
+    return _load_cached_table('container_throughput', [CONTAINER_THROUGHPUT_FILE], _read_container_throughput)
+
+def _read_container_throughput() -> pd.DataFrame:
+    """Read and clean the monthly container throughput table from the raw CSV."""
     try:
         # Load the CSV file
         df = pd.read_csv(CONTAINER_THROUGHPUT_FILE)
@@ -116,12 +454,18 @@ def load_container_throughput() -> pd.DataFrame:
         logger.error(f"Error loading container throughput data: {e}")
         return pd.DataFrame()
 
+@cached_file_parse(lambda: [CONTAINER_THROUGHPUT_FILE])
 def load_annual_container_throughput() -> pd.DataFrame:
     """Load annual container throughput summary data.
     
     Returns:
         pd.DataFrame: Annual throughput data
     """
+    return _load_cached_table('annual_container_throughput', [CONTAINER_THROUGHPUT_FILE],
+                              _read_annual_container_throughput)
+
+def _read_annual_container_throughput() -> pd.DataFrame:
+    """Read and clean the annual container throughput rows from the raw CSV."""
     try:
         df = pd.read_csv(CONTAINER_THROUGHPUT_FILE)
         
@@ -150,41 +494,50 @@ def load_annual_container_throughput() -> pd.DataFrame:
         logger.error(f"Error loading annual container throughput data: {e}")
         return pd.DataFrame()
 
-def load_port_cargo_statistics(focus_tables: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+@cached_file_parse(lambda focus_tables=None, max_workers=None: _cargo_statistics_files())
+def load_port_cargo_statistics(focus_tables: Optional[List[str]] = None,
+                               max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
     """Load port cargo statistics from multiple CSV files.
     
+    The tables are read in parallel with the dtypes from CARGO_STATISTICS_DTYPES;
+    per-file load times are available from get_load_timings().
+    
     Args:
         focus_tables: Optional list of specific table names to load (e.g., ['Table_1_Eng', 'Table_2_Eng'])
                      If None, loads all available tables
+        max_workers: Maximum number of loader threads (defaults to LOADER_MAX_WORKERS)
     
     Returns:
         Dict[str, pd.DataFrame]: Dictionary of cargo statistics by table
     """
-    cargo_stats = {}
+    def load_table(csv_file: Path, table_name: str) -> Optional[pd.DataFrame]:
+        try:
+            # Clean and validate the data, or read the cleaned table from the table cache
+            df = _load_cached_table(
+                f'cargo_statistics_{table_name}', [csv_file],
+                lambda: _clean_cargo_statistics_data(_read_cargo_statistics_csv(csv_file, table_name), table_name)
+            )
+            logger.info(f"Loaded {table_name}: {df.shape[0]} rows, {df.shape[1]} columns")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error loading {csv_file.name}: {e}")
+            return None
     
     try:
         # Get all CSV files in the Port Cargo Statistics directory
-        csv_files = list(PORT_CARGO_STATS_DIR.glob("*.CSV"))
-        
-        for csv_file in csv_files:
+        tasks = {}
+        for csv_file in _cargo_statistics_files():
             table_name = csv_file.stem.replace("Port Cargo Statistics_CSV_Eng-", "")
             
             # Skip if focus_tables is specified and this table is not in the list
             if focus_tables and table_name not in focus_tables:
                 continue
             
-            try:
-                df = pd.read_csv(csv_file)
-                
-                # Clean and validate the data
-                df = _clean_cargo_statistics_data(df, table_name)
-                
-                cargo_stats[table_name] = df
-                logger.info(f"Loaded {table_name}: {df.shape[0]} rows, {df.shape[1]} columns")
-                
-            except Exception as e:
-                logger.error(f"Error loading {csv_file.name}: {e}")
-                continue
+            tasks[table_name] = lambda csv_file=csv_file, table_name=table_name: load_table(csv_file, table_name)
+        
+        loaded = _load_in_parallel('load_port_cargo_statistics', tasks, max_workers) if tasks else {}
+        cargo_stats = {table_name: df for table_name, df in loaded.items() if df is not None}
         
         logger.info(f"Loaded {len(cargo_stats)} cargo statistics tables")
         return cargo_stats
@@ -213,43 +566,10 @@ def get_time_series_data(cargo_stats: Dict[str, pd.DataFrame]) -> Dict[str, pd.D
     time_series = {}
     
     try:
-        # Process Table 1 - Shipment Types (2014-2023)
-        if 'Table_1_Eng' in cargo_stats:
-            df1 = cargo_stats['Table_1_Eng']
-            
-            # Extract throughput columns (years 2014-2023)
-            throughput_cols = [col for col in df1.columns if 'Port_cargo_throughput_' in col and not 'percentage' in col and not 'rate_of_change' in col]
-            
-            # Create time series DataFrame
-            years = [int(col.split('_')[-1]) for col in throughput_cols]
-            
-            shipment_ts = pd.DataFrame(index=years)
-            for _, row in df1.iterrows():
-                shipment_type = row.iloc[0]  # First column is shipment type
-                values = [row[col] for col in throughput_cols]
-                shipment_ts[shipment_type] = values
-            
-            shipment_ts.index.name = 'Year'
-            time_series['shipment_types'] = shipment_ts
-            
-        # Process Table 2 - Transport Modes (2014, 2019-2023)
-        if 'Table_2_Eng' in cargo_stats:
-            df2 = cargo_stats['Table_2_Eng']
-            
-            # Extract throughput columns
-            throughput_cols = [col for col in df2.columns if 'Port_cargo_throughput_' in col and not 'percentage' in col and not 'rate_of_change' in col]
-            
-            # Create time series DataFrame
-            years = [int(col.split('_')[-1]) for col in throughput_cols]
-            
-            transport_ts = pd.DataFrame(index=years)
-            for _, row in df2.iterrows():
-                transport_mode = row.iloc[0]  # First column is transport mode
-                values = [row[col] for col in throughput_cols]
-                transport_ts[transport_mode] = values
-            
-            transport_ts.index.name = 'Year'
-            time_series['transport_modes'] = transport_ts
+        # Table 1 - Shipment Types (2014-2023), Table 2 - Transport Modes (2014, 2019-2023)
+        for table_name, category in [('Table_1_Eng', 'shipment_types'), ('Table_2_Eng', 'transport_modes')]:
+            if table_name in cargo_stats:
+                time_series[category] = _throughput_time_series(cargo_stats[table_name])
             
         logger.info(f"Generated time series data for {len(time_series)} categories")
         return time_series
@@ -258,6 +578,34 @@ def get_time_series_data(cargo_stats: Dict[str, pd.DataFrame]) -> Dict[str, pd.D
         logger.error(f"Error generating time series data: {e}")
         return {}
 
+# Yearly throughput columns of the cargo statistics tables, e.g. Port_cargo_throughput_2023
+THROUGHPUT_YEAR_COLUMN_PATTERN = r'^Port_cargo_throughput_(\d{4})$'
+
+def _throughput_time_series(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape a cargo statistics table into a year-by-category time series.
+    
+    Args:
+        df: Cargo statistics table with the category in its first column and
+            one throughput column per year
+        
+    Returns:
+        pd.DataFrame: Throughput indexed by year with one column per category,
+            in the table's column and row order
+    """
+    category_column = df.columns[0]
+    column_years = pd.Series(df.columns.str.extract(THROUGHPUT_YEAR_COLUMN_PATTERN, expand=False), index=df.columns)
+    column_years = column_years.dropna().astype(int)
+    
+    long_df = df.melt(id_vars=category_column, value_vars=list(column_years.index),
+                      var_name='column', value_name='throughput')
+    long_df['Year'] = long_df['column'].map(column_years)
+    
+    time_series = long_df.pivot(index='Year', columns=category_column, values='throughput')
+    time_series = time_series.reindex(index=column_years.to_numpy(), columns=df[category_column].unique())
+    time_series.index.name = 'Year'
+    time_series.columns.name = None
+    return time_series
+
 def forecast_cargo_throughput(time_series_data: Dict[str, pd.DataFrame], forecast_years: int = 3) -> Dict[str, Dict]:
     """Generate forecasts for cargo throughput using linear regression.
     
@@ -274,46 +622,38 @@ def forecast_cargo_throughput(time_series_data: Dict[str, pd.DataFrame], forecas
         for category, df in time_series_data.items():
             category_forecasts = {}
             
-            for column in df.columns:
-                # Get non-null values
-                series = df[column].dropna()
-                
-                if len(series) < 3:  # Need at least 3 points for meaningful forecast
-                    continue
-                    
-                # Prepare data for linear regression
-                X = np.array(series.index).reshape(-1, 1)
-                y = series.values
-                
-                # Fit linear regression model
-                model = LinearRegression()
-                model.fit(X, y)
+            if not df.empty:
+                # Fit every column's trend over the years in one batched solve
+                years = df.index.to_numpy()
+                fit = fit_linear_trends(years, df.to_numpy(dtype=float).T)
                 
-                # Generate forecasts
-                last_year = series.index.max()
-                future_years = np.array(range(last_year + 1, last_year + forecast_years + 1)).reshape(-1, 1)
-                predictions = model.predict(future_years)
+                # Forecast from each column's last observed year
+                observed = df.notna().to_numpy().T
+                last_years = np.array([years[mask].max() if mask.any() else 0 for mask in observed])
+                future_years = last_years[:, None] + np.arange(1, forecast_years + 1)[None, :]
+                predictions = fit.predict(future_years)
+                lower, upper = fit.prediction_interval(future_years)
                 
-                # Calculate model metrics
-                y_pred = model.predict(X)
-                mae = mean_absolute_error(y, y_pred)
-                mse = mean_squared_error(y, y_pred)
-                rmse = np.sqrt(mse)
-                
-                # Calculate R-squared
-                r2 = model.score(X, y)
-                
-                category_forecasts[column] = {
-                    'historical_data': series.to_dict(),
-                    'forecast_years': future_years.flatten().tolist(),
-                    'forecast_values': predictions.tolist(),
-                    'trend_slope': model.coef_[0],
-                    'model_metrics': {
-                        'mae': mae,
-                        'rmse': rmse,
-                        'r2': r2
+                for i, column in enumerate(df.columns):
+                    if fit.n_obs[i] < 3:  # Need at least 3 points for meaningful forecast
+                        continue
+                    
+                    category_forecasts[column] = {
+                        'historical_data': df[column].dropna().to_dict(),
+                        'forecast_years': future_years[i].tolist(),
+                        'forecast_values': predictions[i].tolist(),
+                        'prediction_interval': {
+                            'level': 0.95,
+                            'lower': lower[i].tolist(),
+                            'upper': upper[i].tolist()
+                        },
+                        'trend_slope': float(fit.slopes[i]),
+                        'model_metrics': {
+                            'mae': float(fit.mae[i]),
+                            'rmse': float(fit.rmse[i]),
+                            'r2': float(fit.r_squared[i])
+                        }
                     }
-                }
             
             forecasts[category] = category_forecasts
             
@@ -327,20 +667,30 @@ def forecast_cargo_throughput(time_series_data: Dict[str, pd.DataFrame], forecas
 def get_enhanced_cargo_analysis() -> Dict[str, any]:
     """Enhanced cargo analysis focusing on Tables 1 & 2 with time series insights.
     
+    The analysis is memoized in the analysis graph and recomputed only when
+    the cargo statistics change.
+    
     Returns:
         Dict: Comprehensive analysis including trends, forecasts, and insights
     """
+    return _share_parsed(analysis_graph.get('enhanced_cargo_analysis'))
+
+def get_cargo_time_series() -> Dict[str, pd.DataFrame]:
+    """Get the memoized time series of the focused cargo statistics (Tables 1 & 2).
+    
+    Returns:
+        Dict[str, pd.DataFrame]: Same as get_time_series_data(load_focused_cargo_statistics())
+    """
+    return _share_parsed(analysis_graph.get('cargo_time_series'))
+
+def _analyze_enhanced_cargo(cargo_stats: Dict[str, pd.DataFrame],
+                            time_series: Dict[str, pd.DataFrame]) -> Dict[str, any]:
+    """Compute the enhanced cargo analysis from the focused tables and their time series."""
     try:
-        # Load focused data
-        cargo_stats = load_focused_cargo_statistics()
-        
         if not cargo_stats:
             logger.warning("No focused cargo statistics data available")
             return {}
         
-        # Generate time series data
-        time_series = get_time_series_data(cargo_stats)
-        
         # Generate forecasts
         forecasts = forecast_cargo_throughput(time_series, forecast_years=3)
         
@@ -537,6 +887,96 @@ def _clean_cargo_statistics_data(df: pd.DataFrame, table_name: str) -> pd.DataFr
         logger.error(f"Error cleaning {table_name} data: {e}")
         return df
 
+# Vessel XML feed layout: one record element per vessel under the document root
+VESSEL_XML_RECORD_TAG = 'G_SQL1'
+VESSEL_XML_FIELDS = [
+    'CALL_SIGN', 'VESSEL_NAME', 'SHIP_TYPE', 'AGENT_NAME', 'CURRENT_LOCATION',
+    'ARRIVAL_TIME', 'DEPARTURE_TIME', 'EXPECTED_TIME', 'REMARK'
+]
+
+# Lines added by browsers when an XML feed is saved from the rendered page
+_XML_NOTICE_PREFIXES = (b'This XML file', b'associated with it')
+
+
+class _SanitizedXMLStream:
+    """Read-only byte stream over a vessel XML file with the feed quirks fixed.
+    
+    Works on raw byte blocks so the whole file is never held in memory: lines
+    are stripped, blank and browser notice lines are dropped, and unescaped
+    ' & ' separators are escaped.
+    """
+    
+    BLOCK_SIZE = 1 << 16
+    
+    def __init__(self, file):
+        self._file = file
+        self._partial_line = b''
+        self._buffer = b''
+        self._exhausted = False
+    
+    def _sanitize(self, block: bytes) -> bytes:
+        lines = [line.strip() for line in block.split(b'\n')]
+        kept = [line for line in lines if line and not line.startswith(_XML_NOTICE_PREFIXES)]
+        return b''.join(line.replace(b' & ', b' &amp; ') + b'\n' for line in kept)
+    
+    def read(self, size: int = -1) -> bytes:
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            block = self._file.read(self.BLOCK_SIZE)
+            if block:
+                # Hold back the trailing partial line until the next block
+                block, _, self._partial_line = (self._partial_line + block).rpartition(b'\n')
+            else:
+                block, self._partial_line = self._partial_line, b''
+                self._exhausted = True
+            self._buffer += self._sanitize(block)
+        
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _parse_vessel_xml_columns(xml_file_path: Path, fields: List[str] = VESSEL_XML_FIELDS) -> Dict[str, List[Optional[str]]]:
+    """Stream-parse a vessel XML feed into column lists.
+    
+    Uses iterparse and clears each vessel element once read, so memory stays
+    flat as the feeds grow. For each vessel the text of the first matching
+    child element is recorded: None when the element is absent and '' when
+    it is present but empty.
+    
+    Args:
+        xml_file_path (Path): Path to the XML file
+        fields (List[str]): Child element tags to extract
+        
+    Returns:
+        Dict[str, List[Optional[str]]]: One list per field, one entry per vessel
+        
+    Raises:
+        ET.ParseError: If the sanitized content is not well-formed XML
+    """
+    columns = {field: [] for field in fields}
+    
+    with open(xml_file_path, 'rb') as file:
+        for _, element in ET.iterparse(_SanitizedXMLStream(file), events=('end',)):
+            if element.tag != VESSEL_XML_RECORD_TAG:
+                continue
+            
+            values = dict.fromkeys(fields)
+            for child in element:
+                if child.tag in values and values[child.tag] is None:
+                    values[child.tag] = child.text or ''
+            for field, column in columns.items():
+                column.append(values[field])
+            element.clear()
+    
+    return columns
+
+
+def _text_or_none(values: List[Optional[str]]) -> List[Optional[str]]:
+    """Map empty element text to None, as ElementTree reports it"""
+    return [value or None for value in values]
+
+
 def load_arriving_ships() -> pd.DataFrame:
     """Load and process arriving ships data from XML file.
     
@@ -556,70 +996,31 @@ def load_arriving_ships() -> pd.DataFrame:
             logger.warning(f"Arriving ships data file is empty: {arriving_ships_xml}")
             return pd.DataFrame()
         
-        # Read and clean XML content (skip comment lines)
-        with open(arriving_ships_xml, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        # Filter out comment lines and keep only XML content
-        xml_lines = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('This XML file') and not line.startswith('associated with it'):
-                # Escape unescaped ampersands for proper XML parsing
-                line = line.replace(' & ', ' &amp; ')
-                xml_lines.append(line)
-        
-        # Join the cleaned lines
-        content = '\n'.join(xml_lines)
-        
         logger.info("Parsing arriving ships XML file...")
-        # Parse cleaned XML content
-        root = ET.fromstring(content)
+        columns = _parse_vessel_xml_columns(arriving_ships_xml)
         logger.info("Successfully parsed arriving ships XML file.")
         
-        # Extract vessel data
-        vessels = []
-        for vessel_element in root.findall('G_SQL1'):
-            vessel_data = {}
-            
-            # Extract all vessel information
-            call_sign = vessel_element.find('CALL_SIGN')
-            vessel_name = vessel_element.find('VESSEL_NAME')
-            ship_type = vessel_element.find('SHIP_TYPE')
-            agent_name = vessel_element.find('AGENT_NAME')
-            current_location = vessel_element.find('CURRENT_LOCATION')
-            arrival_time = vessel_element.find('ARRIVAL_TIME')
-            remark = vessel_element.find('REMARK')
-            
-            # Safely extract text content
-            vessel_data['call_sign'] = call_sign.text if call_sign is not None else None
-            vessel_data['vessel_name'] = vessel_name.text if vessel_name is not None else None
-            vessel_data['ship_type'] = ship_type.text if ship_type is not None else None
-            vessel_data['agent_name'] = agent_name.text if agent_name is not None else None
-            vessel_data['current_location'] = current_location.text if current_location is not None else None
-            vessel_data['arrival_time_str'] = arrival_time.text if arrival_time is not None else None
-            vessel_data['remark'] = remark.text if remark is not None else None
-            
-            # Parse arrival time using robust parsing function
-            vessel_data['arrival_time'] = _parse_vessel_timestamp(vessel_data['arrival_time_str'])
-            
-            # Determine vessel status - vessels in Expected_arrivals.xml are expected to arrive
-            # They should have 'arriving' status since they haven't arrived yet
-            vessel_data['status'] = 'arriving'
-            
-            # Categorize ship type
-            vessel_data['ship_category'] = _categorize_ship_type(vessel_data['ship_type'])
-            
-            # Determine if at berth or anchorage
-            vessel_data['location_type'] = _categorize_location(vessel_data['current_location'])
-            
-            # Add data source identifier
-            vessel_data['data_source'] = 'arriving_ships'
-            
-            vessels.append(vessel_data)
-        
-        # Create DataFrame
-        df = pd.DataFrame(vessels)
+        ship_types = _text_or_none(columns['SHIP_TYPE'])
+        locations = _text_or_none(columns['CURRENT_LOCATION'])
+        arrival_times = _text_or_none(columns['ARRIVAL_TIME'])
+        vessel_count = len(arrival_times)
+        
+        # Build the frame column by column. Vessels in Expected_arrivals.xml
+        # have not arrived yet, so they all get 'arriving' status
+        df = pd.DataFrame({
+            'call_sign': _text_or_none(columns['CALL_SIGN']),
+            'vessel_name': _text_or_none(columns['VESSEL_NAME']),
+            'ship_type': ship_types,
+            'agent_name': _text_or_none(columns['AGENT_NAME']),
+            'current_location': locations,
+            'arrival_time_str': arrival_times,
+            'remark': _text_or_none(columns['REMARK']),
+            'arrival_time': _parse_vessel_timestamps(arrival_times),
+            'status': ['arriving'] * vessel_count,
+            'ship_category': _categorize_column(ship_types, _categorize_ship_type),
+            'location_type': _categorize_column(locations, _categorize_location),
+            'data_source': ['arriving_ships'] * vessel_count
+        }) if vessel_count else pd.DataFrame()
         
         # Sort by arrival time
         if not df.empty and 'arrival_time' in df.columns:
@@ -633,6 +1034,7 @@ def load_arriving_ships() -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@cached_file_parse(lambda: [VESSEL_ARRIVALS_XML])
 def load_vessel_arrivals() -> pd.DataFrame:
     logger.info(f"Attempting to load vessel arrivals from: {VESSEL_ARRIVALS_XML}")
     """Load and process real-time vessel arrival data from XML.
@@ -650,69 +1052,30 @@ def load_vessel_arrivals() -> pd.DataFrame:
             logger.warning(f"Vessel arrivals data file is empty: {VESSEL_ARRIVALS_XML}")
             return pd.DataFrame()
         
-        # Read and clean XML content (skip comment lines)
-        with open(VESSEL_ARRIVALS_XML, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        # Filter out comment lines and keep only XML content
-        xml_lines = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('This XML file') and not line.startswith('associated with it'):
-                # Escape unescaped ampersands for proper XML parsing
-                line = line.replace(' & ', ' &amp; ')
-                xml_lines.append(line)
-        
-        # Join the cleaned lines
-        content = '\n'.join(xml_lines)
-        
         logger.info("Parsing vessel arrivals XML file...")
-        # Parse cleaned XML content
-        root = ET.fromstring(content)
+        columns = _parse_vessel_xml_columns(VESSEL_ARRIVALS_XML)
         logger.info("Successfully parsed vessel arrivals XML file.")
         
-        # Extract vessel data
-        vessels = []
-        for vessel_element in root.findall('G_SQL1'):
-            vessel_data = {}
-            
-            # Extract all vessel information
-            call_sign = vessel_element.find('CALL_SIGN')
-            vessel_name = vessel_element.find('VESSEL_NAME')
-            ship_type = vessel_element.find('SHIP_TYPE')
-            agent_name = vessel_element.find('AGENT_NAME')
-            current_location = vessel_element.find('CURRENT_LOCATION')
-            arrival_time = vessel_element.find('ARRIVAL_TIME')
-            remark = vessel_element.find('REMARK')
-            
-            # Safely extract text content
-            vessel_data['call_sign'] = call_sign.text if call_sign is not None else None
-            vessel_data['vessel_name'] = vessel_name.text if vessel_name is not None else None
-            vessel_data['ship_type'] = ship_type.text if ship_type is not None else None
-            vessel_data['agent_name'] = agent_name.text if agent_name is not None else None
-            vessel_data['current_location'] = current_location.text if current_location is not None else None
-            vessel_data['arrival_time_str'] = arrival_time.text if arrival_time is not None else None
-            vessel_data['remark'] = remark.text if remark is not None else None
-            
-            # Parse arrival time using robust parsing function
-            vessel_data['arrival_time'] = _parse_vessel_timestamp(vessel_data['arrival_time_str'])
-            
-            # Determine vessel status
-            vessel_data['status'] = 'departed' if vessel_data.get('remark') == 'Departed' else 'in_port'
-            
-            # Categorize ship type
-            vessel_data['ship_category'] = _categorize_ship_type(vessel_data['ship_type'])
-            
-            # Determine if at berth or anchorage
-            vessel_data['location_type'] = _categorize_location(vessel_data['current_location'])
-            
-            # Add data source identifier
-            vessel_data['data_source'] = 'current_arrivals'
-            
-            vessels.append(vessel_data)
-        
-        # Create DataFrame
-        df = pd.DataFrame(vessels)
+        ship_types = _text_or_none(columns['SHIP_TYPE'])
+        locations = _text_or_none(columns['CURRENT_LOCATION'])
+        arrival_times = _text_or_none(columns['ARRIVAL_TIME'])
+        remarks = _text_or_none(columns['REMARK'])
+        vessel_count = len(arrival_times)
+        
+        df = pd.DataFrame({
+            'call_sign': _text_or_none(columns['CALL_SIGN']),
+            'vessel_name': _text_or_none(columns['VESSEL_NAME']),
+            'ship_type': ship_types,
+            'agent_name': _text_or_none(columns['AGENT_NAME']),
+            'current_location': locations,
+            'arrival_time_str': arrival_times,
+            'remark': remarks,
+            'arrival_time': _parse_vessel_timestamps(arrival_times),
+            'status': ['departed' if remark == 'Departed' else 'in_port' for remark in remarks],
+            'ship_category': _categorize_column(ship_types, _categorize_ship_type),
+            'location_type': _categorize_column(locations, _categorize_location),
+            'data_source': ['current_arrivals'] * vessel_count
+        }) if vessel_count else pd.DataFrame()
         
         # Sort by arrival time
         if not df.empty and 'arrival_time' in df.columns:
@@ -788,6 +1151,20 @@ def load_combined_vessel_data() -> pd.DataFrame:
         logger.error(f"Error loading combined vessel data: {e}")
         return pd.DataFrame()
 
+# Date formats found in the vessel XML data, in order of preference
+VESSEL_TIMESTAMP_FORMATS = [
+    '%d-%b-%Y %H:%M',  # Original expected format: 17-Aug-2025 12:30
+    '%Y/%m/%d %H:%M',  # Actual format in data: 2025/08/17 12:30
+    '%Y-%m-%d %H:%M',  # Alternative format: 2025-08-17 12:30
+    '%d/%m/%Y %H:%M',  # Alternative format: 17/08/2025 12:30
+]
+
+# Number of distinct values used to detect the formats of a timestamp column
+TIMESTAMP_FORMAT_SAMPLE_SIZE = 50
+
+# Earliest plausible vessel timestamp year; future dates are kept for expected arrivals
+MIN_VESSEL_TIMESTAMP_YEAR = 2020
+
 def _parse_vessel_timestamp(time_str: str) -> Optional[pd.Timestamp]:
     """Parse vessel timestamp from various date formats.
     
@@ -800,17 +1177,9 @@ def _parse_vessel_timestamp(time_str: str) -> Optional[pd.Timestamp]:
     if not time_str:
         return None
     
-    # List of possible date formats found in the XML data
-    date_formats = [
-        '%d-%b-%Y %H:%M',  # Original expected format: 17-Aug-2025 12:30
-        '%Y/%m/%d %H:%M',  # Actual format in data: 2025/08/17 12:30
-        '%Y-%m-%d %H:%M',  # Alternative format: 2025-08-17 12:30
-        '%d/%m/%Y %H:%M',  # Alternative format: 17/08/2025 12:30
-    ]
-    
     parsed_timestamp = None
     
-    for date_format in date_formats:
+    for date_format in VESSEL_TIMESTAMP_FORMATS:
         try:
             parsed_timestamp = pd.to_datetime(time_str, format=date_format)
             break
@@ -827,13 +1196,72 @@ def _parse_vessel_timestamp(time_str: str) -> Optional[pd.Timestamp]:
     
     # Data validation: Filter out obviously invalid dates
     # Accept dates from 2020 onwards, including future dates for expected arrivals
-    if parsed_timestamp.year < 2020:
+    if parsed_timestamp.year < MIN_VESSEL_TIMESTAMP_YEAR:
         logger.warning(f"Rejecting invalid timestamp (year {parsed_timestamp.year}): {time_str}")
         return None
     
     return parsed_timestamp
 
 
+def _parse_vessel_timestamps(time_strs) -> pd.Series:
+    """Parse a column of vessel timestamps with vectorized operations.
+    
+    Column-level equivalent of _parse_vessel_timestamp. The formats that match
+    a sample of distinct values are tried first; each format is one
+    vectorized to_datetime call over the values still unparsed, and whatever
+    no known format matches goes through one flexible parse at the end.
+    
+    Args:
+        time_strs: Sequence of time strings (None or '' for missing)
+        
+    Returns:
+        pd.Series: Parsed timestamps with NaT where parsing failed
+    """
+    values = pd.Series(time_strs, dtype=object)
+    remaining = values[values.notna() & (values != '')]
+    
+    # Detect which formats the column uses from a sample of distinct values;
+    # formats are tried in order of sample matches, stopping at a full match
+    sample = remaining.drop_duplicates().head(TIMESTAMP_FORMAT_SAMPLE_SIZE)
+    sample_hits = {}
+    for date_format in VESSEL_TIMESTAMP_FORMATS:
+        sample_hits[date_format] = pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum()
+        if sample_hits[date_format] == len(sample):
+            break
+    formats = sorted(VESSEL_TIMESTAMP_FORMATS, key=lambda date_format: -sample_hits.get(date_format, 0))
+    
+    parsed_parts = []
+    for date_format in formats:
+        if remaining.empty:
+            break
+        parsed = pd.to_datetime(remaining, format=date_format, errors='coerce')
+        matched = parsed.notna()
+        parsed_parts.append(parsed[matched])
+        remaining = remaining[~matched]
+    
+    # If all specific formats fail, try pandas' flexible parsing as last resort
+    if not remaining.empty:
+        parsed = pd.to_datetime(remaining, format='mixed', errors='coerce')
+        unparsed = parsed.isna()
+        if unparsed.any():
+            logger.warning(f"Could not parse {unparsed.sum()} time values, e.g. {remaining[unparsed].iloc[0]}")
+        parsed_parts.append(parsed[~unparsed])
+    
+    parsed_parts = [part for part in parsed_parts if not part.empty]
+    if not parsed_parts:
+        return pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    timestamps = pd.concat(parsed_parts).reindex(values.index)
+    
+    # Data validation: Filter out obviously invalid dates
+    too_old = timestamps.dt.year < MIN_VESSEL_TIMESTAMP_YEAR
+    if too_old.any():
+        logger.warning(f"Rejecting {too_old.sum()} timestamps before {MIN_VESSEL_TIMESTAMP_YEAR}")
+        timestamps = timestamps.mask(too_old)
+    
+    return timestamps
+
+
+@lru_cache(maxsize=4096)
 def _categorize_ship_type(ship_type: str) -> str:
     """Categorize ship type into standard categories.
     
@@ -861,6 +1289,7 @@ def _categorize_ship_type(ship_type: str) -> str:
     else:
         return 'other'
 
+@lru_cache(maxsize=4096)
 def _categorize_location(location: str) -> str:
     """Categorize vessel location type.
     
@@ -884,6 +1313,27 @@ def _categorize_location(location: str) -> str:
     else:
         return 'other'
 
+def _categorize_column(values, categorize: Callable[[Optional[str]], str]) -> pd.Categorical:
+    """Categorize a column by mapping each distinct value once.
+    
+    Args:
+        values: Sequence of raw strings (None for missing)
+        categorize: Memoized scalar categorizer, e.g. _categorize_ship_type
+        
+    Returns:
+        pd.Categorical: Category per value, with the observed categories only
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    # Missing values have code -1, which picks the trailing 'missing' label
+    labels = np.array([categorize(value) for value in uniques] + [categorize(None)], dtype=object)
+    return pd.Categorical(labels[codes])
+
+
+def _observed_value_counts(values: pd.Series) -> Dict[str, int]:
+    """Value counts as a dict, without the zero counts a filtered Categorical reports"""
+    counts = values.value_counts()
+    return counts[counts > 0].to_dict()
+
 def get_vessel_queue_analysis() -> Dict[str, any]:
     """Analyze current vessel queue and berth occupancy.
     
@@ -901,10 +1351,10 @@ def get_vessel_queue_analysis() -> Dict[str, any]:
         active_vessels = vessels_df[vessels_df['status'] != 'departed'].copy()
         
         # Analyze by location type
-        location_analysis = active_vessels.groupby('location_type').size().to_dict()
+        location_analysis = active_vessels.groupby('location_type', observed=True).size().to_dict()
         
         # Analyze by ship category
-        ship_category_analysis = active_vessels.groupby('ship_category').size().to_dict()
+        ship_category_analysis = active_vessels.groupby('ship_category', observed=True).size().to_dict()
         
         # Count vessels at berths vs anchorage (queue)
         berth_count = location_analysis.get('berth', 0)
@@ -945,7 +1395,8 @@ def get_vessel_queue_analysis() -> Dict[str, any]:
         logger.error(f"Error in vessel queue analysis: {e}")
         return {}
 
-def load_all_vessel_data() -> Dict[str, pd.DataFrame]:
+@single_flight(share=_share_parsed)
+def load_all_vessel_data(max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
     """Load vessel data from all available XML files.
     
     This function loads data from multiple vessel XML files including:
@@ -954,20 +1405,24 @@ def load_all_vessel_data() -> Dict[str, pd.DataFrame]:
     - Expected arrivals
     - Expected departures
     
+    The files are parsed in parallel; per-file load times are available from
+    get_load_timings(). Concurrent calls share a single load.
+    
+    Args:
+        max_workers: Maximum number of loader threads (defaults to LOADER_MAX_WORKERS)
+    
     Returns:
         Dict[str, pd.DataFrame]: Dictionary mapping file names to vessel DataFrames
     """
-    vessel_data = {}
-    
-    for xml_file in VESSEL_XML_FILES:
+    def load_file(xml_file: str) -> Optional[pd.DataFrame]:
         file_path = VESSEL_DATA_DIR / xml_file
         
         try:
             if file_path.exists():
                 df = load_vessel_data_from_xml(file_path)
                 if not df.empty:
-                    vessel_data[xml_file] = df
                     logger.info(f"Loaded {len(df)} vessels from {xml_file}")
+                    return df
                 else:
                     logger.warning(f"No vessel data found in {xml_file}")
             else:
@@ -975,9 +1430,46 @@ def load_all_vessel_data() -> Dict[str, pd.DataFrame]:
                 
         except Exception as e:
             logger.error(f"Error loading vessel data from {xml_file}: {e}")
+        return None
     
-    return vessel_data
+    tasks = {xml_file: lambda xml_file=xml_file: load_file(xml_file) for xml_file in VESSEL_XML_FILES}
+    loaded = _load_in_parallel('load_all_vessel_data', tasks, max_workers)
+    return {xml_file: df for xml_file, df in loaded.items() if df is not None}
 
+def get_vessel_file_signatures() -> Dict[str, Optional[Tuple[int, int]]]:
+    """Get the (mtime, size) signature of every vessel XML file.
+    
+    Comparing signatures between refreshes tells whether any file needs to
+    be parsed again.
+    
+    Returns:
+        Dict[str, Optional[Tuple[int, int]]]: Modification time in nanoseconds
+            and size in bytes per file name, or None for a missing file
+    """
+    signatures = {}
+    for xml_file in VESSEL_XML_FILES:
+        try:
+            stat = (VESSEL_DATA_DIR / xml_file).stat()
+            signatures[xml_file] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signatures[xml_file] = None
+    return signatures
+
+def combine_vessel_data(all_vessel_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Combine the per-file vessel frames into one frame.
+    
+    Args:
+        all_vessel_data: Vessel DataFrames keyed by XML file name, as returned
+            by load_all_vessel_data()
+        
+    Returns:
+        pd.DataFrame: All vessel records, or an empty DataFrame if there are none
+    """
+    if not all_vessel_data:
+        return pd.DataFrame()
+    return pd.concat(all_vessel_data.values(), ignore_index=True)
+
+@cached_file_parse(lambda xml_file_path: [xml_file_path])
 def load_vessel_data_from_xml(xml_file_path: Path) -> pd.DataFrame:
     """Load vessel data from a specific XML file.
     
@@ -996,88 +1488,62 @@ def load_vessel_data_from_xml(xml_file_path: Path) -> pd.DataFrame:
             logger.warning(f"XML file is empty: {xml_file_path}")
             return pd.DataFrame()
         
-        # Read and clean XML content (skip comment lines)
-        with open(xml_file_path, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        # Filter out comment lines and keep only XML content
-        xml_lines = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('This XML file') and not line.startswith('associated with it'):
-                # Escape unescaped ampersands for proper XML parsing
-                line = line.replace(' & ', ' &amp; ')
-                xml_lines.append(line)
-        
-        # Join the cleaned lines
-        content = '\n'.join(xml_lines)
-        
-        # Parse cleaned XML content
-        root = ET.fromstring(content)
-        
-        # Extract vessel data
-        vessels = []
-        for vessel_element in root.findall('G_SQL1'):
-            vessel_data = {}
-            
-            # Extract all vessel information
-            call_sign = vessel_element.find('CALL_SIGN')
-            vessel_name = vessel_element.find('VESSEL_NAME')
-            ship_type = vessel_element.find('SHIP_TYPE')
-            agent_name = vessel_element.find('AGENT_NAME')
-            current_location = vessel_element.find('CURRENT_LOCATION')
-            arrival_time = vessel_element.find('ARRIVAL_TIME')
-            departure_time = vessel_element.find('DEPARTURE_TIME')  # For departed vessels
-            expected_time = vessel_element.find('EXPECTED_TIME')    # For expected vessels
-            remark = vessel_element.find('REMARK')
-            
-            # Safely extract text content
-            vessel_data['call_sign'] = call_sign.text if call_sign is not None else None
-            vessel_data['vessel_name'] = vessel_name.text if vessel_name is not None else None
-            vessel_data['ship_type'] = ship_type.text if ship_type is not None else None
-            vessel_data['agent_name'] = agent_name.text if agent_name is not None else None
-            vessel_data['current_location'] = current_location.text if current_location is not None else None
-            vessel_data['remark'] = remark.text if remark is not None else None
-            
-            # Handle different time fields based on file type
-            time_str = None
-            if arrival_time is not None:
-                time_str = arrival_time.text
-                vessel_data['time_type'] = 'arrival'
-            elif departure_time is not None:
-                time_str = departure_time.text
-                vessel_data['time_type'] = 'departure'
-            elif expected_time is not None:
-                time_str = expected_time.text
-                vessel_data['time_type'] = 'expected'
-            
-            vessel_data['time_str'] = time_str
-            
-            # Parse time using robust parsing function
-            vessel_data['timestamp'] = _parse_vessel_timestamp(time_str)
-            
-            # Determine vessel status based on file and remark
-            file_name = xml_file_path.name.lower()
-            if 'departed' in file_name:
-                vessel_data['status'] = 'departed'
-            elif 'expected' in file_name:
-                vessel_data['status'] = 'expected'
-            elif vessel_data.get('remark') == 'Departed':
-                vessel_data['status'] = 'departed'
-            else:
-                vessel_data['status'] = 'in_port'
-            
-            # Categorize ship type and location
-            vessel_data['ship_category'] = _categorize_ship_type(vessel_data['ship_type'])
-            vessel_data['location_type'] = _categorize_location(vessel_data['current_location'])
-            
-            # Add source file information
-            vessel_data['source_file'] = xml_file_path.name
-            
-            vessels.append(vessel_data)
+        columns = _parse_vessel_xml_columns(xml_file_path)
+        vessel_count = len(columns['CALL_SIGN'])
+        if vessel_count == 0:
+            return pd.DataFrame()
         
-        # Create DataFrame
-        df = pd.DataFrame(vessels)
+        ship_types = _text_or_none(columns['SHIP_TYPE'])
+        locations = _text_or_none(columns['CURRENT_LOCATION'])
+        remarks = _text_or_none(columns['REMARK'])
+        
+        # Handle different time fields based on file type: the first time
+        # element present decides the time type, even if it is empty
+        time_types = []
+        time_strs = []
+        for arrival, departure, expected in zip(columns['ARRIVAL_TIME'], columns['DEPARTURE_TIME'],
+                                                columns['EXPECTED_TIME']):
+            if arrival is not None:
+                time_types.append('arrival')
+                time_strs.append(arrival or None)
+            elif departure is not None:
+                time_types.append('departure')
+                time_strs.append(departure or None)
+            elif expected is not None:
+                time_types.append('expected')
+                time_strs.append(expected or None)
+            else:
+                time_types.append(np.nan)
+                time_strs.append(None)
+        
+        # Determine vessel status based on file and remark
+        file_name = xml_file_path.name.lower()
+        if 'departed' in file_name:
+            statuses = ['departed'] * vessel_count
+        elif 'expected' in file_name:
+            statuses = ['expected'] * vessel_count
+        else:
+            statuses = ['departed' if remark == 'Departed' else 'in_port' for remark in remarks]
+        
+        data = {
+            'call_sign': _text_or_none(columns['CALL_SIGN']),
+            'vessel_name': _text_or_none(columns['VESSEL_NAME']),
+            'ship_type': ship_types,
+            'agent_name': _text_or_none(columns['AGENT_NAME']),
+            'current_location': locations,
+            'remark': remarks
+        }
+        if any(isinstance(time_type, str) for time_type in time_types):
+            data['time_type'] = time_types
+        data.update({
+            'time_str': time_strs,
+            'timestamp': _parse_vessel_timestamps(time_strs),
+            'status': statuses,
+            'ship_category': _categorize_column(ship_types, _categorize_ship_type),
+            'location_type': _categorize_column(locations, _categorize_location),
+            'source_file': [xml_file_path.name] * vessel_count
+        })
+        df = pd.DataFrame(data)
         
         # Sort by timestamp
         if not df.empty and 'timestamp' in df.columns:
@@ -1089,21 +1555,30 @@ def load_vessel_data_from_xml(xml_file_path: Path) -> pd.DataFrame:
         logger.error(f"Error loading vessel data from {xml_file_path}: {e}")
         return pd.DataFrame()
 
-def get_comprehensive_vessel_analysis() -> Dict[str, any]:
+def get_comprehensive_vessel_analysis(all_vessel_data: Optional[Dict[str, pd.DataFrame]] = None,
+                                      combined_df: Optional[pd.DataFrame] = None) -> Dict[str, any]:
     """Perform comprehensive analysis across all vessel data files.
     
+    Args:
+        all_vessel_data: Already loaded vessel frames keyed by file name. All
+            vessel XML files are loaded when omitted.
+        combined_df: The frames combined with combine_vessel_data(), if the
+            caller has already built it
+    
     Returns:
         Dict: Comprehensive vessel analytics including trends and patterns
     """
     try:
-        all_vessel_data = load_all_vessel_data()
+        if all_vessel_data is None:
+            all_vessel_data = load_all_vessel_data()
         
         if not all_vessel_data:
             logger.warning("No vessel data available for comprehensive analysis")
             return {}
         
         # Combine all vessel data
-        combined_df = pd.concat(all_vessel_data.values(), ignore_index=True)
+        if combined_df is None:
+            combined_df = combine_vessel_data(all_vessel_data)
         
         # Remove duplicates based on call_sign and timestamp
         combined_df = combined_df.drop_duplicates(subset=['call_sign', 'timestamp'], keep='first')
@@ -1115,8 +1590,8 @@ def get_comprehensive_vessel_analysis() -> Dict[str, any]:
                 'data_sources': list(all_vessel_data.keys())
             },
             'status_breakdown': combined_df['status'].value_counts().to_dict(),
-            'ship_category_breakdown': combined_df['ship_category'].value_counts().to_dict(),
-            'location_type_breakdown': combined_df['location_type'].value_counts().to_dict(),
+            'ship_category_breakdown': _observed_value_counts(combined_df['ship_category']),
+            'location_type_breakdown': _observed_value_counts(combined_df['location_type']),
             'file_breakdown': {}
         }
         
@@ -1215,6 +1690,9 @@ class RealTimeDataConfig:
     weather_update_interval: int = 1800  # seconds (30 minutes)
     auto_reload_on_file_change: bool = True
     cache_duration: int = 3600  # seconds (1 hour)
+    refresh_timeout: int = 120  # seconds allowed for one refresh job run
+    refresh_workers: int = 4  # executor threads running refresh jobs
+    enable_vessel_history: bool = True  # record changed vessel rows in the local history store
 
 class RealTimeDataManager:
     """Enhanced data manager with real-time capabilities.
@@ -1224,13 +1702,18 @@ class RealTimeDataManager:
     - Weather condition integration
     - File monitoring for automatic data reloading
     - Cached data management
+    
+    All periodic and file-triggered refreshes run as jobs of one
+    RefreshScheduler event loop while real-time updates are started.
     """
     
     def __init__(self, config: Optional[RealTimeDataConfig] = None):
         self.config = config or RealTimeDataConfig()
         self.weather_integration = None
         self.file_monitor = None
-        self.vessel_scheduler = None  # New: vessel data pipeline scheduler
+        self.vessel_fetcher = None  # Marine Department feed downloader
+        self.vessel_fetch_interval = None  # seconds between feed downloads
+        self.scheduler = None
         self.is_running = False
         self.data_cache = {}
         self.last_updates = {}
@@ -1242,6 +1725,18 @@ class RealTimeDataManager:
         self.circuit_breaker_reset_time = 300  # 5 minutes
         self.circuit_breaker_states = {}  # 'open', 'closed', 'half_open'
         
+        # Predictive models updated online from every vessel refresh
+        self.arrival_predictor = None
+        self.processing_estimator = None
+        
+        # Vessel frames from the last refresh, reused until a file changes
+        self.vessel_file_signatures = {}
+        self.vessel_frames = {}
+        
+        # Rows inserted, updated and removed by each vessel refresh
+        self.vessel_diff = VesselDiffEngine()
+        self.last_vessel_delta = None
+        
         # Initialize components
         self._initialize_weather_integration()
         self._initialize_file_monitoring()
@@ -1280,23 +1775,23 @@ class RealTimeDataManager:
             logger.info("File monitoring disabled or not available")
     
     def _initialize_vessel_pipeline(self):
-        """Initialize vessel data pipeline scheduler."""
+        """Initialize the vessel feed downloader; its fetch job starts with the real-time updates."""
         try:
             # Check if vessel data pipeline is enabled
             pipeline_enabled = os.getenv('VESSEL_DATA_PIPELINE_ENABLED', 'true').lower() == 'true'
             
-            if pipeline_enabled:
-                self.vessel_scheduler = initialize_vessel_data_pipeline()
-                if self.vessel_scheduler:
-                    logger.info("Vessel data pipeline initialized successfully")
-                else:
-                    logger.warning("Failed to initialize vessel data pipeline")
+            if pipeline_enabled and VesselDataFetcher is not None:
+                self.vessel_fetcher = VesselDataFetcher()
+                self.vessel_fetch_interval = int(os.getenv('VESSEL_DATA_FETCH_INTERVAL', '20')) * 60
+                logger.info("Vessel data pipeline initialized successfully")
+            elif pipeline_enabled:
+                logger.warning("Vessel data pipeline modules not available")
             else:
                 logger.info("Vessel data pipeline disabled via configuration")
                 
         except Exception as e:
             logger.error(f"Error initializing vessel data pipeline: {e}")
-            self.vessel_scheduler = None
+            self.vessel_fetcher = None
     
     def start_real_time_updates(self):
         """Start real-time data update processes."""
@@ -1310,12 +1805,23 @@ class RealTimeDataManager:
         if self.file_monitor:
             self.file_monitor.start_all_monitoring()
         
-        # Start background update threads
-        self.vessel_update_thread = threading.Thread(target=self._vessel_update_loop, daemon=True)
-        self.weather_update_thread = threading.Thread(target=self._weather_update_loop, daemon=True)
-        
-        self.vessel_update_thread.start()
-        self.weather_update_thread.start()
+        # Register the refresh jobs on one scheduler event loop
+        self.scheduler = RefreshScheduler(max_workers=self.config.refresh_workers)
+        self.scheduler.add_job('vessel_data', self._update_vessel_data,
+                               interval=self.config.vessel_update_interval,
+                               timeout=self.config.refresh_timeout, backoff_base=60)
+        if self.weather_integration:
+            self.scheduler.add_job('weather_data', self._update_weather_data,
+                                   interval=self.config.weather_update_interval,
+                                   timeout=self.config.refresh_timeout, backoff_base=300)
+        if self.vessel_fetcher:
+            self.scheduler.add_job('vessel_feed_fetch', self._fetch_vessel_feeds,
+                                   interval=self.vessel_fetch_interval,
+                                   timeout=self.config.refresh_timeout, backoff_base=60)
+        # Triggered by the file monitor only
+        self.scheduler.add_job('cargo_statistics', self._reload_cargo_statistics,
+                               timeout=self.config.refresh_timeout, backoff_base=60)
+        self.scheduler.start()
         
         logger.info("Real-time data updates started")
     
@@ -1327,73 +1833,87 @@ class RealTimeDataManager:
         if self.file_monitor:
             self.file_monitor.stop_all_monitoring()
         
-        # Stop vessel data scheduler
-        if self.vessel_scheduler:
+        # Stop the refresh jobs
+        if self.scheduler:
             try:
-                self.vessel_scheduler.stop()
-                logger.info("Vessel data scheduler stopped")
+                self.scheduler.stop()
             except Exception as e:
-                logger.error(f"Error stopping vessel data scheduler: {e}")
+                logger.error(f"Error stopping refresh scheduler: {e}")
         
         logger.info("Real-time data updates stopped")
     
-    def _vessel_update_loop(self):
-        """Background loop for vessel data updates."""
-        while self.is_running:
-            try:
-                self._update_vessel_data()
-                time.sleep(self.config.vessel_update_interval)
-            except Exception as e:
-                logger.error(f"Error in vessel update loop: {e}")
-                time.sleep(60)  # Wait before retrying
+    def _fetch_vessel_feeds(self):
+        """Download the Marine Department vessel feeds, then refresh the vessel data."""
+        result = self.vessel_fetcher.fetch_xml_files()
+        if result and not any(result.values()):
+            raise RuntimeError(f"No vessel feeds could be downloaded: {result}")
+        if self.scheduler:
+            self.scheduler.trigger('vessel_data')
+        return result
     
-    def _weather_update_loop(self):
-        """Background loop for weather data updates."""
-        while self.is_running:
-            try:
-                self._update_weather_data()
-                time.sleep(self.config.weather_update_interval)
-            except Exception as e:
-                logger.error(f"Error in weather update loop: {e}")
-                time.sleep(300)  # Wait before retrying
+    def _trigger_refresh(self, job_name: str) -> bool:
+        """Hand a refresh to the scheduler; False if it is not running."""
+        return self.scheduler is not None and self.scheduler.trigger(job_name)
     
     def _update_vessel_data(self):
-        """Update comprehensive vessel data with validation and enhanced caching."""
+        """Update comprehensive vessel data with validation and enhanced caching.
+        
+        Errors are recorded for the circuit breaker and re-raised, so the
+        refresh scheduler backs off before retrying.
+        """
         try:
             # Check circuit breaker
             if self._is_circuit_breaker_open('vessel_update'):
                 logger.warning("Skipping vessel data update - circuit breaker open")
                 return
             
-            # Load comprehensive vessel data from all XML files
-            all_vessel_data = load_all_vessel_data()
+            # Parse the XML files only when one of them changed since the last refresh
+            signatures = get_vessel_file_signatures()
+            files_changed = signatures != self.vessel_file_signatures or not self.vessel_frames
+            if files_changed:
+                all_vessel_data = load_all_vessel_data()
+            else:
+                all_vessel_data = self.vessel_frames
+                logger.debug("Vessel files unchanged - reusing loaded vessel data")
             
             if all_vessel_data:
-                # Store individual file data
-                for file_name, vessel_df in all_vessel_data.items():
-                    if not vessel_df.empty:
-                        cache_key = f'vessel_data_{file_name.replace(".xml", "").lower()}'
-                        
-                        # Validate and process data
-                        validation_result = self.validate_and_process_data(cache_key, vessel_df)
-                        
-                        if validation_result['status'] == 'success' and validation_result['validation_result'].get('valid', False):
-                            # Store in both local and global cache
-                            self.data_cache[cache_key] = vessel_df
-                            self.last_updates[cache_key] = datetime.now()
-                            data_cache.set(cache_key, vessel_df)
-                            
-                            # Trigger callbacks for specific vessel data types
-                            if cache_key in self.update_callbacks:
-                                for callback in self.update_callbacks[cache_key]:
-                                    try:
-                                        callback(vessel_df)
-                                    except Exception as e:
-                                        logger.error(f"Error in {cache_key} update callback: {e}")
+                if files_changed:
+                    # Build the combined frame once and share it with every analysis stage
+                    combined_df = combine_vessel_data(all_vessel_data)
+                else:
+                    combined_df = self.data_cache['vessel_combined']
+                
+                # Refresh the cache entries on every tick so they don't expire while the feeds are unchanged
+                self.data_cache['vessel_combined'] = combined_df
+                self.last_updates['vessel_combined'] = datetime.now()
+                data_cache.set('vessel_combined', combined_df)
+                
+                if files_changed:
+                    # Subscribers are only told about the rows that changed
+                    delta = self.vessel_diff.update(combined_df)
+                    self.last_vessel_delta = delta
+                    self._store_vessel_file_data(all_vessel_data, delta)
+                    self._publish_vessel_changes(delta)
+                    self._record_vessel_history(all_vessel_data)
+                    
+                    # Fold new arrivals and completed calls into the predictive models
+                    self._update_predictive_models(all_vessel_data)
+                    
+                    # Only a fully processed load counts; after a failure the next refresh reloads the files
+                    self.vessel_file_signatures = signatures
+                    self.vessel_frames = all_vessel_data
+                else:
+                    self._store_vessel_file_data(all_vessel_data, notify=False)
+                
+                # Maintain backward compatibility - store arrivals data separately
+                arrivals_data = all_vessel_data.get('Arrived_in_last_36_hours.xml')
+                if arrivals_data is not None and not arrivals_data.empty:
+                    self.data_cache['vessel_arrivals'] = arrivals_data
+                    data_cache.set('vessel_arrivals', arrivals_data)
                 
                 # Perform comprehensive analysis
                 try:
-                    comprehensive_analysis = get_comprehensive_vessel_analysis()
+                    comprehensive_analysis = get_comprehensive_vessel_analysis(all_vessel_data, combined_df)
                     if comprehensive_analysis:
                         self.data_cache['vessel_comprehensive_analysis'] = comprehensive_analysis
                         self.last_updates['vessel_comprehensive_analysis'] = datetime.now()
@@ -1402,7 +1922,6 @@ class RealTimeDataManager:
                         # Cross-reference with historical patterns
                         try:
                             # Use the combined data for historical analysis
-                            combined_df = pd.concat(all_vessel_data.values(), ignore_index=True)
                             historical_analysis = self._cross_reference_vessel_data(combined_df)
                             if historical_analysis:
                                 data_cache.set('vessel_historical_analysis', historical_analysis)
@@ -1424,13 +1943,7 @@ class RealTimeDataManager:
                         
                 except Exception as e:
                     logger.error(f"Error in comprehensive vessel analysis: {e}")
-                    self._record_operation_failure('vessel_update')
-                
-                # Maintain backward compatibility - store arrivals data separately
-                arrivals_data = all_vessel_data.get('Arrived_in_last_36_hours.xml')
-                if arrivals_data is not None and not arrivals_data.empty:
-                    self.data_cache['vessel_arrivals'] = arrivals_data
-                    data_cache.set('vessel_arrivals', arrivals_data)
+                    raise
                     
             else:
                 logger.warning("No vessel data available for update")
@@ -1438,6 +1951,141 @@ class RealTimeDataManager:
         except Exception as e:
             self._record_operation_failure('vessel_update')
             logger.error(f"Error updating vessel data: {e}")
+            raise
+    
+    def _store_vessel_file_data(self, all_vessel_data: Dict[str, pd.DataFrame], delta=None,
+                                notify: bool = True):
+        """Validate and cache each vessel file's frame and notify its subscribers.
+        
+        With a delta, a file's subscribers are only called when rows of that
+        file were inserted, updated or removed; with notify=False they are not
+        called at all.
+        """
+        for file_name, vessel_df in all_vessel_data.items():
+            if vessel_df.empty:
+                continue
+            cache_key = f'vessel_data_{file_name.replace(".xml", "").lower()}'
+            
+            # Validate and process data
+            validation_result = self.validate_and_process_data(cache_key, vessel_df)
+            
+            if validation_result['status'] == 'success' and validation_result['validation_result'].get('valid', False):
+                # Store in both local and global cache
+                self.data_cache[cache_key] = vessel_df
+                self.last_updates[cache_key] = datetime.now()
+                data_cache.set(cache_key, vessel_df)
+                
+                # Trigger callbacks for specific vessel data types
+                if not notify or (delta is not None and delta.for_source(file_name).is_empty):
+                    continue
+                if cache_key in self.update_callbacks:
+                    for callback in self.update_callbacks[cache_key]:
+                        try:
+                            callback(vessel_df)
+                        except Exception as e:
+                            logger.error(f"Error in {cache_key} update callback: {e}")
+    
+    def _publish_vessel_changes(self, delta):
+        """Hand a non-empty vessel delta to the 'vessel_changes' subscribers."""
+        if delta.is_empty:
+            logger.debug("Vessel files changed but no vessel rows did")
+            return
+        logger.info(f"Vessel changes: {delta.summary()}")
+        self.last_updates['vessel_changes'] = datetime.now()
+        for callback in self.update_callbacks.get('vessel_changes', []):
+            try:
+                callback(delta)
+            except Exception as e:
+                logger.error(f"Error in vessel_changes update callback: {e}")
+    
+    def _record_vessel_history(self, all_vessel_data: Dict[str, pd.DataFrame]):
+        """Add the loaded feed files to the vessel history store.
+        
+        Like the backfill, every feed file is ingested once, identified by its
+        hash, so unchanged files and restarts don't count as new sightings.
+        """
+        if not self.config.enable_vessel_history:
+            return
+        for file_name, vessel_df in all_vessel_data.items():
+            try:
+                feed_file = VESSEL_DATA_DIR / file_name
+                _ingest_vessel_feed_snapshot(feed_file, file_name,
+                                             datetime.fromtimestamp(feed_file.stat().st_mtime), vessel_df)
+            except Exception as e:
+                logger.error(f"Error recording {file_name} in the vessel history: {e}")
+    
+    def attach_predictive_models(self, arrival_predictor=None, processing_estimator=None):
+        """Keep predictive models up to date from the live vessel feed.
+        
+        Every vessel refresh folds new arrivals and completed port calls into
+        the attached models through their online update() methods.
+        
+        Args:
+            arrival_predictor: Model with update(rows, key_columns) for arrivals,
+                e.g. ShipArrivalPredictor
+            processing_estimator: Model with update(rows, key_columns) for
+                completed processing records, e.g. ProcessingTimeEstimator
+        """
+        self.arrival_predictor = arrival_predictor
+        self.processing_estimator = processing_estimator
+        logger.info("Predictive models attached to real-time vessel updates")
+    
+    def _update_predictive_models(self, all_vessel_data: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """Fold the latest vessel snapshot into the attached predictive models.
+        
+        Arrivals come from the arrivals file. A completed call pairs a departure
+        with the latest earlier arrival of the same call sign, and its
+        processing time is the time between them in hours.
+        
+        Args:
+            all_vessel_data: Vessel data frames keyed by XML file name
+            
+        Returns:
+            Dict[str, int]: Number of arrivals and processing records folded in
+        """
+        folded = {'arrivals': 0, 'processing_records': 0}
+        
+        try:
+            arrivals = all_vessel_data.get('Arrived_in_last_36_hours.xml')
+            departures = all_vessel_data.get('Departed_in_last_36_hours.xml')
+            if arrivals is None or arrivals.empty:
+                return folded
+            
+            arrival_rows = pd.DataFrame({
+                'call_sign': arrivals['call_sign'],
+                'arrival_time': arrivals['timestamp'],
+                'ship_type': arrivals['ship_category']
+            })
+            
+            if self.arrival_predictor is not None:
+                folded['arrivals'] = self.arrival_predictor.update(
+                    arrival_rows, key_columns=['call_sign', 'arrival_time']
+                )
+            
+            if self.processing_estimator is not None and departures is not None and not departures.empty:
+                completed = pd.DataFrame({
+                    'call_sign': departures['call_sign'],
+                    'departure_time': departures['timestamp']
+                }).merge(arrival_rows, on='call_sign')
+                completed['processing_time'] = (
+                    completed['departure_time'] - completed['arrival_time']
+                ).dt.total_seconds() / 3600
+                completed = (completed[completed['processing_time'] > 0]
+                             .sort_values('arrival_time')
+                             .drop_duplicates(['call_sign', 'departure_time'], keep='last'))
+                
+                folded['processing_records'] = self.processing_estimator.update(
+                    completed, key_columns=['call_sign', 'departure_time']
+                )
+            
+            if folded['arrivals'] or folded['processing_records']:
+                logger.info(f"Updated predictive models with {folded['arrivals']} arrivals "
+                            f"and {folded['processing_records']} completed calls")
+                
+        except Exception as e:
+            logger.error(f"Error updating predictive models from vessel data: {e}")
+        
+        return folded
     
     def _cross_reference_vessel_data(self, current_data: pd.DataFrame) -> Dict[str, any]:
         """Cross-reference current vessel data with historical patterns."""
@@ -1486,11 +2134,20 @@ class RealTimeDataManager:
             return None
     
     def _update_weather_data(self):
-        """Update weather condition data."""
+        """Update weather condition data.
+        
+        Errors are recorded for the circuit breaker and re-raised, so the
+        refresh scheduler backs off before retrying.
+        """
         if not self.weather_integration:
             return
         
         try:
+            # Check circuit breaker
+            if self._is_circuit_breaker_open('weather_update'):
+                logger.warning("Skipping weather data update - circuit breaker open")
+                return
+            
             weather_data = self.weather_integration.get_current_weather()
             if weather_data:
                 self.data_cache['weather_conditions'] = weather_data
@@ -1505,27 +2162,36 @@ class RealTimeDataManager:
                             logger.error(f"Error in weather update callback: {e}")
                 
                 logger.debug("Weather data updated")
+            self._record_operation_success('weather_update')
         except Exception as e:
+            self._record_operation_failure('weather_update')
             logger.error(f"Error updating weather data: {e}")
+            raise
     
     def _on_vessel_file_change(self, file_path: str):
         """Handle vessel file changes."""
         logger.info(f"Vessel file changed: {file_path}")
-        if self.config.auto_reload_on_file_change:
-            self._update_vessel_data()
+        if self.config.auto_reload_on_file_change and not self._trigger_refresh('vessel_data'):
+            try:
+                self._update_vessel_data()
+            except Exception as e:
+                logger.error(f"Error reloading vessel data: {e}")
     
     def _on_cargo_file_change(self, file_path: str):
         """Handle cargo file changes."""
         logger.info(f"Cargo file changed: {file_path}")
-        if self.config.auto_reload_on_file_change:
-            # Reload cargo statistics
+        if self.config.auto_reload_on_file_change and not self._trigger_refresh('cargo_statistics'):
             try:
-                cargo_data = load_port_cargo_statistics()
-                self.data_cache['cargo_statistics'] = cargo_data
-                self.last_updates['cargo_statistics'] = datetime.now()
+                self._reload_cargo_statistics()
             except Exception as e:
                 logger.error(f"Error reloading cargo data: {e}")
     
+    def _reload_cargo_statistics(self):
+        """Reload cargo statistics into the cache."""
+        cargo_data = load_port_cargo_statistics()
+        self.data_cache['cargo_statistics'] = cargo_data
+        self.last_updates['cargo_statistics'] = datetime.now()
+    
     def _on_berth_file_change(self, file_path: str):
         """Handle berth file changes."""
         logger.info(f"Berth file changed: {file_path}")
@@ -1537,7 +2203,9 @@ class RealTimeDataManager:
         """Register a callback for data updates.
         
         Args:
-            data_type: Type of data ('vessel_arrivals', 'weather_conditions', etc.)
+            data_type: Type of data ('vessel_arrivals', 'weather_conditions', etc.);
+                'vessel_changes' callbacks receive a VesselDelta with only the
+                vessel rows inserted, updated or removed by a refresh
             callback: Function to call when data is updated
         """
         if data_type not in self.update_callbacks:
@@ -1773,17 +2441,25 @@ class RealTimeDataManager:
             },
             'components': {
                 'weather_integration': self.weather_integration is not None,
-                'file_monitor': self.file_monitor is not None
+                'file_monitor': self.file_monitor is not None,
+                'vessel_fetcher': self.vessel_fetcher is not None
             },
             'cached_data': list(self.data_cache.keys()),
             'last_updates': {k: v.isoformat() for k, v in self.last_updates.items()},
-            'registered_callbacks': {k: len(v) for k, v in self.update_callbacks.items()}
+            'registered_callbacks': {k: len(v) for k, v in self.update_callbacks.items()},
+            'vessel_changes': self.vessel_diff.get_stats()
         }
+        if self.last_vessel_delta is not None:
+            status['vessel_changes']['last_delta'] = self.last_vessel_delta.summary()
         
         # Add file monitor status if available
         if self.file_monitor:
             status['file_monitor_status'] = self.file_monitor.get_status()
         
+        # Add refresh job status if available
+        if self.scheduler:
+            status['scheduler_status'] = self.scheduler.get_status()
+        
         return status
 
 # Global instance for easy access
@@ -2046,11 +2722,16 @@ def get_throughput_trends() -> Dict[str, any]:
     - Seasonal pattern recognition for peak/off-peak periods
     - Basic forecasting models using historical trends
     
+    The analysis is memoized in the analysis graph and recomputed only when
+    the container throughput data changes.
+    
     Returns:
         Dict: Comprehensive analysis including trends, seasonality, and forecasts
     """
-    monthly_data = load_container_throughput()
-    
+    return _share_parsed(analysis_graph.get('throughput_trends'))
+
+def _analyze_throughput_trends(monthly_data: pd.DataFrame) -> Dict[str, any]:
+    """Compute the throughput trend analysis of the monthly container throughput."""
     if monthly_data.empty:
         return {}
     
@@ -2254,44 +2935,45 @@ def _generate_forecasts(total_teus: pd.Series, seaborne_teus: pd.Series, river_t
     try:
         forecasts = {}
         
-        for name, series in [('total', total_teus), ('seaborne', seaborne_teus), ('river', river_teus)]:
-            if len(series) < 12:  # Need at least 12 months for meaningful forecast
-                continue
-                
-            # Prepare data for forecasting
-            X = np.arange(len(series)).reshape(-1, 1)
-            y = series.values
-            
-            # Linear regression forecast
-            model = LinearRegression()
-            model.fit(X, y)
-            
-            # Generate 6-month forecast
-            future_X = np.arange(len(series), len(series) + 6).reshape(-1, 1)
-            forecast_values = model.predict(future_X)
-            
-            # Calculate model performance on historical data
-            historical_pred = model.predict(X)
-            mae = mean_absolute_error(y, historical_pred)
-            rmse = np.sqrt(mean_squared_error(y, historical_pred))
-            
+        # Need at least 12 months for meaningful forecast
+        named_series = [(name, series) for name, series in
+                        [('total', total_teus), ('seaborne', seaborne_teus), ('river', river_teus)]
+                        if len(series) >= 12]
+        if not named_series:
+            return forecasts
+        
+        # Fit all linear trends over the month number in one batched solve
+        max_length = max(len(series) for _, series in named_series)
+        values = np.full((len(named_series), max_length), np.nan)
+        for i, (_, series) in enumerate(named_series):
+            values[i, :len(series)] = series.to_numpy(dtype=float)
+        fit = fit_linear_trends(np.arange(max_length), values)
+        
+        # Generate 6-month forecast
+        lengths = np.array([len(series) for _, series in named_series])
+        future_X = lengths[:, None] + np.arange(6)[None, :]
+        forecast_values = fit.predict(future_X)
+        lower, upper = fit.prediction_interval(future_X)
+        
+        for i, (name, series) in enumerate(named_series):
             # Seasonal adjustment (simple)
             seasonal_factors = _calculate_seasonal_factors(series)
-            adjusted_forecast = []
-            
-            for i, base_forecast in enumerate(forecast_values):
-                month_ahead = (series.index[-1].month + i) % 12 + 1
-                seasonal_factor = seasonal_factors.get(month_ahead, 1.0)
-                adjusted_forecast.append(base_forecast * seasonal_factor)
+            months_ahead = (series.index[-1].month + np.arange(6)) % 12 + 1
+            factors = np.array([seasonal_factors.get(month, 1.0) for month in months_ahead])
             
             forecasts[f'{name}_forecast'] = {
                 'method': 'linear_regression_with_seasonal_adjustment',
                 'forecast_horizon': '6_months',
-                'forecast_values': [float(x) for x in adjusted_forecast],
+                'forecast_values': [float(x) for x in forecast_values[i] * factors],
+                'prediction_interval': {
+                    'level': 0.95,
+                    'lower': [float(x) for x in lower[i] * factors],
+                    'upper': [float(x) for x in upper[i] * factors]
+                },
                 'model_performance': {
-                    'mae': float(mae),
-                    'rmse': float(rmse),
-                    'r_squared': float(model.score(X, y))
+                    'mae': float(fit.mae[i]),
+                    'rmse': float(fit.rmse[i]),
+                    'r_squared': float(fit.r_squared[i])
                 },
                 'confidence_level': 'basic',
                 'notes': 'Linear trend with seasonal adjustment'
@@ -2734,58 +3416,162 @@ def _determine_overall_status(validation_results: Dict) -> str:
         return 'error'
 
 # Enhanced caching system
+# Default memory budget of the global data cache
+DATA_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def _estimate_memory_usage(value) -> int:
+    """Estimate the memory held by a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_memory_usage(key) + _estimate_memory_usage(item)
+                                          for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_estimate_memory_usage(item) for item in value)
+    return sys.getsizeof(value)
+
 class DataCache:
-    """Enhanced data caching system with TTL and validation."""
+    """Thread-safe LRU data cache with per-key TTL and a memory budget.
+    
+    Entries expire after their TTL and the least recently used entries are
+    evicted once the estimated size of the cached values exceeds max_bytes.
+    RealTimeDataManager writes from its background threads while the
+    dashboard reads, so every operation holds the cache lock.
+    """
     
-    def __init__(self, default_ttl: int = 3600):
-        self.cache = {}
+    def __init__(self, default_ttl: int = 3600, max_bytes: Optional[int] = DATA_CACHE_MAX_BYTES):
+        self.cache = OrderedDict()
         self.timestamps = {}
+        self.ttls = {}
+        self.sizes = {}
         self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
         self.access_counts = {}
+        self.total_bytes = 0
+        self.lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejections': 0}
         
     def get(self, key: str, ttl: Optional[int] = None) -> Optional[any]:
-        """Get cached data if available and fresh."""
-        if key not in self.cache:
-            return None
+        """Get cached data if available and fresh.
+        
+        Args:
+            key: Cache key
+            ttl: Maximum age in seconds, overriding the entry's own TTL
+        """
+        with self.lock:
+            if key not in self.cache:
+                self.stats['misses'] += 1
+                return None
+            
+            ttl = ttl or self.ttls[key] or self.default_ttl
+            age = time.time() - self.timestamps[key]
+            
+            if age > ttl:
+                # Data is stale, remove from cache
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
             
-        ttl = ttl or self.default_ttl
-        age = time.time() - self.timestamps[key]
+            # Mark as most recently used and update access count
+            self.cache.move_to_end(key)
+            self.access_counts[key] = self.access_counts.get(key, 0) + 1
+            self.stats['hits'] += 1
+            return self.cache[key]
+    
+    def set(self, key: str, value: any, ttl: Optional[int] = None) -> None:
+        """Cache data with timestamp.
         
-        if age > ttl:
-            # Data is stale, remove from cache
-            self.invalidate(key)
-            return None
+        Args:
+            key: Cache key
+            value: Data to cache
+            ttl: Time to live in seconds (defaults to the cache's default TTL)
+        """
+        size = _estimate_memory_usage(value)
+        with self.lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Caching the value would evict everything else and still exceed the budget
+                self.stats['rejections'] += 1
+                logger.warning(f"Not caching {key}: {size} bytes exceeds the cache budget of {self.max_bytes} bytes")
+                return
             
-        # Update access count
-        self.access_counts[key] = self.access_counts.get(key, 0) + 1
-        return self.cache[key]
+            self.cache[key] = value
+            self.timestamps[key] = time.time()
+            self.ttls[key] = ttl
+            self.sizes[key] = size
+            self.access_counts[key] = 0
+            self.total_bytes += size
+            self._enforce_budget()
+    
+    def _enforce_budget(self) -> None:
+        """Drop expired entries, then least recently used ones, until the cache fits its budget."""
+        if self.max_bytes is None or self.total_bytes <= self.max_bytes:
+            return
+        self.purge_expired()
+        while self.total_bytes > self.max_bytes and self.cache:
+            key = next(iter(self.cache))
+            self._remove(key)
+            self.stats['evictions'] += 1
     
-    def set(self, key: str, value: any) -> None:
-        """Cache data with timestamp."""
-        self.cache[key] = value
-        self.timestamps[key] = time.time()
-        self.access_counts[key] = 0
+    def purge_expired(self) -> int:
+        """Remove every expired entry.
+        
+        Returns:
+            Number of removed entries
+        """
+        now = time.time()
+        with self.lock:
+            expired = [key for key in self.cache
+                       if now - self.timestamps[key] > (self.ttls[key] or self.default_ttl)]
+            for key in expired:
+                self._remove(key)
+            self.stats['expirations'] += len(expired)
+        return len(expired)
+    
+    def _remove(self, key: str) -> None:
+        if key in self.cache:
+            del self.cache[key]
+            self.total_bytes -= self.sizes.pop(key)
+            self.timestamps.pop(key, None)
+            self.ttls.pop(key, None)
+            self.access_counts.pop(key, None)
         
     def invalidate(self, key: str) -> None:
         """Remove data from cache."""
-        self.cache.pop(key, None)
-        self.timestamps.pop(key, None)
-        self.access_counts.pop(key, None)
+        with self.lock:
+            self._remove(key)
         
     def clear(self) -> None:
         """Clear all cached data."""
-        self.cache.clear()
-        self.timestamps.clear()
-        self.access_counts.clear()
+        with self.lock:
+            self.cache.clear()
+            self.timestamps.clear()
+            self.ttls.clear()
+            self.sizes.clear()
+            self.access_counts.clear()
+            self.total_bytes = 0
         
     def get_stats(self) -> Dict[str, any]:
         """Get cache statistics."""
-        return {
-            'cached_items': len(self.cache),
-            'total_access_count': sum(self.access_counts.values()),
-            'cache_keys': list(self.cache.keys()),
-            'access_counts': self.access_counts.copy()
-        }
+        with self.lock:
+            stats = dict(self.stats)
+            stats.update({
+                'cached_items': len(self.cache),
+                'total_access_count': sum(self.access_counts.values()),
+                'cache_keys': list(self.cache.keys()),
+                'access_counts': self.access_counts.copy(),
+                'memory_usage_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'item_sizes': self.sizes.copy()
+            })
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
 
 # Global cache instance
 data_cache = DataCache()
@@ -2881,24 +3667,120 @@ def extract_historical_simulation_parameters() -> Dict[str, any]:
     
     This function analyzes historical container throughput and cargo statistics
     to derive realistic simulation parameters that reflect actual Hong Kong port
-    operational patterns and seasonal variations.
+    operational patterns and seasonal variations. The result is memoized in the
+    analysis graph until the underlying data changes.
     
     Returns:
         Dict containing enhanced simulation parameters based on historical data
     """
+    return _share_parsed(analysis_graph.get('historical_simulation_parameters'))
+
+def load_historical_simulation_parameters() -> Dict[str, any]:
+    """Load the historical simulation parameters from their persisted snapshot.
+    
+    The snapshot is re-extracted with extract_historical_simulation_parameters()
+    only when the container throughput or cargo statistics files changed.
+    
+    Returns:
+        Dict containing enhanced simulation parameters based on historical data
+    """
+    source_paths = [CONTAINER_THROUGHPUT_FILE] + _cargo_statistics_files()
+    if not all(Path(path).exists() for path in source_paths):
+        return extract_historical_simulation_parameters()
+    return parameter_snapshot.load_or_build(source_paths, extract_historical_simulation_parameters)
+
+def build_parameter_snapshot(rebuild: bool = False) -> Dict[str, any]:
+    """Extract the historical simulation parameters and persist their snapshot.
+    
+    Args:
+        rebuild: Discard the existing snapshot first
+        
+    Returns:
+        Dict: The snapshotted parameters
+    """
+    if rebuild:
+        parameter_snapshot.clear()
+    return load_historical_simulation_parameters()
+
+# Backups written by VesselDataFetcher.backup_existing_files, e.g. Expected_arrivals_20250822_101500.xml
+VESSEL_BACKUP_DIR = VESSEL_DATA_DIR / "vessel_data" / "backups"
+_VESSEL_BACKUP_NAME = re.compile(r'^(?P<feed>.+)_(?P<taken>\d{8}_\d{6})\.xml$')
+
+def _ingest_vessel_feed_snapshot(snapshot_file: Path, feed_name: str, observed_at: datetime,
+                                 vessel_df: Optional[pd.DataFrame] = None) -> Optional[Dict[str, int]]:
+    """Ingest one vessel feed file into the vessel history store unless it was ingested before.
+    
+    Args:
+        snapshot_file: The feed file or one of its backups
+        feed_name: Name of the feed, e.g. 'Arrived_in_last_36_hours.xml'
+        observed_at: When the file was downloaded
+        vessel_df: The file's already parsed frame; parsed here when omitted
+        
+    Returns:
+        The ingest counts, or None if the file was already ingested
+    """
+    sha256 = hashlib.sha256(snapshot_file.read_bytes()).hexdigest()
+    if vessel_history.has_snapshot(sha256):
+        return None
+    if vessel_df is None:
+        # Parse without keeping every backup in the parse cache
+        vessel_df = load_vessel_data_from_xml.__wrapped__(snapshot_file)
+    vessel_df = vessel_df.assign(source_file=feed_name)
+    return vessel_history.ingest(vessel_df, observed_at=observed_at, source=snapshot_file.name, sha256=sha256)
+
+def backfill_vessel_history(backup_dir: Optional[Path] = None) -> Dict[str, int]:
+    """Ingest the vessel feed backups and the current feeds into the vessel history store.
+    
+    Files already ingested (by SHA-256 hash) are skipped, so the backfill can
+    be rerun at any time.
+    
+    Args:
+        backup_dir: Directory of backup XML files (defaults to VESSEL_BACKUP_DIR)
+        
+    Returns:
+        Dict with the number of files ingested and skipped, of new movements
+        and of rows rejected for lacking a movement time
+    """
+    backup_dir = Path(backup_dir) if backup_dir is not None else VESSEL_BACKUP_DIR
+    snapshots = []
+    if backup_dir.exists():
+        for backup_file in backup_dir.glob('*.xml'):
+            match = _VESSEL_BACKUP_NAME.match(backup_file.name)
+            if match:
+                snapshots.append((backup_file, f"{match['feed']}.xml",
+                                  datetime.strptime(match['taken'], '%Y%m%d_%H%M%S')))
+    for xml_file in VESSEL_XML_FILES:
+        feed_file = VESSEL_DATA_DIR / xml_file
+        if feed_file.exists():
+            snapshots.append((feed_file, xml_file, datetime.fromtimestamp(feed_file.stat().st_mtime)))
+    
+    result = {'files': 0, 'skipped': 0, 'inserted': 0, 'rejected': 0}
+    # Oldest first, so first_seen reflects when a movement first appeared
+    for snapshot_file, feed_name, observed_at in sorted(snapshots, key=lambda snapshot: snapshot[2]):
+        try:
+            ingested = _ingest_vessel_feed_snapshot(snapshot_file, feed_name, observed_at)
+            if ingested is None:
+                result['skipped'] += 1
+                continue
+            result['files'] += 1
+            result['inserted'] += ingested['inserted']
+            result['rejected'] += ingested['rejected']
+        except Exception as e:
+            logger.error(f"Error ingesting {snapshot_file} into the vessel history: {e}")
+    
+    logger.info(f"Vessel history backfill: {result}")
+    return result
+
+def _extract_simulation_parameters(throughput_data: pd.DataFrame, cargo_stats: Dict[str, pd.DataFrame],
+                                   trends: Dict[str, any]) -> Dict[str, any]:
+    """Derive simulation parameters from the throughput data, cargo statistics and trend analysis."""
     try:
         logger.info("Extracting simulation parameters from historical data...")
         
-        # Load historical data
-        throughput_data = load_container_throughput()
-        cargo_stats = load_port_cargo_statistics()
-        
         if throughput_data.empty:
             logger.warning("No historical throughput data available, using default parameters")
             return {}
         
-        # Get comprehensive trend analysis
-        trends = get_throughput_trends()
         seasonal_analysis = trends.get('seasonal_analysis', {})
         
         # Extract seasonal patterns
@@ -2988,4 +3870,23 @@ def extract_historical_simulation_parameters() -> Dict[str, any]:
         
     except Exception as e:
         logger.error(f"Error extracting historical simulation parameters: {e}")
-        return {}
\ No newline at end of file
+        return {}
+
+# Memoized analyses of the historical data. Source nodes call the loaders through
+# module globals so their file caches (and patched loaders) are honoured; every
+# derived node is recomputed only when the data behind its inputs changes.
+analysis_graph = AnalysisGraph()
+analysis_graph.add_node('container_throughput', lambda: load_container_throughput(), source=True)
+analysis_graph.add_node('port_cargo_statistics', lambda: load_port_cargo_statistics(), source=True)
+analysis_graph.add_node('focused_cargo_statistics', lambda: load_focused_cargo_statistics(), source=True)
+analysis_graph.add_node('throughput_trends', lambda monthly_data: _analyze_throughput_trends(monthly_data),
+                        inputs=['container_throughput'])
+analysis_graph.add_node('cargo_time_series', lambda cargo_stats: get_time_series_data(cargo_stats),
+                        inputs=['focused_cargo_statistics'])
+analysis_graph.add_node('enhanced_cargo_analysis',
+                        lambda cargo_stats, time_series: _analyze_enhanced_cargo(cargo_stats, time_series),
+                        inputs=['focused_cargo_statistics', 'cargo_time_series'])
+analysis_graph.add_node('historical_simulation_parameters',
+                        lambda throughput_data, cargo_stats, trends: _extract_simulation_parameters(
+                            throughput_data, cargo_stats, trends),
+                        inputs=['container_throughput', 'port_cargo_statistics', 'throughput_trends'])
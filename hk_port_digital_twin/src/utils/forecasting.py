@@ -0,0 +1,125 @@
+# Comments for context:
+# This module is the shared linear-trend forecasting kernel used by the cargo
+# throughput forecasts in data_loader.py and by BusinessIntelligenceEngine.
+# Those forecasts used to fit one sklearn LinearRegression / np.polyfit per
+# series and compute their metrics one series at a time.
+#
+# Approach: all series are stacked into one 2D array with NaN marking missing
+# points. Every ordinary least-squares fit is solved at once from masked
+# closed-form sums, and the fit metrics (MAE, RMSE, R²) and prediction
+# intervals are computed with array operations over all series together.
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from scipy import stats
+
+
+@dataclass
+class LinearTrendFit:
+    """Ordinary least-squares trend lines fitted to a batch of series
+
+    Every array has one entry per series. Series with fewer than two points
+    (or no variation in x) have NaN coefficients and metrics.
+    """
+    slopes: np.ndarray
+    intercepts: np.ndarray
+    n_obs: np.ndarray
+    mae: np.ndarray
+    rmse: np.ndarray
+    r_squared: np.ndarray
+    x_mean: np.ndarray
+    sxx: np.ndarray
+    residual_std: np.ndarray
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Evaluate every trend line at the points x
+
+        Args:
+            x: 1D array of points shared by all series, or an array of shape
+                (n_series, k) with separate points per series
+
+        Returns:
+            Array of shape (n_series, k)
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        return self.intercepts[:, None] + self.slopes[:, None] * x
+
+    def prediction_interval(self, x: np.ndarray, level: float = 0.95):
+        """Prediction intervals for new observations at the points x
+
+        Uses the Student t distribution with n - 2 degrees of freedom; series
+        with fewer than three points get NaN bounds.
+
+        Args:
+            x: Points as accepted by predict()
+            level: Coverage probability of the interval
+
+        Returns:
+            Tuple of (lower, upper) arrays of shape (n_series, k)
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        dof = self.n_obs - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_value = np.where(dof > 0, stats.t.ppf(0.5 + level / 2, np.maximum(dof, 1)), np.nan)
+            spread = self.residual_std[:, None] * np.sqrt(
+                1 + 1 / self.n_obs[:, None] + (x - self.x_mean[:, None]) ** 2 / self.sxx[:, None]
+            )
+        center = self.predict(x)
+        half_width = t_value[:, None] * spread
+        return center - half_width, center + half_width
+
+
+def fit_linear_trends(x: np.ndarray, values: np.ndarray, mask: Optional[np.ndarray] = None) -> LinearTrendFit:
+    """Fit y = intercept + slope * x to every series in one batched least-squares solve
+
+    Args:
+        x: 1D array of the points shared by all series, e.g. years or periods
+        values: Array of shape (n_series, len(x)); NaN marks a missing point
+        mask: Optional boolean array of the same shape selecting the points to fit
+            (defaults to the non-NaN values)
+
+    Returns:
+        LinearTrendFit with the coefficients and fit metrics of every series
+    """
+    x = np.asarray(x, dtype=float)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if mask is None:
+        mask = ~np.isnan(values)
+    weights = mask.astype(float)
+    y = np.where(mask, values, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_obs = weights.sum(axis=1)
+        x_mean = (weights * x).sum(axis=1) / n_obs
+        y_mean = y.sum(axis=1) / n_obs
+        x_centered = np.where(mask, x[None, :] - x_mean[:, None], 0.0)
+        y_centered = np.where(mask, y - y_mean[:, None], 0.0)
+        sxx = (x_centered ** 2).sum(axis=1)
+        sxy = (x_centered * y_centered).sum(axis=1)
+
+        valid = (n_obs >= 2) & (sxx > 0)
+        slopes = np.where(valid, sxy / sxx, np.nan)
+        intercepts = np.where(valid, y_mean - slopes * x_mean, np.nan)
+
+        residuals = np.where(mask, y - (intercepts[:, None] + slopes[:, None] * x[None, :]), 0.0)
+        ss_res = (residuals ** 2).sum(axis=1)
+        ss_tot = (y_centered ** 2).sum(axis=1)
+        mae = np.abs(residuals).sum(axis=1) / n_obs
+        rmse = np.sqrt(ss_res / n_obs)
+        # A constant series is explained perfectly by a flat line (as in sklearn's r2_score)
+        r_squared = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.where(np.isclose(ss_res, 0), 1.0, 0.0))
+        residual_std = np.where(n_obs > 2, np.sqrt(ss_res / (n_obs - 2)), np.nan)
+
+    return LinearTrendFit(
+        slopes=slopes,
+        intercepts=intercepts,
+        n_obs=n_obs,
+        mae=np.where(valid, mae, np.nan),
+        rmse=np.where(valid, rmse, np.nan),
+        r_squared=np.where(valid, r_squared, np.nan),
+        x_mean=x_mean,
+        sxx=sxx,
+        residual_std=np.where(valid, residual_std, np.nan)
+    )
@@ -0,0 +1,204 @@
+# Comments for context:
+# This module persists the simulation parameters extracted from the historical
+# data (extract_historical_simulation_parameters) as a JSON snapshot. Every
+# PortSimulation.create_with_historical_parameters call used to reload the
+# throughput and cargo statistics and rerun the trend analysis; with many
+# simulation workers starting at once that analysis was repeated in each one.
+#
+# Approach: the snapshot records the size, modification time and SHA-256 hash
+# of every raw source file, like the table cache manifest. It is loaded as is
+# while the sources are unchanged (a hash check settles files that were only
+# touched) and re-extracted otherwise. The snapshot can be rebuilt up front
+# with `python -m src.utils.parameter_snapshot --rebuild`.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    from .table_cache import file_sha256
+except ImportError:
+    from table_cache import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Version of the snapshot layout and of the extracted parameter set; bump it
+# when extract_historical_simulation_parameters changes so snapshots are rebuilt
+PARAMETER_SNAPSHOT_FORMAT_VERSION = 1
+
+# Default location of the snapshot
+DEFAULT_PARAMETER_SNAPSHOT_FILE = (Path(__file__).parent.parent.parent / "data" / "cache" /
+                                   "historical_simulation_parameters.json").resolve()
+
+
+def _json_default(value):
+    """Convert numpy scalars and other non-JSON values in the parameter set"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class ParameterSnapshot:
+    """JSON snapshot of the historical simulation parameters, validated against their raw source files"""
+
+    def __init__(self, path: Union[str, Path] = None):
+        self.path = Path(path) if path is not None else DEFAULT_PARAMETER_SNAPSHOT_FILE
+        self.stats = {'hits': 0, 'misses': 0, 'builds': 0}
+        self.lock = threading.Lock()
+
+    def _read(self) -> Optional[Dict]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading parameter snapshot {self.path}: {e}")
+            return None
+        if snapshot.get('format_version') != PARAMETER_SNAPSHOT_FORMAT_VERSION:
+            return None
+        return snapshot
+
+    def _write(self, snapshot: Dict):
+        """Write the snapshot through a temporary file so readers never see a partial file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, indent=2, default=_json_default)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _sources_unchanged(self, snapshot: Dict, source_paths: List[Path]) -> bool:
+        """Check the recorded sources against the files on disk, refreshing touched files' stats"""
+        recorded = snapshot.get('sources', {})
+        if sorted(recorded) != sorted(str(path) for path in source_paths):
+            return False
+
+        touched = False
+        for path in source_paths:
+            source = recorded[str(path)]
+            stat = path.stat()
+            if stat.st_size != source['size']:
+                return False
+            if stat.st_mtime_ns != source['mtime_ns']:
+                if file_sha256(path) != source['sha256']:
+                    return False
+                source['mtime_ns'] = stat.st_mtime_ns
+                touched = True
+        if touched:
+            self._write(snapshot)
+        return True
+
+    def load(self, source_paths: List[Path]) -> Optional[Dict]:
+        """Load the parameters if they were extracted from the current source files
+
+        Args:
+            source_paths: Raw files the parameters are derived from
+
+        Returns:
+            The parameter set, or None if the snapshot is missing or stale
+        """
+        source_paths = [Path(path) for path in source_paths]
+        with self.lock:
+            try:
+                snapshot = self._read()
+                valid = snapshot is not None and self._sources_unchanged(snapshot, source_paths)
+            except Exception as e:
+                logger.error(f"Error validating parameter snapshot {self.path}: {e}")
+                valid = False
+            if not valid:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return snapshot['parameters']
+
+    def save(self, parameters: Dict, source_paths: List[Path]) -> Path:
+        """Write the parameters and the source files they were extracted from
+
+        Args:
+            parameters: Parameter set from extract_historical_simulation_parameters
+            source_paths: Raw files the parameters are derived from
+
+        Returns:
+            Path of the written snapshot
+        """
+        sources = {}
+        for source_path in source_paths:
+            stat = Path(source_path).stat()
+            sources[str(source_path)] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(source_path)
+            }
+        snapshot = {
+            'format_version': PARAMETER_SNAPSHOT_FORMAT_VERSION,
+            'built_at': datetime.now().isoformat(),
+            'sources': sources,
+            'parameters': parameters
+        }
+        with self.lock:
+            self._write(snapshot)
+            self.stats['builds'] += 1
+        logger.info(f"Saved historical simulation parameter snapshot to {self.path}")
+        return self.path
+
+    def load_or_build(self, source_paths: List[Path], build: Callable[[], Dict]) -> Dict:
+        """Load the parameters from the snapshot, extracting them again when stale
+
+        Empty parameter sets (failed extractions) are returned but not saved.
+        """
+        parameters = self.load(source_paths)
+        if parameters is not None:
+            return parameters
+
+        parameters = build()
+        if parameters:
+            try:
+                self.save(parameters, source_paths)
+            except Exception as e:
+                logger.error(f"Error saving parameter snapshot: {e}")
+        return parameters
+
+    def clear(self):
+        """Remove the snapshot"""
+        with self.lock:
+            if self.path.exists():
+                self.path.unlink()
+
+
+# Shared snapshot used by get_enhanced_simulation_config
+parameter_snapshot = ParameterSnapshot()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build (or rebuild) the historical simulation parameter snapshot"""
+    parser = argparse.ArgumentParser(description="Snapshot the simulation parameters extracted from historical data")
+    parser.add_argument('--rebuild', action='store_true', help="discard the existing snapshot first")
+    args = parser.parse_args(argv)
+
+    sys.path.append(str(Path(__file__).parent.parent))
+    from utils.data_loader import build_parameter_snapshot
+
+    parameters = build_parameter_snapshot(rebuild=args.rebuild)
+    if not parameters:
+        print("No historical simulation parameters could be extracted")
+        return 1
+    print(f"Ship arrival rate: {parameters['ship_arrival_rate']:.2f} ships/hour "
+          f"({parameters.get('data_period', 'unknown period')})")
+    print(f"Saved snapshot to {parameter_snapshot.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# Comments for context:
+# This module runs the periodic and event-triggered refresh jobs of the
+# real-time data layer on a single asyncio event loop. RealTimeDataManager used
+# to start one sleeping thread per refresh loop (vessel data, weather) with
+# fixed retry sleeps, next to a separate VesselDataScheduler thread for the
+# Marine Department feed downloads.
+#
+# Approach: the scheduler owns one event loop in a background thread and one
+# task per job. A task waits for its interval or for an explicit trigger (e.g.
+# a watched file changed), runs the job's blocking function in a thread pool
+# executor under a deadline, and after a failure waits an exponentially
+# growing, jittered backoff before retrying. Jobs can be triggered, cancelled
+# and inspected from any thread; get_status() reports every job's state.
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshJob:
+    """A refresh job and its run history
+
+    Attributes:
+        name: Unique job name
+        func: Blocking function run in the scheduler's executor
+        interval: Seconds between successful runs; None runs the job only when triggered
+        timeout: Deadline of one run in seconds (None for no deadline)
+        run_immediately: Run as soon as the scheduler starts instead of after one interval
+        backoff_base: Delay before the first retry after a failure, in seconds
+        backoff_max: Upper bound of the retry delay, in seconds
+        jitter: Relative random spread applied to retry delays
+    """
+    name: str
+    func: Callable[[], Any]
+    interval: Optional[float] = None
+    timeout: Optional[float] = None
+    run_immediately: bool = True
+    backoff_base: float = 60.0
+    backoff_max: float = 1800.0
+    jitter: float = 0.2
+
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    consecutive_failures: int = 0
+    running: bool = False
+    cancelled: bool = False
+    last_started: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    last_duration: Optional[float] = None
+    next_run: Optional[datetime] = None
+
+    wakeup: Optional[asyncio.Event] = field(default=None, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    future: Any = field(default=None, repr=False)
+
+    def retry_delay(self) -> float:
+        """Jittered exponential backoff after the current run of failures"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, self.consecutive_failures - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def status(self) -> Dict[str, Any]:
+        """Serializable status of the job"""
+        def isoformat(value):
+            return value.isoformat() if value else None
+
+        return {
+            'interval': self.interval,
+            'timeout': self.timeout,
+            'running': self.running,
+            'cancelled': self.cancelled,
+            'runs': self.runs,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'consecutive_failures': self.consecutive_failures,
+            'last_started': isoformat(self.last_started),
+            'last_success': isoformat(self.last_success),
+            'last_error': self.last_error,
+            'last_duration': self.last_duration,
+            'next_run': isoformat(self.next_run)
+        }
+
+
+class RefreshScheduler:
+    """Runs refresh jobs on one asyncio event loop with a shared executor"""
+
+    def __init__(self, max_workers: int = 4, name: str = "refresh-scheduler"):
+        self.name = name
+        self.max_workers = max_workers
+        self.jobs: Dict[str, RefreshJob] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def add_job(self, name: str, func: Callable[[], Any], interval: Optional[float] = None, **options) -> RefreshJob:
+        """Register a job; jobs added while the scheduler runs start right away
+
+        Args:
+            name: Unique job name
+            func: Blocking function to run
+            interval: Seconds between successful runs, or None for a triggered-only job
+            **options: Further RefreshJob settings (timeout, run_immediately, backoff_base, ...)
+
+        Returns:
+            The registered job
+        """
+        job = RefreshJob(name=name, func=func, interval=interval, **options)
+        with self.lock:
+            if name in self.jobs and not self.jobs[name].cancelled:
+                raise ValueError(f"Refresh job {name} already exists")
+            self.jobs[name] = job
+        if self.is_running:
+            self.loop.call_soon_threadsafe(self._start_job, job)
+        return job
+
+    def start(self) -> bool:
+        """Start the event loop thread and every registered job"""
+        if self.is_running:
+            logger.warning("Refresh scheduler already running")
+            return True
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker")
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, args=(started,), name=self.name, daemon=True)
+        self.thread.start()
+        if not started.wait(timeout=5.0):
+            logger.error("Refresh scheduler event loop did not start")
+            return False
+
+        with self.lock:
+            jobs = [job for job in self.jobs.values() if not job.cancelled]
+        for job in jobs:
+            self.loop.call_soon_threadsafe(self._start_job, job)
+        logger.info(f"Refresh scheduler started with {len(jobs)} jobs")
+        return True
+
+    def _run_loop(self, started: threading.Event):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(started.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """Cancel every job and stop the event loop
+
+        Runs already handed to the executor are not interrupted; the executor
+        is shut down without waiting for them.
+        """
+        if self.loop is None:
+            return True
+        loop, thread = self.loop, self.thread
+        if loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            for job in self.jobs.values():
+                job.running = False
+                job.next_run = None
+        self.loop = None
+        self.thread = None
+        self.executor = None
+        stopped = thread is None or not thread.is_alive()
+        if stopped:
+            logger.info("Refresh scheduler stopped")
+        else:
+            logger.warning(f"Refresh scheduler thread did not stop within {timeout} seconds")
+        return stopped
+
+    def trigger(self, name: str) -> bool:
+        """Run a job as soon as possible (thread-safe)
+
+        Triggers arriving while the job runs are coalesced into one extra run.
+
+        Returns:
+            True if the trigger was delivered to a running job
+        """
+        job = self.jobs.get(name)
+        if job is None or job.cancelled or not self.is_running or job.wakeup is None:
+            return False
+        self.loop.call_soon_threadsafe(job.wakeup.set)
+        return True
+
+    def cancel(self, name: str) -> bool:
+        """Cancel a job (thread-safe); an executor run in progress finishes on its own
+
+        Returns:
+            True if the job existed and was not cancelled yet
+        """
+        job = self.jobs.get(name)
+        if job is None or job.cancelled:
+            return False
+        job.cancelled = True
+        job.next_run = None
+        if self.is_running and job.task is not None:
+            self.loop.call_soon_threadsafe(job.task.cancel)
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Status of the scheduler and of every job"""
+        with self.lock:
+            jobs = dict(self.jobs)
+        return {
+            'running': self.is_running,
+            'max_workers': self.max_workers,
+            'jobs': {name: job.status() for name, job in jobs.items()}
+        }
+
+    def _start_job(self, job: RefreshJob):
+        if job.cancelled:
+            return
+        job.wakeup = asyncio.Event()
+        job.task = self.loop.create_task(self._job_loop(job), name=f"{self.name}:{job.name}")
+
+    async def _job_loop(self, job: RefreshJob):
+        try:
+            if not job.run_immediately or job.interval is None:
+                await self._wait(job, job.interval)
+            while True:
+                succeeded = await self._run_once(job)
+                await self._wait(job, job.interval if succeeded else job.retry_delay())
+        except asyncio.CancelledError:
+            job.next_run = None
+            raise
+
+    async def _wait(self, job: RefreshJob, delay: Optional[float]):
+        """Sleep until the delay elapses or the job is triggered"""
+        job.next_run = datetime.now() + timedelta(seconds=delay) if delay is not None else None
+        try:
+            await asyncio.wait_for(job.wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        job.wakeup.clear()
+
+    async def _run_once(self, job: RefreshJob) -> bool:
+        """Run the job in the executor under its deadline; returns whether it succeeded"""
+        if job.future is not None and not job.future.done():
+            # A run that missed its deadline is still executing; don't pile another on top
+            self._record_failure(job, "previous run still in progress")
+            return False
+
+        job.running = True
+        job.next_run = None
+        job.last_started = datetime.now()
+        started = time.monotonic()
+        job.future = self.executor.submit(job.func)
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(job.future), timeout=job.timeout)
+        except asyncio.TimeoutError:
+            job.timeouts += 1
+            self._record_failure(job, f"deadline of {job.timeout} seconds exceeded")
+            return False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(job, str(e))
+            return False
+        finally:
+            job.running = False
+            job.runs += 1
+            job.last_duration = time.monotonic() - started
+
+        job.consecutive_failures = 0
+        job.last_success = datetime.now()
+        job.last_error = None
+        return True
+
+    def _record_failure(self, job: RefreshJob, error: str):
+        job.failures += 1
+        job.consecutive_failures += 1
+        job.last_error = error
+        logger.error(f"Refresh job {job.name} failed ({job.consecutive_failures} in a row): {error}")
@@ -0,0 +1,197 @@
+# Comments for context:
+# This module prevents cache stampedes in the data layer. When the dashboard
+# starts or a cached value expires, several Streamlit sessions and the
+# RealTimeDataManager threads can miss the cache at the same moment and all
+# start the same expensive load (parsing the vessel feeds, the trend analysis).
+#
+# Approach: a SingleFlight group tracks the computations in flight by key.
+# The first caller for a key runs the computation; concurrent callers for the
+# same key wait for it and receive its result (or its exception) instead of
+# repeating the work. Optionally a group remembers results for max_age seconds
+# and, with stale_while_revalidate, answers with the previous value while a
+# single background refresh computes the new one.
+
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """A computation in progress and the outcome its waiters receive"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.owner = threading.get_ident()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent computations of the same key"""
+
+    def __init__(self):
+        self.flights: Dict[Hashable, _Flight] = {}
+        self.results: Dict[Hashable, tuple] = {}
+        self.lock = threading.Lock()
+        self.stats = {'calls': 0, 'executions': 0, 'shared': 0, 'stale_served': 0, 'background_refreshes': 0}
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Run compute for key, or wait for the run already in progress
+
+        Every concurrent caller receives the same result object; a failure is
+        raised in every caller. A nested call for a key its own thread is
+        already computing simply runs compute.
+
+        Args:
+            key: Hashable identity of the computation
+            compute: Function producing the value
+
+        Returns:
+            The computed value
+        """
+        with self.lock:
+            self.stats['calls'] += 1
+            flight = self.flights.get(key)
+            if flight is None:
+                flight = self.flights[key] = _Flight()
+                leader = True
+            elif flight.owner == threading.get_ident():
+                flight, leader = None, True
+            else:
+                self.stats['shared'] += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = compute()
+            if flight is not None:
+                flight.value = value
+            return value
+        except BaseException as e:
+            if flight is not None:
+                flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.stats['executions'] += 1
+                if flight is not None and self.flights.get(key) is flight:
+                    del self.flights[key]
+            if flight is not None:
+                flight.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a computation for key is running"""
+        with self.lock:
+            return key in self.flights
+
+    def get(self, key: Hashable, compute: Callable[[], Any], max_age: float,
+            stale_while_revalidate: bool = False) -> Any:
+        """Return the remembered value for key while it is younger than max_age
+
+        Older values are recomputed once for all concurrent callers. With
+        stale_while_revalidate, a caller finding an old value gets it straight
+        away while a background thread refreshes it.
+
+        Args:
+            key: Hashable identity of the computation
+            compute: Function producing the value
+            max_age: Seconds a computed value stays fresh
+            stale_while_revalidate: Serve old values during the refresh
+
+        Returns:
+            The fresh (or, while revalidating, the previous) value
+        """
+        with self.lock:
+            entry = self.results.get(key)
+        if entry is not None:
+            computed_at, value = entry
+            if time.time() - computed_at <= max_age:
+                return value
+            if stale_while_revalidate:
+                self.refresh(key, compute)
+                with self.lock:
+                    self.stats['stale_served'] += 1
+                return value
+        return self.do(key, lambda: self._remember(key, compute()))
+
+    def refresh(self, key: Hashable, compute: Callable[[], Any]) -> Optional[threading.Thread]:
+        """Recompute and remember the value for key in a background thread
+
+        Returns:
+            The refresh thread, or None if a computation for key is already running
+        """
+        with self.lock:
+            if key in self.flights:
+                return None
+            self.stats['background_refreshes'] += 1
+
+        def run():
+            try:
+                self.do(key, lambda: self._remember(key, compute()))
+            except Exception as e:
+                logger.error(f"Error refreshing {key!r} in the background: {e}")
+
+        thread = threading.Thread(target=run, name="single-flight-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def _remember(self, key: Hashable, value: Any) -> Any:
+        if value is not None:
+            with self.lock:
+                self.results[key] = (time.time(), value)
+        return value
+
+    def forget(self, key: Optional[Hashable] = None):
+        """Drop the remembered value for key, or every remembered value"""
+        with self.lock:
+            if key is None:
+                self.results.clear()
+            else:
+                self.results.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get call statistics"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self.flights)
+            stats['remembered'] = len(self.results)
+        return stats
+
+
+def single_flight(max_age: Optional[float] = None, stale_while_revalidate: bool = False,
+                  share: Optional[Callable[[Any], Any]] = None):
+    """Decorate a loader so concurrent calls with the same arguments share one computation
+
+    Args:
+        max_age: Also remember results for this many seconds (default: only
+            deduplicate calls that overlap)
+        stale_while_revalidate: With max_age, serve the previous result while
+            one background call refreshes it
+        share: Function applied to the result handed to each caller, e.g. a
+            shallow copy so callers cannot modify each other's frames
+    """
+    def decorator(loader):
+        group = SingleFlight()
+
+        @wraps(loader)
+        def wrapper(*args, **kwargs):
+            key = (repr(args), repr(sorted(kwargs.items())))
+            compute = lambda: loader(*args, **kwargs)
+            if max_age is None:
+                value = group.do(key, compute)
+            else:
+                value = group.get(key, compute, max_age, stale_while_revalidate)
+            return share(value) if share is not None else value
+
+        wrapper.single_flight = group
+        return wrapper
+    return decorator
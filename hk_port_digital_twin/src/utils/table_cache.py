@@ -0,0 +1,287 @@
+# Comments for context:
+# This module materializes the cleaned, typed statistics tables (container
+# throughput, port cargo statistics) as Feather files so a cold start of the
+# data layer reads them back with memory-mapped Arrow reads instead of
+# re-reading and re-cleaning the raw CSV files in every worker.
+#
+# Approach: every cached table is recorded in a JSON manifest together with
+# the size, modification time and SHA-256 hash of each raw source file. A
+# table is served from the cache while its sources are unchanged (a hash check
+# settles files that were only touched) and rebuilt from the raw files
+# otherwise. Feather needs pyarrow (listed in requirements.txt); without it the
+# loaders parse the raw files as before and a warning says the cache is off.
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Version of the manifest layout and of the cached table schemas; bump it when
+# the loaders' cleaning or dtypes change so existing caches are rebuilt
+TABLE_CACHE_FORMAT_VERSION = 2
+
+# Default location of the materialized tables
+DEFAULT_TABLE_CACHE_DIR = (Path(__file__).parent.parent.parent / "data" / "cache" / "tables").resolve()
+
+MANIFEST_FILE = "manifest.json"
+
+# Whether the missing pyarrow warning was logged
+_pyarrow_warning_logged = False
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """Hex SHA-256 digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_cache_enabled() -> bool:
+    """Whether loaders should use the on-disk table cache"""
+    global _pyarrow_warning_logged
+    if os.getenv('TABLE_CACHE_ENABLED', 'true').lower() != 'true':
+        return False
+    if feather is None:
+        if not _pyarrow_warning_logged:
+            _pyarrow_warning_logged = True
+            logger.warning("pyarrow is not installed - the statistics table cache is disabled "
+                           "and tables are parsed from the raw files")
+        return False
+    return True
+
+
+class TableCache:
+    """Feather files of cleaned tables, validated against their raw source files"""
+
+    def __init__(self, directory: Union[str, Path] = None):
+        self.directory = Path(directory) if directory is not None else DEFAULT_TABLE_CACHE_DIR
+        self.stats = {'hits': 0, 'misses': 0, 'builds': 0}
+        self._manifest = None
+        # Tables are loaded from several threads at once; the lock guards the manifest
+        self.lock = threading.RLock()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILE
+
+    def table_path(self, name: str) -> Path:
+        """Path of the Feather file for a named table"""
+        return self.directory / f"{name}.feather"
+
+    def read_manifest(self) -> Dict:
+        """Read the manifest, starting a new one if it is missing or from another format version"""
+        with self.lock:
+            return self._read_manifest()
+
+    def _read_manifest(self) -> Dict:
+        if self._manifest is None:
+            manifest = None
+            if self.manifest_path.exists():
+                try:
+                    with open(self.manifest_path, 'r') as f:
+                        manifest = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error reading table cache manifest {self.manifest_path}: {e}")
+            if not manifest or manifest.get('format_version') != TABLE_CACHE_FORMAT_VERSION:
+                manifest = {'format_version': TABLE_CACHE_FORMAT_VERSION, 'tables': {}}
+            self._manifest = manifest
+        return self._manifest
+
+    def _write_atomic(self, path: Path, write: Callable[[str], None]):
+        """Write a file through a temporary file so readers never see a partial file"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _write_manifest(self):
+        def write(temp_path):
+            with open(temp_path, 'w') as f:
+                json.dump(self._manifest, f, indent=2)
+        self._write_atomic(self.manifest_path, write)
+
+    def _sources_unchanged(self, entry: Dict, source_paths: List[Path]) -> bool:
+        """Check the recorded sources against the files on disk, refreshing touched files' stats"""
+        recorded = entry.get('sources', {})
+        if sorted(recorded) != sorted(str(path) for path in source_paths):
+            return False
+
+        touched = False
+        for path in source_paths:
+            source = recorded[str(path)]
+            stat = path.stat()
+            if stat.st_size != source['size']:
+                return False
+            if stat.st_mtime_ns != source['mtime_ns']:
+                if file_sha256(path) != source['sha256']:
+                    return False
+                source['mtime_ns'] = stat.st_mtime_ns
+                touched = True
+        if touched:
+            self._write_manifest()
+        return True
+
+    def load(self, name: str, source_paths: List[Path]) -> Optional[pd.DataFrame]:
+        """Load a cached table if it was built from the current source files
+
+        Args:
+            name: Table name, e.g. 'container_throughput'
+            source_paths: Raw files the table is derived from
+
+        Returns:
+            The cached table, or None if it is missing or stale
+        """
+        if feather is None:
+            return None
+        source_paths = [Path(path) for path in source_paths]
+        path = self.table_path(name)
+        try:
+            with self.lock:
+                entry = self.read_manifest()['tables'].get(name)
+                valid = entry is not None and path.exists() and self._sources_unchanged(entry, source_paths)
+                if not valid:
+                    self.stats['misses'] += 1
+                    return None
+                index_columns = list(entry.get('index_columns', []))
+                index_names = entry.get('index_names', [])
+            table = feather.read_table(path, memory_map=True).to_pandas()
+        except Exception as e:
+            logger.error(f"Error reading cached table {name}: {e}")
+            with self.lock:
+                self.stats['misses'] += 1
+            return None
+
+        if index_columns:
+            table = table.set_index(index_columns)
+            table.index.names = index_names
+        with self.lock:
+            self.stats['hits'] += 1
+        return table
+
+    def save(self, name: str, table: pd.DataFrame, source_paths: List[Path]) -> Path:
+        """Materialize a table and record the source files it was built from
+
+        Args:
+            name: Table name
+            table: Cleaned table; a non-default index is stored as columns
+            source_paths: Raw files the table is derived from
+
+        Returns:
+            Path of the written Feather file
+        """
+        if feather is None:
+            raise ImportError("pyarrow is required to write the table cache")
+
+        index_columns = []
+        index_names = list(table.index.names)
+        if not isinstance(table.index, pd.RangeIndex):
+            index_columns = [f"__index_level_{level}__" for level in range(table.index.nlevels)]
+            table = table.copy(deep=False)
+            table.index.names = index_columns
+            table = table.reset_index()
+        table = table.rename(columns=str)
+
+        path = self.table_path(name)
+        self._write_atomic(path, lambda temp_path: feather.write_feather(table, temp_path, compression='uncompressed'))
+
+        sources = {}
+        for source_path in source_paths:
+            stat = Path(source_path).stat()
+            sources[str(source_path)] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(source_path)
+            }
+        with self.lock:
+            self.read_manifest()['tables'][name] = {
+                'file': path.name,
+                'sources': sources,
+                'index_columns': index_columns,
+                'index_names': index_names if index_columns else [],
+                'rows': len(table),
+                'built_at': datetime.now().isoformat()
+            }
+            self._write_manifest()
+            self.stats['builds'] += 1
+        logger.info(f"Cached table {name}: {len(table)} rows")
+        return path
+
+    def load_or_build(self, name: str, source_paths: List[Path], build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """Load a table from the cache, building it from the raw files when stale
+
+        Empty tables (failed parses) are returned but not cached.
+        """
+        table = self.load(name, source_paths)
+        if table is not None:
+            return table
+
+        table = build()
+        if feather is not None and table is not None and not table.empty:
+            try:
+                self.save(name, table, source_paths)
+            except Exception as e:
+                logger.error(f"Error caching table {name}: {e}")
+        return table
+
+    def clear(self):
+        """Remove every cached table and the manifest"""
+        with self.lock:
+            for name, entry in self.read_manifest()['tables'].items():
+                path = self.directory / entry['file']
+                if path.exists():
+                    path.unlink()
+            if self.manifest_path.exists():
+                self.manifest_path.unlink()
+            self._manifest = None
+
+
+# Shared cache used by the data loaders
+table_cache = TableCache()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build (or rebuild) the cached statistics tables from the raw data files"""
+    parser = argparse.ArgumentParser(description="Materialize cleaned statistics tables as Feather files")
+    parser.add_argument('--rebuild', action='store_true', help="discard existing cached tables first")
+    args = parser.parse_args(argv)
+
+    if feather is None:
+        print("pyarrow is not installed - the table cache is unavailable")
+        return 1
+
+    sys.path.append(str(Path(__file__).parent.parent))
+    from utils.data_loader import build_table_cache
+
+    summary = build_table_cache(rebuild=args.rebuild)
+    for name, rows in summary.items():
+        print(f"{name}: {rows} rows")
+    print(f"Cached {len(summary)} tables in {table_cache.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
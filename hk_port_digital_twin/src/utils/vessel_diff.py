@@ -0,0 +1,153 @@
+# Comments for context:
+# This module computes what changed between two successive vessel snapshots.
+# Every vessel refresh used to replace the cached frames wholesale and hand
+# the full frames to every update callback, even when only a handful of
+# vessels had changed, so subscribers had to rebuild their state from scratch.
+#
+# Approach: a vessel row is identified by its (call_sign, source_file,
+# timestamp) key. Both snapshots are indexed by that key; keys only in the new
+# snapshot are inserted rows, keys only in the old one are removed rows, and
+# rows present in both whose other columns differ are updated rows. The
+# comparison is vectorized over the aligned frames.
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying one vessel movement across snapshots
+VESSEL_KEY_COLUMNS = ['call_sign', 'source_file', 'timestamp']
+
+
+@dataclass
+class VesselDelta:
+    """Rows inserted, updated and removed between two vessel snapshots
+
+    Updated rows hold the new values; removed rows the last values seen.
+    """
+    inserted: pd.DataFrame
+    updated: pd.DataFrame
+    removed: pd.DataFrame
+    sequence: int = 0
+    computed_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.inserted.empty and self.updated.empty and self.removed.empty
+
+    def for_source(self, source_file: str) -> 'VesselDelta':
+        """The part of the delta coming from one vessel XML file"""
+        def select(df):
+            return df[df['source_file'] == source_file] if 'source_file' in df.columns else df.iloc[0:0]
+        return VesselDelta(select(self.inserted), select(self.updated), select(self.removed),
+                           self.sequence, self.computed_at)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'sequence': self.sequence,
+            'inserted': len(self.inserted),
+            'updated': len(self.updated),
+            'removed': len(self.removed)
+        }
+
+
+def _keyed(df: pd.DataFrame, key_columns: List[str]) -> pd.DataFrame:
+    """Index a snapshot by its key columns, keeping the last row of duplicate keys"""
+    missing = [column for column in key_columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Vessel snapshot is missing key columns: {missing}")
+    keyed = df.set_index(key_columns, drop=False)
+    return keyed[~keyed.index.duplicated(keep='last')]
+
+
+def diff_vessel_snapshots(previous: Optional[pd.DataFrame], current: pd.DataFrame,
+                          key_columns: List[str] = VESSEL_KEY_COLUMNS) -> VesselDelta:
+    """Compute the inserted, updated and removed rows between two snapshots
+
+    Args:
+        previous: Earlier snapshot (None or empty for the first one)
+        current: New snapshot
+        key_columns: Columns identifying a vessel row
+
+    Returns:
+        VesselDelta with the changed rows in the column layout of the snapshots
+    """
+    if previous is None or previous.empty:
+        empty = current.iloc[0:0]
+        return VesselDelta(inserted=current.reset_index(drop=True), updated=empty, removed=empty)
+    if current.empty:
+        empty = previous.iloc[0:0]
+        return VesselDelta(inserted=empty, updated=empty, removed=previous.reset_index(drop=True))
+
+    old = _keyed(previous, key_columns)
+    new = _keyed(current, key_columns)
+
+    inserted = new[~new.index.isin(old.index)]
+    removed = old[~old.index.isin(new.index)]
+
+    common = new.index[new.index.isin(old.index)]
+    compare_columns = [column for column in new.columns
+                       if column in old.columns and column not in key_columns]
+    if len(common) and compare_columns:
+        # Categorical columns of two snapshots may have different categories; compare values
+        new_values = new.loc[common, compare_columns].astype(object)
+        old_values = old.loc[common, compare_columns].astype(object)
+        changed = (new_values != old_values) & ~(new_values.isna() & old_values.isna())
+        updated = new.loc[common][changed.any(axis=1).to_numpy()]
+    else:
+        updated = new.iloc[0:0]
+
+    return VesselDelta(
+        inserted=inserted.reset_index(drop=True),
+        updated=updated.reset_index(drop=True),
+        removed=removed.reset_index(drop=True)
+    )
+
+
+class VesselDiffEngine:
+    """Tracks the latest vessel snapshot and returns the delta of every new one"""
+
+    def __init__(self, key_columns: List[str] = VESSEL_KEY_COLUMNS):
+        self.key_columns = list(key_columns)
+        self.snapshot: Optional[pd.DataFrame] = None
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.stats = {'snapshots': 0, 'inserted': 0, 'updated': 0, 'removed': 0}
+
+    def update(self, current: pd.DataFrame) -> VesselDelta:
+        """Diff a new snapshot against the previous one and remember it
+
+        Args:
+            current: Combined vessel frame of the latest refresh
+
+        Returns:
+            VesselDelta numbered with an increasing sequence
+        """
+        with self.lock:
+            delta = diff_vessel_snapshots(self.snapshot, current, self.key_columns)
+            self.snapshot = current
+            self.sequence += 1
+            delta.sequence = self.sequence
+            self.stats['snapshots'] += 1
+            self.stats['inserted'] += len(delta.inserted)
+            self.stats['updated'] += len(delta.updated)
+            self.stats['removed'] += len(delta.removed)
+        logger.debug(f"Vessel snapshot {delta.sequence}: {delta.summary()}")
+        return delta
+
+    def reset(self):
+        """Forget the previous snapshot so the next one is reported as all inserted"""
+        with self.lock:
+            self.snapshot = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            stats = dict(self.stats)
+            stats['sequence'] = self.sequence
+            stats['tracked_vessels'] = len(self.snapshot) if self.snapshot is not None else 0
+        return stats
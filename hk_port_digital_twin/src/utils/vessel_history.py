@@ -0,0 +1,297 @@
+# Comments for context:
+# This module keeps a local history of every vessel movement seen in the
+# Marine Department feeds. The feeds only cover the last 36 hours (or the next
+# few days for expected movements) and VesselDataFetcher merely copies the
+# replaced XML files into vessel_data/backups, so questions like "all calls of
+# this vessel this year" or "arrivals per day over six months" meant re-parsing
+# every backup, if the backups were still there at all.
+#
+# Approach: an append-only SQLite table with one row per vessel movement,
+# deduplicated by the same (call_sign, source_file, timestamp) key as the
+# vessel diff engine, and indexed on call sign, timestamp and location. The
+# store ingests whole feed files, each identified by its SHA-256 hash and
+# ingested once, whether it arrives through a live refresh or a backfill of the
+# backups (`python -m src.utils.vessel_history --backfill`). A movement's
+# times_seen is the number of distinct feed files that listed it and last_seen
+# the observation time of the latest one. Rows without a movement time cannot
+# be keyed and are rejected; ingest reports how many per feed.
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default location of the history database
+DEFAULT_VESSEL_HISTORY_DB = (Path(__file__).parent.parent.parent / "data" / "history" /
+                             "vessel_history.sqlite3").resolve()
+
+# Vessel frame columns stored besides the key; missing ones are stored as NULL
+VESSEL_HISTORY_COLUMNS = ['vessel_name', 'ship_type', 'ship_category', 'agent_name', 'current_location',
+                          'location_type', 'status', 'remark', 'time_type']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vessel_movements (
+    id INTEGER PRIMARY KEY,
+    call_sign TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    vessel_name TEXT,
+    ship_type TEXT,
+    ship_category TEXT,
+    agent_name TEXT,
+    current_location TEXT,
+    location_type TEXT,
+    status TEXT,
+    remark TEXT,
+    time_type TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    times_seen INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (call_sign, source_file, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_movements_call_sign ON vessel_movements (call_sign, timestamp);
+CREATE INDEX IF NOT EXISTS idx_movements_timestamp ON vessel_movements (timestamp);
+CREATE INDEX IF NOT EXISTS idx_movements_source_timestamp ON vessel_movements (source_file, timestamp);
+CREATE INDEX IF NOT EXISTS idx_movements_location ON vessel_movements (current_location, timestamp);
+CREATE TABLE IF NOT EXISTS ingested_snapshots (
+    id INTEGER PRIMARY KEY,
+    observed_at TEXT NOT NULL,
+    source TEXT,
+    sha256 TEXT UNIQUE,
+    rows INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    rejected INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Timestamps are stored as sortable text
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _timestamp_text(value) -> str:
+    if isinstance(value, str):
+        value = pd.Timestamp(value)
+    return value.strftime(_TIMESTAMP_FORMAT)
+
+
+class VesselHistoryStore:
+    """Append-only, deduplicated SQLite history of vessel movements"""
+
+    def __init__(self, path: Union[str, Path] = None):
+        self.path = Path(path) if path is not None else DEFAULT_VESSEL_HISTORY_DB
+        self.connection: Optional[sqlite3.Connection] = None
+        self.lock = threading.RLock()
+        self.stats = {'snapshots': 0, 'rows_ingested': 0, 'inserted': 0, 'rejected': 0, 'queries': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(_SCHEMA)
+            self.connection = connection
+        return self.connection
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def has_snapshot(self, sha256: str) -> bool:
+        """Whether a snapshot file with this hash was ingested already"""
+        with self.lock:
+            row = self._connect().execute(
+                'SELECT 1 FROM ingested_snapshots WHERE sha256 = ?', (sha256,)).fetchone()
+        return row is not None
+
+    def ingest(self, vessel_df: pd.DataFrame, observed_at: Optional[datetime] = None,
+               source: Optional[str] = None, sha256: Optional[str] = None) -> Dict[str, int]:
+        """Add the movements of one vessel feed snapshot
+
+        New movements are appended; movements already stored get their latest
+        attributes and last_seen time refreshed and times_seen incremented.
+        Rows without a call sign or movement time are rejected.
+
+        Args:
+            vessel_df: Vessel frame with call_sign, source_file and timestamp columns
+            observed_at: When the snapshot was taken (defaults to now)
+            source: Description of the snapshot, e.g. a backup file name
+            sha256: Hash of the snapshot file; a file is only ingested once
+
+        Returns:
+            Dict with the number of rows ingested, of new movements and of rejected rows
+        """
+        if vessel_df is None or vessel_df.empty:
+            return {'rows': 0, 'inserted': 0, 'rejected': 0}
+        missing = [column for column in ('call_sign', 'source_file', 'timestamp') if column not in vessel_df.columns]
+        if missing:
+            raise ValueError(f"Vessel snapshot is missing key columns: {missing}")
+
+        seen = _timestamp_text(observed_at or datetime.now())
+        timestamps = pd.to_datetime(vessel_df['timestamp'], errors='coerce')
+        keyed = vessel_df['call_sign'].notna() & timestamps.notna()
+        rejected = vessel_df.loc[~keyed, 'source_file'].astype(str).value_counts().to_dict()
+        rejected_count = int(sum(rejected.values()))
+        if rejected:
+            logger.warning(f"Vessel history: rejected rows without a call sign or movement time: {rejected}")
+        frame = vessel_df[keyed]
+        columns = {
+            'call_sign': frame['call_sign'].astype(str).str.strip(),
+            'source_file': frame['source_file'].astype(str),
+            'timestamp': timestamps[keyed].dt.strftime(_TIMESTAMP_FORMAT)
+        }
+        for column in VESSEL_HISTORY_COLUMNS:
+            columns[column] = frame[column].astype(object) if column in frame.columns else None
+        rows = pd.DataFrame(columns, index=frame.index).astype(object)
+        rows = rows.where(rows.notna(), None)
+        rows = rows.drop_duplicates(['call_sign', 'source_file', 'timestamp'], keep='last')
+        records = [tuple(record) + (seen, seen) for record in rows.itertuples(index=False, name=None)]
+
+        names = list(rows.columns)
+        insert_sql = (f"INSERT OR IGNORE INTO vessel_movements ({', '.join(names)}, first_seen, last_seen) "
+                      f"VALUES ({', '.join('?' * (len(names) + 2))})")
+        # Attributes missing from a snapshot keep their stored values
+        assignments = ', '.join(f'{name} = COALESCE(?, {name})' for name in VESSEL_HISTORY_COLUMNS)
+        update_sql = (f"UPDATE vessel_movements SET {assignments}, last_seen = ?, times_seen = times_seen + 1 "
+                      "WHERE call_sign = ? AND source_file = ? AND timestamp = ?")
+        key_count = 3
+        updates = [record[key_count:key_count + len(VESSEL_HISTORY_COLUMNS)] + (seen,) + record[:key_count]
+                   for record in records]
+
+        with self.lock:
+            connection = self._connect()
+            with connection:
+                # Refresh movements seen before, then append the new ones
+                connection.executemany(update_sql, updates)
+                inserted = connection.executemany(insert_sql, records).rowcount
+                connection.execute(
+                    'INSERT OR IGNORE INTO ingested_snapshots (observed_at, source, sha256, rows, inserted, rejected) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', (seen, source, sha256, len(records), inserted, rejected_count))
+            self.stats['snapshots'] += 1
+            self.stats['rows_ingested'] += len(records)
+            self.stats['inserted'] += inserted
+            self.stats['rejected'] += rejected_count
+
+        logger.debug(f"Vessel history: ingested {len(records)} rows, {inserted} new movements")
+        return {'rows': len(records), 'inserted': inserted, 'rejected': rejected_count}
+
+    def _read(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with self.lock:
+            self.stats['queries'] += 1
+            return pd.read_sql_query(sql, self._connect(), params=params)
+
+    @staticmethod
+    def _range_clause(start, end, conditions: List[str], params: List):
+        if start is not None:
+            conditions.append('timestamp >= ?')
+            params.append(_timestamp_text(start))
+        if end is not None:
+            conditions.append('timestamp < ?')
+            params.append(_timestamp_text(end))
+
+    def query(self, start=None, end=None, call_sign: Optional[str] = None, source_file: Optional[str] = None,
+              location: Optional[str] = None) -> pd.DataFrame:
+        """Movements in a time range, optionally for one vessel, feed or location
+
+        Args:
+            start: Inclusive lower bound of the movement timestamp
+            end: Exclusive upper bound of the movement timestamp
+            call_sign: Only movements of this vessel
+            source_file: Only movements from this feed, e.g. 'Arrived_in_last_36_hours.xml'
+            location: Only movements at this location
+
+        Returns:
+            DataFrame of movements ordered by timestamp, with parsed timestamps
+        """
+        conditions, params = [], []
+        self._range_clause(start, end, conditions, params)
+        for column, value in (('call_sign', call_sign), ('source_file', source_file),
+                              ('current_location', location)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+        df = self._read(f"SELECT * FROM vessel_movements {where}ORDER BY timestamp", tuple(params))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    def vessel_calls(self, call_sign: str, start=None, end=None) -> pd.DataFrame:
+        """All recorded movements of one vessel in a time range"""
+        return self.query(start, end, call_sign=call_sign)
+
+    def daily_counts(self, source_file: str = 'Arrived_in_last_36_hours.xml', start=None, end=None,
+                     by: Optional[str] = None) -> pd.DataFrame:
+        """Number of movements per day from one feed, optionally split by a column
+
+        Args:
+            source_file: Feed whose movements are counted
+            start: Inclusive lower bound of the movement timestamp
+            end: Exclusive upper bound of the movement timestamp
+            by: Optional column to group by as well, e.g. 'ship_category'
+
+        Returns:
+            DataFrame with date, the optional group column and count
+        """
+        if by is not None and by not in VESSEL_HISTORY_COLUMNS:
+            raise ValueError(f"Cannot group vessel history by {by}")
+        conditions, params = ['source_file = ?'], [source_file]
+        self._range_clause(start, end, conditions, params)
+        group = ['substr(timestamp, 1, 10)'] + ([by] if by else [])
+        select = 'substr(timestamp, 1, 10) AS date' + (f', {by}' if by else '')
+        df = self._read(f"SELECT {select}, COUNT(*) AS count FROM vessel_movements "
+                        f"WHERE {' AND '.join(conditions)} GROUP BY {', '.join(group)} ORDER BY {', '.join(group)}",
+                        tuple(params))
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def get_stats(self) -> Dict[str, int]:
+        """Ingest and query counters plus the size of the store"""
+        with self.lock:
+            stats = dict(self.stats)
+            connection = self._connect()
+            stats['movements'] = connection.execute('SELECT COUNT(*) FROM vessel_movements').fetchone()[0]
+            stats['vessels'] = connection.execute(
+                'SELECT COUNT(DISTINCT call_sign) FROM vessel_movements').fetchone()[0]
+            stats['ingested_snapshots'] = connection.execute(
+                'SELECT COUNT(*) FROM ingested_snapshots').fetchone()[0]
+        stats['path'] = str(self.path)
+        return stats
+
+
+# Global instance
+vessel_history = VesselHistoryStore()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Backfill the vessel history from the feed backups, or print its statistics"""
+    parser = argparse.ArgumentParser(description="Maintain the local vessel movement history")
+    parser.add_argument('--backfill', nargs='?', const='', metavar='BACKUP_DIR',
+                        help="ingest the current feeds and the XML backups (default backup directory if omitted)")
+    args = parser.parse_args(argv)
+
+    if args.backfill is not None:
+        sys.path.append(str(Path(__file__).parent.parent))
+        from utils.data_loader import backfill_vessel_history
+
+        result = backfill_vessel_history(Path(args.backfill) if args.backfill else None)
+        print(f"Ingested {result['files']} files ({result['skipped']} already ingested), "
+              f"{result['inserted']} new movements")
+
+    stats = vessel_history.get_stats()
+    print(f"{stats['movements']} movements of {stats['vessels']} vessels in {stats['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,7 +20,7 @@ try:
     )
     from src.ai.decision_support import (
         Recommendation, DecisionContext, DecisionSupportEngine,
-        RecommendationType, Priority
+        RecommendationType, Priority, contexts_to_frame
     )
 except ImportError:
     import sys
@@ -37,7 +37,7 @@ except ImportError:
     )
     from src.ai.decision_support import (
         Recommendation, DecisionContext, DecisionSupportEngine,
-        RecommendationType, Priority
+        RecommendationType, Priority, contexts_to_frame
     )
 
 class TestOptimization:
@@ -293,6 +293,132 @@ class TestPredictiveModels:
         assert prediction.probability > 0
         assert 'base_rate' in prediction.factors
     
+    def test_lookup_tables_precomputed_at_training(self):
+        """Test that hourly, daily and monthly factors are dense arrays after training"""
+        predictor = ShipArrivalPredictor()
+        sample_data = pd.DataFrame({
+            'arrival_time': pd.date_range(start='2024-01-01', periods=60, freq='3h'),
+            'ship_type': ['container', 'bulk', 'tanker'] * 20,
+            'size': np.random.uniform(1000, 5000, 60)
+        })
+        
+        predictor.load_historical_data(sample_data)
+        predictor.train_arrival_model()
+        
+        assert predictor.hourly_factors.shape == (24,)
+        assert predictor.daily_factors.shape == (7,)
+        assert predictor.monthly_factors.shape == (12,)
+        hourly = predictor.seasonal_patterns['hourly']
+        assert predictor.hourly_factors[3] == pytest.approx(hourly[3] / np.mean(list(hourly.values())))
+        # Hours without arrivals count as a single arrival
+        assert predictor.hourly_factors[1] == pytest.approx(1 / np.mean(list(hourly.values())))
+        assert predictor.overall_arrivals_per_day == pytest.approx(60 / predictor.history_days)
+    
+    def test_predict_arrivals_batch_matches_single_predictions(self):
+        """Test vectorized arrival predictions against predict_next_arrival"""
+        predictor = ShipArrivalPredictor()
+        sample_data = pd.DataFrame({
+            'arrival_time': pd.date_range(start='2024-01-01', periods=200, freq='5h'),
+            'ship_type': np.random.choice(['container', 'bulk'], 200),
+            'size': np.random.uniform(1000, 5000, 200)
+        })
+        predictor.load_historical_data(sample_data)
+        predictor.train_arrival_model()
+        
+        query_times = pd.date_range(start='2024-02-01', periods=48, freq='h')
+        ship_types = ['container', 'bulk', 'tanker', None] * 12
+        predictions = predictor.predict_arrivals(query_times, ship_types, rng=np.random.default_rng(0))
+        
+        assert len(predictions) == 48
+        assert (predictions['predicted_time'] > predictions['query_time']).all()
+        assert (predictions['lower_bound'] <= predictions['upper_bound']).all()
+        assert predictions['ship_type'].iloc[3] == 'container'
+        for i in (0, 1, 2, 3, 47):
+            single = predictor.predict_next_arrival(ship_types[i], query_times[i].to_pydatetime())
+            for factor in ('base_rate', 'hourly_factor', 'daily_factor', 'monthly_factor', 'adjustment_factor'):
+                assert predictions[factor].iloc[i] == pytest.approx(single.factors[factor])
+    
+    def test_predict_arrivals_untrained(self):
+        """Test vectorized arrival predictions without training"""
+        predictor = ShipArrivalPredictor()
+        
+        predictions = predictor.predict_arrivals(pd.date_range('2024-01-01', periods=5, freq='h'), 'bulk')
+        
+        assert len(predictions) == 5
+        assert (predictions['ship_type'] == 'bulk').all()
+        assert (predictions['probability'] == 0.5).all()
+    
+    def test_arrival_predictor_online_update_matches_full_training(self):
+        """Test that streaming updates reproduce the patterns of a full retrain"""
+        rng = np.random.default_rng(3)
+        sample_data = pd.DataFrame({
+            'arrival_time': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.uniform(0, 24 * 90, 300)), unit='h'),
+            'ship_type': rng.choice(['container', 'bulk', 'tanker'], 300),
+            'size': rng.uniform(1000, 8000, 300),
+            'call_sign': [f'CALL{i:03d}' for i in range(300)]
+        })
+        full = ShipArrivalPredictor()
+        full.load_historical_data(sample_data)
+        full.train_arrival_model()
+
+        online = ShipArrivalPredictor()
+        online.load_historical_data(sample_data.iloc[:100])
+        online.train_arrival_model()
+        for chunk in np.array_split(np.arange(100, 300), 4):
+            rows = sample_data.iloc[chunk]
+            assert online.update(rows, key_columns=['call_sign', 'arrival_time']) == len(rows)
+            # Repeated snapshots are skipped
+            assert online.update(rows, key_columns=['call_sign', 'arrival_time']) == 0
+
+        assert online.seasonal_patterns == full.seasonal_patterns
+        assert online.training_records == full.training_records
+        assert online.history_days == full.history_days
+        np.testing.assert_allclose(online.hourly_factors, full.hourly_factors)
+        for ship_type, pattern in full.ship_type_patterns.items():
+            assert online.ship_type_patterns[ship_type]['preferred_hours'] == pattern['preferred_hours']
+            assert online.ship_type_patterns[ship_type]['avg_arrivals_per_day'] == pytest.approx(pattern['avg_arrivals_per_day'])
+            assert online.ship_type_patterns[ship_type]['avg_size'] == pytest.approx(pattern['avg_size'])
+
+    def test_arrival_predictor_update_trains_empty_model(self):
+        """Test that update() alone trains a model from the live feed"""
+        predictor = ShipArrivalPredictor()
+
+        folded = predictor.update(pd.DataFrame({
+            'arrival_time': ['2024-01-01 08:00', None, '2024-01-03 09:00'],
+            'ship_type': ['container', 'container', 'tanker']
+        }))
+
+        assert folded == 2
+        assert predictor.is_trained
+        assert predictor.history_days == 2
+        assert predictor.ship_type_patterns['tanker']['preferred_hours'] == 9
+        assert predictor.update(pd.DataFrame({'ship_type': ['bulk']})) == 0
+
+    def test_processing_estimator_online_update(self):
+        """Test Welford updates of processing time statistics"""
+        rng = np.random.default_rng(4)
+        records = pd.DataFrame({
+            'ship_type': rng.choice(['container', 'bulk'], 200),
+            'processing_time': rng.gamma(3.0, 2.0, 200)
+        })
+        full = ProcessingTimeEstimator()
+        full.load_processing_data(records.copy())
+
+        online = ProcessingTimeEstimator()
+        online.load_processing_data(records.iloc[:50].copy())
+        for chunk in np.array_split(np.arange(50, 200), 3):
+            online.update(records.iloc[chunk])
+
+        for ship_type, stats in full.historical_processing_times.items():
+            assert online.historical_processing_times[ship_type]['count'] == stats['count']
+            assert online.historical_processing_times[ship_type]['mean'] == pytest.approx(stats['mean'])
+            assert online.historical_processing_times[ship_type]['std'] == pytest.approx(stats['std'])
+
+        # A new ship type starts from its first records
+        assert online.update(pd.DataFrame({'ship_type': ['tanker'], 'processing_time': [9.0]})) == 1
+        assert online.historical_processing_times['tanker']['median'] == 9.0
+        assert np.isnan(online.historical_processing_times['tanker']['std'])
+
     def test_processing_time_estimator_initialization(self):
         """Test ProcessingTimeEstimator initialization"""
         estimator = ProcessingTimeEstimator()
@@ -356,6 +482,107 @@ class TestPredictiveModels:
             assert 0 <= forecast.confidence <= 1
             assert forecast.trend in ['increasing', 'decreasing', 'stable']
 
+    def test_hourly_baselines_precomputed_from_history(self):
+        """Test that load_queue_history builds the hourly arrival baselines"""
+        forecaster = QueueLengthForecaster()
+        history = pd.DataFrame({
+            'timestamp': pd.date_range(start='2024-01-01', periods=48, freq='h'),
+            'arrivals': np.tile(np.arange(24, dtype=float), 2)
+        })
+        history = history[history['timestamp'].dt.hour != 5]
+
+        forecaster.load_queue_history(history)
+
+        expected_rates = np.arange(24, dtype=float)
+        expected_rates[5] = QueueLengthForecaster.DEFAULT_ARRIVAL_RATE
+        np.testing.assert_allclose(forecaster.hourly_base_rates, expected_rates)
+        assert forecaster.expected_arrivals_table.shape == (7, 24)
+        # Tuesday 09:00: base rate 9, hour factor 1.5, day factor 1.3
+        assert forecaster._predict_hourly_arrivals(datetime(2024, 1, 2, 9)) == pytest.approx(9 * 1.5 * 1.3)
+        assert forecaster.data_confidence == pytest.approx(46 / 100)
+
+    def test_forecast_queue_length_matches_hourly_recursion(self):
+        """Test the cumulative array forecast against the hour-by-hour queue update"""
+        forecaster = QueueLengthForecaster()
+        forecaster.load_queue_history(pd.DataFrame({
+            'timestamp': pd.date_range(start='2024-01-01', periods=200, freq='h'),
+            'arrivals': np.random.default_rng(0).poisson(1.0, 200)
+        }))
+        forecaster.update_current_queue([{'ship_id': f'SHIP{i:03d}'} for i in range(4)])
+        start = datetime(2024, 3, 8, 17, 30)
+
+        forecasts = forecaster.forecast_queue_length(24 * 8, start)
+
+        assert len(forecasts) == 24 * 8
+        queue_length = 4.0
+        for hour, forecast in enumerate(forecasts):
+            forecast_time = start + timedelta(hours=hour)
+            queue_length = max(0, queue_length + forecaster._predict_hourly_arrivals(forecast_time)
+                               - forecaster._predict_hourly_departures(forecast_time))
+            assert forecast.timestamp == forecast_time
+            assert forecast.predicted_queue_length == int(queue_length)
+            assert forecast.predicted_waiting_time == pytest.approx(
+                forecaster._estimate_waiting_time(queue_length, forecast_time))
+        assert forecasts[0].trend == 'stable'
+        assert forecasts[0].confidence >= forecasts[-1].confidence
+
+    def test_forecast_queue_batch_many_start_times(self):
+        """Test forecasting from many start times in one call"""
+        forecaster = QueueLengthForecaster()
+        starts = pd.date_range(start='2024-01-01', periods=10, freq='7h')
+        initial_queues = np.arange(10)
+
+        batch = forecaster.forecast_queue_batch(starts, hours_ahead=168, initial_queue_lengths=initial_queues)
+
+        assert len(batch) == 10 * 168
+        assert list(batch['step'].iloc[:3]) == [0, 1, 2]
+        assert (batch['predicted_queue_length'] >= 0).all()
+        assert set(batch['trend'].cat.categories) == {'increasing', 'decreasing', 'stable'}
+
+        for path_index in (0, 7):
+            forecaster.update_current_queue([{}] * int(initial_queues[path_index]))
+            single = forecaster.forecast_queue_length(168, starts[path_index].to_pydatetime())
+            path = batch[batch['start_time'] == starts[path_index]]
+            np.testing.assert_array_equal(path['predicted_queue_length'].astype(int).to_numpy(),
+                                          [forecast.predicted_queue_length for forecast in single])
+            np.testing.assert_allclose(path['predicted_waiting_time'].to_numpy(),
+                                       [forecast.predicted_waiting_time for forecast in single])
+            assert list(path['trend'].astype(str)) == [forecast.trend for forecast in single]
+
+    def test_forecast_queue_bands(self):
+        """Test Monte Carlo percentile bands for queue length and waiting time"""
+        forecaster = QueueLengthForecaster()
+        forecaster.update_current_queue([{}] * 5)
+        start = datetime(2024, 1, 2, 6)
+
+        bands = forecaster.forecast_queue_bands(72, start, n_paths=2000, rng=np.random.default_rng(0))
+
+        assert len(bands) == 72
+        assert bands['timestamp'].iloc[0] == pd.Timestamp(start)
+        for prefix in ('queue', 'waiting'):
+            assert (bands[f'{prefix}_p10'] >= 0).all()
+            assert (bands[f'{prefix}_p10'] <= bands[f'{prefix}_p50']).all()
+            assert (bands[f'{prefix}_p50'] <= bands[f'{prefix}_p90']).all()
+        # Bands widen as uncertainty accumulates over the horizon
+        spread = bands['queue_p90'] - bands['queue_p10']
+        assert spread.iloc[-1] > spread.iloc[0]
+
+        repeat = forecaster.forecast_queue_bands(72, start, n_paths=2000, rng=np.random.default_rng(0))
+        pd.testing.assert_frame_equal(bands, repeat)
+
+    def test_forecast_queue_bands_mean_follows_expected_rates(self):
+        """Test that the first-hour sample mean matches the expected net change"""
+        forecaster = QueueLengthForecaster()
+        forecaster.update_current_queue([{}] * 50)
+        start = datetime(2024, 1, 2, 9)
+
+        bands = forecaster.forecast_queue_bands(1, start, n_paths=20000, percentiles=(5, 95),
+                                                rng=np.random.default_rng(1))
+
+        expected = 50 + forecaster._predict_hourly_arrivals(start) - forecaster._predict_hourly_departures(start)
+        assert bands['queue_mean'].iloc[0] == pytest.approx(expected, abs=0.05)
+        assert {'queue_p5', 'queue_p95', 'waiting_p5', 'waiting_p95'} <= set(bands.columns)
+
 class TestDecisionSupport:
     """Test cases for decision_support.py"""
     
@@ -532,6 +759,73 @@ class TestDecisionSupport:
         assert summary['by_priority']['high'] == 1
         assert summary['by_priority']['medium'] == 1
 
+    def test_analyze_timeline_matches_analyze_situation(self):
+        """Test that batch analysis reproduces the per-context recommendations"""
+        engine = DecisionSupportEngine()
+        base_time = datetime(2024, 1, 1)
+        contexts = [
+            DecisionContext(
+                current_time=base_time + timedelta(hours=hour),
+                port_status={},
+                active_ships=[{'id': f'SHIP{i}', 'waiting_time': hour * 1.5 + i} for i in range(hour * 2)],
+                available_berths=[{'id': 'BERTH001'}],
+                resource_utilization={'berths': 0.5 + hour * 0.1, 'cranes': 0.95, 'trucks': 0.2},
+                weather_conditions={'impact_score': hour * 0.2},
+                operational_constraints=[],
+                performance_metrics={'berth_utilization': 0.7, 'average_waiting_time': hour * 1.0}
+            )
+            for hour in range(6)
+        ]
+        
+        table = engine.analyze_timeline(contexts_to_frame(contexts))
+        
+        assert isinstance(table, pd.DataFrame)
+        for index, context in enumerate(contexts):
+            expected = [(r.type.value, r.priority.value, r.title) for r in engine.analyze_situation(context)]
+            rows = table[table['context_index'] == index]
+            actual = list(zip(rows['type'].astype(str), rows['priority'].astype(str), rows['title'].astype(str)))
+            assert actual == expected
+    
+    def test_analyze_timeline_key_columns_and_missing_data(self):
+        """Test batch analysis with replication keys and sparse columns"""
+        engine = DecisionSupportEngine()
+        contexts = pd.DataFrame({
+            'current_time': pd.date_range('2024-01-01', periods=4, freq='h'),
+            'replication': [0, 0, 1, 1],
+            'queue_length': [0, 8, 2, 3],
+            'max_waiting_time': [0.0, 9.0, 1.0, np.nan]
+        })
+        
+        table = engine.analyze_timeline(contexts, key_columns=['replication'], max_per_context=3)
+        
+        assert table.groupby('context_index').size().max() <= 3
+        critical = table[table['priority'] == 'critical']
+        assert list(critical['context_index']) == [1]
+        assert list(critical['replication']) == [0]
+        assert isinstance(table['rule'].dtype, pd.CategoricalDtype)
+        assert len(engine.timeline_history) == 1
+    
+    def test_active_recommendations_are_bounded(self):
+        """Test that repeated analysis does not grow the active list without bound"""
+        engine = DecisionSupportEngine()
+        engine.max_active_recommendations = 5
+        context = DecisionContext(
+            current_time=datetime.now(),
+            port_status={},
+            active_ships=[],
+            available_berths=[],
+            resource_utilization={},
+            weather_conditions={},
+            operational_constraints=[],
+            performance_metrics={}
+        )
+        
+        for _ in range(4):
+            engine.analyze_situation(context)
+        
+        assert isinstance(engine.active_recommendations, list)
+        assert len(engine.active_recommendations) == 5
+
 class TestIntegration:
     """Integration tests for AI components working together"""
     
@@ -0,0 +1,117 @@
+# Test suite for the memoized analysis graph
+# Tests for analysis_graph.py and the throughput/cargo analyses data_loader builds on it
+
+import os
+from unittest.mock import patch
+
+import pytest
+import pandas as pd
+import numpy as np
+
+try:
+    from src.utils.analysis_graph import AnalysisGraph, data_fingerprint
+    from src.utils import data_loader
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.analysis_graph import AnalysisGraph, data_fingerprint
+    from src.utils import data_loader
+
+
+def monthly_throughput(months=36, offset=0.0):
+    dates = pd.date_range('2021-01-01', periods=months, freq='MS')
+    values = 1_500_000 + np.arange(months) * 1000.0 + offset
+    return pd.DataFrame({
+        'total_teus': values,
+        'seaborne_teus': values * 0.7,
+        'river_teus': values * 0.3
+    }, index=dates)
+
+
+class TestAnalysisGraph:
+    """Test memoization and invalidation of graph nodes"""
+
+    def test_nodes_recompute_only_when_source_data_changes(self):
+        source = {'data': pd.DataFrame({'value': [1.0, 2.0, 3.0]})}
+        calls = []
+        graph = AnalysisGraph()
+        graph.add_node('raw', lambda: source['data'].copy(), source=True)
+        graph.add_node('total', lambda df: calls.append('total') or float(df['value'].sum()), inputs=['raw'])
+        graph.add_node('report', lambda df, total: calls.append('report') or {'rows': len(df), 'total': total},
+                       inputs=['raw', 'total'])
+
+        assert graph.get('report') == {'rows': 3, 'total': 6.0}
+        assert graph.get('report') == {'rows': 3, 'total': 6.0}
+        assert calls == ['total', 'report']
+
+        source['data'] = pd.DataFrame({'value': [1.0, 2.0, 4.0]})
+        assert graph.get('report') == {'rows': 3, 'total': 7.0}
+        assert calls == ['total', 'report', 'total', 'report']
+
+        graph.invalidate('report')
+        graph.get('report')
+        assert calls[-1] == 'report' and calls.count('total') == 2
+
+        stats = graph.get_stats()
+        assert stats['cached_nodes'] == ['report', 'total']
+        assert stats['hits'] == 3
+
+    def test_empty_results_are_not_memoized(self):
+        calls = []
+        graph = AnalysisGraph()
+        graph.add_node('raw', lambda: pd.DataFrame(), source=True)
+        graph.add_node('analysis', lambda df: calls.append(1) or {}, inputs=['raw'])
+
+        graph.get('analysis')
+        graph.get('analysis')
+        assert len(calls) == 2
+
+    def test_invalid_nodes_are_rejected(self):
+        graph = AnalysisGraph()
+        with pytest.raises(ValueError):
+            graph.add_node('analysis', lambda df: df, inputs=['missing'])
+        graph.add_node('raw', lambda: 1, source=True)
+        with pytest.raises(ValueError):
+            graph.add_node('other', lambda: 1, inputs=['raw'], source=True)
+
+    def test_fingerprint_tracks_content_not_identity(self):
+        df = monthly_throughput()
+        assert data_fingerprint({'a': df}) == data_fingerprint({'a': df.copy()})
+        assert data_fingerprint(df) != data_fingerprint(monthly_throughput(offset=1.0))
+        assert data_fingerprint(df) != data_fingerprint(df.rename(columns={'river_teus': 'other'}))
+
+
+class TestDataLoaderAnalyses:
+    """Test the data loader analyses served from the graph"""
+
+    def test_throughput_trends_follow_the_loaded_data(self):
+        with patch.object(data_loader, '_analyze_year_over_year_changes',
+                          wraps=data_loader._analyze_year_over_year_changes) as mock_yoy, \
+                patch.object(data_loader, 'load_container_throughput', return_value=monthly_throughput()):
+            first = data_loader.get_throughput_trends()
+            second = data_loader.get_throughput_trends()
+            assert mock_yoy.call_count == 1
+            assert first['basic_statistics'] == second['basic_statistics']
+
+            # Callers cannot modify the memoized analysis
+            second['basic_statistics'] = None
+            assert data_loader.get_throughput_trends()['basic_statistics'] is not None
+
+            # Parameters derived from the trends reuse them
+            data_loader.extract_historical_simulation_parameters()
+            assert mock_yoy.call_count == 1
+
+        with patch.object(data_loader, 'load_container_throughput', return_value=monthly_throughput(offset=5e5)):
+            changed = data_loader.get_throughput_trends()
+        assert changed['basic_statistics']['mean_monthly'] == pytest.approx(
+            first['basic_statistics']['mean_monthly'] + 5e5)
+
+    def test_cargo_time_series_matches_direct_computation(self):
+        expected = data_loader.get_time_series_data(data_loader.load_focused_cargo_statistics())
+        time_series = data_loader.get_cargo_time_series()
+
+        assert set(time_series) == set(expected)
+        for category, df in expected.items():
+            pd.testing.assert_frame_equal(time_series[category], df)
+        analysis = data_loader.get_enhanced_cargo_analysis()
+        pd.testing.assert_frame_equal(analysis['time_series_data']['shipment_types'], expected['shipment_types'])
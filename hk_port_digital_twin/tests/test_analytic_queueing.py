@@ -0,0 +1,133 @@
+"""Tests for the analytic berth queueing model
+
+Checks the Erlang-C / Allen-Cunneen formulas against known M/M/c results and
+the service-time model against ContainerHandler's processing time rule.
+"""
+
+import math
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.scenarios.analytic_queueing import (
+    PortQueueModel, erlang_c, multi_server_metrics, container_count_distribution,
+    service_time_moments
+)
+from src.core.container_handler import ContainerHandler
+from src.ai.predictive_models import QueueLengthForecaster
+
+
+class TestQueueFormulas:
+    """Test the closed-form queue metrics"""
+
+    def test_erlang_c_known_values(self):
+        # A single server waits with probability equal to its utilization
+        assert erlang_c(1, 0.6) == pytest.approx(0.6)
+        assert erlang_c(2, 1.0) == pytest.approx(1 / 3)
+        assert erlang_c(3, 0.0) == 0.0
+        assert erlang_c(2, 2.5) == 1.0
+
+    def test_mm1_matches_textbook_result(self):
+        metrics = multi_server_metrics(arrival_rate=0.5, service_rate=1.0, servers=1)
+
+        assert metrics.stable
+        assert metrics.utilization == pytest.approx(0.5)
+        assert metrics.expected_waiting_time == pytest.approx(0.5 / (1.0 - 0.5))
+        assert metrics.expected_queue_length == pytest.approx(0.5 ** 2 / (1 - 0.5))
+        assert metrics.expected_time_in_system == pytest.approx(1.0 / (1.0 - 0.5))
+
+    def test_allen_cunneen_scales_by_variability(self):
+        exponential = multi_server_metrics(2.0, 1.0, 3)
+        deterministic = multi_server_metrics(2.0, 1.0, 3, service_time_scv=0.0)
+
+        assert exponential.expected_waiting_time == pytest.approx(4 / 9)
+        assert deterministic.expected_waiting_time == pytest.approx(exponential.expected_waiting_time / 2)
+
+    def test_unstable_queue(self):
+        metrics = multi_server_metrics(3.0, 1.0, 2)
+        assert not metrics.stable
+        assert math.isinf(metrics.expected_waiting_time)
+        assert not multi_server_metrics(1.0, 1.0, 0).stable
+
+
+class TestServiceTimeModel:
+    """Test service-time moments derived from the container handling model"""
+
+    def test_container_counts_form_a_distribution(self):
+        for ship_type in ['container', 'bulk', 'mixed']:
+            counts, probabilities = container_count_distribution(ship_type)
+            assert probabilities.sum() == pytest.approx(1.0)
+            assert np.all(np.diff(counts) > 0)
+
+        with pytest.raises(ValueError):
+            container_count_distribution('tanker')
+
+    def test_moments_match_container_handler(self):
+        handler = ContainerHandler(env=None)
+
+        def bulk_times():
+            # Every equally likely (unload, load) pair drawn for a bulk carrier
+            return np.array([
+                handler.calculate_processing_time('bulk', unload, load, 3)
+                for unload in range(10, 101) for load in range(5, 81)
+            ])
+
+        times = bulk_times()
+        mean, second_moment = service_time_moments('bulk', [3])
+        assert mean == pytest.approx(times.mean())
+        assert second_moment == pytest.approx((times ** 2).mean())
+
+        handler.processing_rates['bulk'] /= 2
+        slower_mean, _ = service_time_moments('bulk', [3], processing_rate_multiplier=0.5)
+        assert slower_mean == pytest.approx(bulk_times().mean())
+
+
+class TestPortQueueModel:
+    """Test the port-wide analytic model"""
+
+    def test_berth_classes_follow_configuration(self):
+        model = PortQueueModel()
+        metrics = model.evaluate()
+
+        assert set(metrics) == {'container', 'bulk', 'mixed'}
+        assert metrics['container'].arrival_rate == pytest.approx(0.75 / 1.5)
+        assert all(m.stable for m in metrics.values())
+        assert model.summarize(metrics)['arrival_rate'] == pytest.approx(1 / 1.5)
+
+    def test_scenarios_and_what_if_factors(self):
+        normal = PortQueueModel('normal')
+        peak = PortQueueModel('peak')
+        assert peak.summarize(peak.evaluate())['arrival_rate'] > normal.summarize(normal.evaluate())['arrival_rate']
+
+        baseline = normal.what_if()
+        reduced = normal.what_if(capacity_factor=0.2, processing_time_factor=1.5)
+        assert set(baseline) == {'berth_classes', 'summary'}
+        assert reduced['summary']['waiting_time'] > baseline['summary']['waiting_time']
+        assert reduced['summary']['utilization'] > baseline['summary']['utilization']
+
+        with pytest.raises(ValueError):
+            PortQueueModel('no-such-scenario')
+
+    def test_transient_backlog_grows_when_overloaded(self):
+        model = PortQueueModel()
+        early = model.transient_queue(2.0, capacity_factor=0.05, processing_time_factor=3.0)
+        late = model.transient_queue(8.0, capacity_factor=0.05, processing_time_factor=3.0)
+
+        assert late['queue_length'] > early['queue_length'] > 0
+        assert late['waiting_time'] > early['waiting_time']
+
+    def test_berth_capacity_feeds_queue_forecaster(self):
+        capacity = PortQueueModel().berth_capacity()
+        forecaster = QueueLengthForecaster(**capacity)
+        default = QueueLengthForecaster()
+
+        assert capacity['num_berths'] > QueueLengthForecaster.NUM_BERTHS
+        hour = np.array([10])
+        assert forecaster._waiting_time_array(np.array([6.0]), hour)[0] < \
+            default._waiting_time_array(np.array([6.0]), hour)[0]
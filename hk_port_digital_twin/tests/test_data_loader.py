@@ -8,26 +8,46 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from ai.predictive_models import ShipArrivalPredictor, ProcessingTimeEstimator
 from utils.data_loader import (
     load_container_throughput,
     load_annual_container_throughput,
     load_port_cargo_statistics,
+    load_all_vessel_data,
+    get_load_timings,
+    _read_cargo_statistics_csv,
     get_throughput_trends,
+    get_time_series_data,
     validate_data_quality,
     load_sample_data,
     load_vessel_arrivals,
+    load_vessel_data_from_xml,
     get_vessel_queue_analysis,
+    get_comprehensive_vessel_analysis,
+    VESSEL_DATA_DIR,
+    VESSEL_XML_FILES,
+    _parse_vessel_xml_columns,
     _categorize_ship_type,
     _categorize_location,
+    _categorize_column,
+    _parse_vessel_timestamp,
+    _parse_vessel_timestamps,
     DataCache,
     data_cache,
+    ParseCache,
     RealTimeDataManager,
+    RealTimeDataConfig,
     _validate_container_data,
     _validate_cargo_data,
     _validate_vessel_data,
@@ -160,6 +180,63 @@ class TestDataLoader(unittest.TestCase):
         except Exception as e:
             self.skipTest(f"Could not test cargo statistics loading: {e}")
     
+    def test_parallel_loaders_report_per_file_timings(self):
+        """Test parallel loading honours focus_tables and records per-file timings"""
+        cargo_stats = load_port_cargo_statistics(focus_tables=['Table_1_Eng'], max_workers=2)
+        if not cargo_stats:
+            self.skipTest("Cargo statistics data not available")
+        
+        self.assertEqual(list(cargo_stats), ['Table_1_Eng'])
+        self.assertEqual(list(get_load_timings()['load_port_cargo_statistics']), ['Table_1_Eng'])
+        self.assertEqual(cargo_stats['Table_1_Eng']['Port_cargo_throughput_2023'].dtype, np.int64)
+        
+        vessel_data = load_all_vessel_data(max_workers=4)
+        timings = get_load_timings()['load_all_vessel_data']
+        self.assertEqual(set(timings), set(VESSEL_XML_FILES))
+        self.assertTrue(set(vessel_data) <= set(timings))
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+    
+    def test_cargo_statistics_dtype_map_falls_back_to_inference(self):
+        """Test a table that does not fit its dtype map is still read"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_file = Path(temp_dir) / 'Port Cargo Statistics_CSV_Eng-Table_1_Eng.CSV'
+            csv_file.write_text('Shipment_type,Port_cargo_throughput_2023\nDirect,100\nTranshipment,-\n')
+            
+            df = _read_cargo_statistics_csv(csv_file, 'Table_1_Eng')
+            
+            self.assertEqual(df['Port_cargo_throughput_2023'].tolist(), ['100', '-'])
+    
+    def test_get_time_series_data_reshapes_tables(self):
+        """Test cargo tables are reshaped into year-by-category time series"""
+        cargo_stats = {
+            'Table_1_Eng': pd.DataFrame({
+                'Shipment_type': ['Direct shipment cargo', 'Transhipment cargo', 'Overall'],
+                'Port_cargo_throughput_2022': [77775, 114329, 192104],
+                'Port_cargo_throughput_percentage_distribution_2022': [40.5, 59.5, 100.0],
+                'Port_cargo_throughput_2023': [74624, 100242, 174866],
+                'Port_cargo_throughput_percentage_distribution_2023': [42.7, 57.3, 100.0],
+                'Port_cargo_throughput_average_annual_rate_of_change_2014_2023': [-7.1, -4.6, -5.7]
+            }),
+            'Table_2_Eng': pd.DataFrame({
+                'Transport_mode': ['Waterborne', 'Seaborne', 'River'],
+                'Port_cargo_throughput_2014': [297737, 197321, 100416],
+                'Port_cargo_throughput_2023': [174866, 115139, np.nan]
+            })
+        }
+        
+        time_series = get_time_series_data(cargo_stats)
+        
+        shipment_ts = time_series['shipment_types']
+        self.assertEqual(list(shipment_ts.index), [2022, 2023])
+        self.assertEqual(shipment_ts.index.name, 'Year')
+        self.assertEqual(list(shipment_ts.columns), ['Direct shipment cargo', 'Transhipment cargo', 'Overall'])
+        self.assertEqual(shipment_ts.loc[2023, 'Transhipment cargo'], 100242)
+        
+        transport_ts = time_series['transport_modes']
+        self.assertEqual(transport_ts.shape, (2, 3))
+        self.assertEqual(transport_ts.loc[2014, 'River'], 100416)
+        self.assertTrue(np.isnan(transport_ts.loc[2023, 'River']))
+    
     def test_get_throughput_trends_with_sample_data(self):
         """Test enhanced throughput trend analysis with sample data"""
         # Mock the load_container_throughput function to return sample data
@@ -919,6 +996,35 @@ class TestDataLoader(unittest.TestCase):
         self.assertEqual(_categorize_location(None), 'unknown')
         self.assertEqual(_categorize_location('Unknown Location'), 'other')
 
+    def test_parse_vessel_timestamps_matches_scalar_parser(self):
+        """Test vectorized timestamp parsing agrees with the per-value parser."""
+        time_strs = [
+            '17-AUG-2025 12:30', '2025/08/17 13:45', '2025-08-18 09:00', '18/08/2025 10:15',
+            'August 19, 2025 08:00', '2019/01/01 00:00', 'not a time', '', None, '2025/08/20 23:59'
+        ]
+        
+        parsed = _parse_vessel_timestamps(time_strs)
+        
+        self.assertEqual(len(parsed), len(time_strs))
+        for time_str, timestamp in zip(time_strs, parsed):
+            expected = _parse_vessel_timestamp(time_str)
+            if expected is None:
+                self.assertTrue(pd.isna(timestamp), time_str)
+            else:
+                self.assertEqual(timestamp, expected, time_str)
+        
+        self.assertTrue(_parse_vessel_timestamps([None, '']).isna().all())
+    
+    def test_categorize_column(self):
+        """Test column categorization returns a Categorical of observed categories."""
+        ship_types = ['CONTAINER', 'Bulk Carrier', 'CONTAINER', None, 'Oil Tanker']
+        
+        categories = _categorize_column(ship_types, _categorize_ship_type)
+        
+        self.assertIsInstance(categories, pd.Categorical)
+        self.assertEqual(list(categories), [_categorize_ship_type(value) for value in ship_types])
+        self.assertEqual(set(categories.categories), {'container', 'bulk_carrier', 'unknown', 'tanker'})
+
     def test_load_vessel_arrivals_with_real_data(self):
         """Test loading real vessel arrival data if XML file exists."""
         try:
@@ -1035,6 +1141,52 @@ class TestDataLoader(unittest.TestCase):
             self.assertIsInstance(df, pd.DataFrame)
             self.assertTrue(df.empty)
 
+    def test_streaming_vessel_xml_parser(self):
+        """Test the streaming XML parser handles feed quirks and missing fields."""
+        import tempfile
+        
+        xml_content = (
+            "This XML file does not appear to have any style information\n"
+            "associated with it. The document tree is shown below.\n"
+            "  <?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+            "<RP05005IXML>\n"
+            "  <G_SQL1>\n"
+            "    <CALL_SIGN>ABC1</CALL_SIGN>\n"
+            "    <VESSEL_NAME>SEA & SKY</VESSEL_NAME>\n"
+            "    <SHIP_TYPE>CONTAINER</SHIP_TYPE>\n"
+            "    <CURRENT_LOCATION>KWAICHUNG CONTR. BERTH NO. 1</CURRENT_LOCATION>\n"
+            "    <ARRIVAL_TIME>2025/08/17 12:30</ARRIVAL_TIME>\n"
+            "    <REMARK>Departed</REMARK>\n"
+            "  </G_SQL1>\n"
+            "  <G_SQL1>\n"
+            "    <CALL_SIGN>XYZ2</CALL_SIGN>\n"
+            "    <SHIP_TYPE>BULK CARRIER</SHIP_TYPE>\n"
+            "    <ARRIVAL_TIME></ARRIVAL_TIME>\n"
+            "  </G_SQL1>\n"
+            "</RP05005IXML>\n"
+        )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            xml_path = Path(temp_dir) / 'Arrived_in_last_36_hours.xml'
+            xml_path.write_text(xml_content, encoding='utf-8')
+            
+            columns = _parse_vessel_xml_columns(xml_path)
+            self.assertEqual(columns['CALL_SIGN'], ['ABC1', 'XYZ2'])
+            self.assertEqual(columns['VESSEL_NAME'], ['SEA & SKY', None])
+            # An empty element is present ('') while a missing one is None
+            self.assertEqual(columns['ARRIVAL_TIME'], ['2025/08/17 12:30', ''])
+            self.assertEqual(columns['REMARK'], ['Departed', None])
+            
+            df = load_vessel_data_from_xml(xml_path)
+        
+        self.assertEqual(len(df), 2)
+        self.assertEqual(list(df['call_sign']), ['ABC1', 'XYZ2'])
+        self.assertEqual(list(df['time_type']), ['arrival', 'arrival'])
+        self.assertEqual(list(df['status']), ['departed', 'in_port'])
+        self.assertEqual(list(df['ship_category']), ['container', 'bulk_carrier'])
+        self.assertEqual(df['timestamp'].iloc[0], pd.Timestamp('2025-08-17 12:30'))
+        self.assertTrue(pd.isna(df['timestamp'].iloc[1]))
+
 
 class TestEnhancedDataProcessingPipeline(unittest.TestCase):
     """Test cases for enhanced data processing pipeline features"""
@@ -1106,6 +1258,119 @@ class TestEnhancedDataProcessingPipeline(unittest.TestCase):
         self.assertEqual(stats['cached_items'], 1)
         self.assertIn('test', stats['cache_keys'])
         self.assertEqual(stats['access_counts']['test'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 0)
+
+    def test_data_cache_lru_eviction_within_memory_budget(self):
+        """Test DataCache evicts least recently used entries once over its byte budget"""
+        frame = pd.DataFrame({'value': np.arange(1000, dtype='int64'), 'name': ['vessel'] * 1000})
+        frame_size = int(frame.memory_usage(deep=True).sum())
+        cache = DataCache(max_bytes=int(frame_size * 2.5))
+
+        cache.set('a', frame)
+        cache.set('b', frame.copy())
+        cache.get('a')
+        cache.set('c', frame.copy())
+
+        # 'b' was the least recently used entry
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['memory_usage_bytes'], 2 * frame_size)
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 1)
+
+        # Values larger than the whole budget are not cached
+        cache.set('huge', pd.concat([frame] * 3))
+        self.assertIsNone(cache.get('huge'))
+        self.assertEqual(cache.get_stats()['rejections'], 1)
+        self.assertEqual(cache.get_stats()['cached_items'], 2)
+
+    def test_data_cache_per_key_ttl(self):
+        """Test DataCache honours per-key TTLs and purges expired entries"""
+        cache = DataCache(default_ttl=3600)
+        cache.set('short', 'value', ttl=1)
+        cache.set('long', 'value')
+
+        with patch('utils.data_loader.time.time', return_value=time.time() + 2):
+            self.assertEqual(cache.purge_expired(), 1)
+            self.assertIsNone(cache.get('short'))
+            self.assertEqual(cache.get('long'), 'value')
+        self.assertEqual(cache.get_stats()['expirations'], 1)
+
+    def test_data_cache_concurrent_access(self):
+        """Test DataCache keeps consistent size accounting under concurrent writers"""
+        cache = DataCache(max_bytes=200_000)
+
+        def worker(worker_id):
+            for i in range(200):
+                cache.set(f'{worker_id}-{i % 20}', np.zeros(500))
+                cache.get(f'{(worker_id + 1) % 4}-{i % 20}')
+
+        threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['memory_usage_bytes'], 200_000)
+        self.assertEqual(stats['memory_usage_bytes'], sum(stats['item_sizes'].values()))
+        self.assertGreater(stats['evictions'], 0)
+
+    def test_parse_cache_tracks_file_changes(self):
+        """Test ParseCache reuses parse results until the source file content changes"""
+        cache = ParseCache()
+        parses = []
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_file = Path(temp_dir) / 'throughput.csv'
+            csv_file.write_text('year,teus\n2023,100\n2024,120\n')
+            
+            def parse():
+                parses.append(1)
+                return pd.read_csv(csv_file)
+            
+            first = cache.get_or_parse('throughput', [csv_file], parse)
+            second = cache.get_or_parse('throughput', [csv_file], parse)
+            self.assertEqual(len(parses), 1)
+            pd.testing.assert_frame_equal(first, second)
+            
+            # Callers cannot modify the cached frame
+            second.loc[0, 'teus'] = -1
+            self.assertEqual(cache.get_or_parse('throughput', [csv_file], parse).loc[0, 'teus'], 100)
+            
+            # A rewrite with identical content is confirmed by its hash
+            stat = csv_file.stat()
+            csv_file.write_text('year,teus\n2023,100\n2024,120\n')
+            os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            cache.get_or_parse('throughput', [csv_file], parse)
+            self.assertEqual(len(parses), 1)
+            
+            # A same-sized change is hashed once, for the check and the new entry
+            csv_file.write_text('year,teus\n2023,100\n2024,130\n')
+            os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+            bytes_hashed = cache.stats['bytes_hashed']
+            changed = cache.get_or_parse('throughput', [csv_file], parse)
+            self.assertEqual(len(parses), 2)
+            self.assertEqual(cache.stats['bytes_hashed'] - bytes_hashed, csv_file.stat().st_size)
+            self.assertEqual(changed.loc[1, 'teus'], 130)
+            
+            # Missing files are never cached
+            missing = Path(temp_dir) / 'missing.csv'
+            cache.get_or_parse('missing', [missing], pd.DataFrame)
+            cache.get_or_parse('missing', [missing], pd.DataFrame)
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hash_confirmations'], 1)
+        self.assertEqual(stats['cached_items'], 1)
+        self.assertGreater(stats['cached_bytes'], 0)
+        self.assertGreater(stats['bytes_parsed'], 0)
     
     def test_validate_container_data(self):
         """Test container data validation function"""
@@ -1326,6 +1591,117 @@ class TestEnhancedDataProcessingPipeline(unittest.TestCase):
         self.assertIn('cache_keys', cache_stats)
         self.assertIn('access_counts', cache_stats)
     
+    @patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'})
+    def test_real_time_data_manager_updates_predictive_models(self):
+        """Test that vessel refreshes fold arrivals and completed calls into attached models"""
+        manager = RealTimeDataManager(RealTimeDataConfig(enable_file_monitoring=False))
+        arrival_predictor = ShipArrivalPredictor()
+        processing_estimator = ProcessingTimeEstimator()
+        manager.attach_predictive_models(arrival_predictor, processing_estimator)
+        
+        vessel_data = {
+            'Arrived_in_last_36_hours.xml': pd.DataFrame({
+                'call_sign': ['VESSEL1', 'VESSEL2', 'VESSEL3'],
+                'timestamp': pd.to_datetime(['2024-01-01 08:00', '2024-01-01 10:00', '2024-01-02 09:00']),
+                'ship_category': ['container', 'container', 'bulk_carrier']
+            }),
+            'Departed_in_last_36_hours.xml': pd.DataFrame({
+                'call_sign': ['VESSEL1', 'VESSEL3', 'VESSEL4'],
+                'timestamp': pd.to_datetime(['2024-01-01 20:00', '2024-01-02 08:00', '2024-01-02 12:00']),
+                'ship_category': ['container', 'bulk_carrier', 'tanker']
+            })
+        }
+        
+        folded = manager._update_predictive_models(vessel_data)
+        
+        # VESSEL3 departs before its arrival and VESSEL4 has no arrival record
+        self.assertEqual(folded, {'arrivals': 3, 'processing_records': 1})
+        self.assertTrue(arrival_predictor.is_trained)
+        self.assertEqual(arrival_predictor.training_records, 3)
+        self.assertEqual(processing_estimator.historical_processing_times['container']['mean'], 12.0)
+        
+        # The next refresh repeats the same snapshot: nothing is counted twice
+        self.assertEqual(manager._update_predictive_models(vessel_data), {'arrivals': 0, 'processing_records': 0})
+        self.assertEqual(arrival_predictor.training_records, 3)
+    
+    @patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'})
+    def test_real_time_vessel_refresh_parses_each_file_once(self):
+        """Test that a vessel refresh parses every XML file once and only again after a change"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for xml_file in VESSEL_XML_FILES:
+                shutil.copy(VESSEL_DATA_DIR / xml_file, temp_dir)
+            
+            manager = RealTimeDataManager(RealTimeDataConfig(enable_file_monitoring=False,
+                                                             enable_vessel_history=False))
+            with patch('utils.data_loader.VESSEL_DATA_DIR', Path(temp_dir)), \
+                 patch('utils.data_loader.load_vessel_data_from_xml', wraps=load_vessel_data_from_xml) as mock_parse:
+                manager._update_vessel_data()
+                self.assertEqual(mock_parse.call_count, len(VESSEL_XML_FILES))
+                
+                combined = manager.data_cache['vessel_combined']
+                self.assertEqual(len(combined), sum(len(df) for df in manager.vessel_frames.values()))
+                self.assertEqual(
+                    manager.data_cache['vessel_comprehensive_analysis']['data_summary'],
+                    get_comprehensive_vessel_analysis(manager.vessel_frames)['data_summary']
+                )
+                
+                # Nothing changed on disk: the refresh reuses the loaded frames
+                manager._update_vessel_data()
+                self.assertEqual(mock_parse.call_count, len(VESSEL_XML_FILES))
+                self.assertIs(manager.data_cache['vessel_combined'], combined)
+                
+                # A changed file triggers a reload
+                arrivals_file = Path(temp_dir) / 'Arrived_in_last_36_hours.xml'
+                stat = arrivals_file.stat()
+                os.utime(arrivals_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+                manager._update_vessel_data()
+                self.assertEqual(mock_parse.call_count, 2 * len(VESSEL_XML_FILES))
+    
+    @patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'})
+    def test_real_time_vessel_refresh_keeps_cache_fresh_without_reparsing(self):
+        """Test that refreshes with unchanged vessel files still renew the cached vessel data"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for xml_file in VESSEL_XML_FILES:
+                shutil.copy(VESSEL_DATA_DIR / xml_file, temp_dir)
+            
+            manager = RealTimeDataManager(RealTimeDataConfig(enable_file_monitoring=False,
+                                                             enable_vessel_history=False))
+            with patch('utils.data_loader.VESSEL_DATA_DIR', Path(temp_dir)), \
+                 patch('utils.data_loader.load_vessel_data_from_xml', wraps=load_vessel_data_from_xml) as mock_parse:
+                manager._update_vessel_data()
+                
+                # Let the cached entries expire
+                data_cache.invalidate('vessel_combined')
+                manager.last_updates['vessel_combined'] -= timedelta(seconds=manager.config.cache_duration + 1)
+                self.assertIsNone(manager.get_cached_data('vessel_combined'))
+                
+                manager._update_vessel_data()
+                self.assertEqual(mock_parse.call_count, len(VESSEL_XML_FILES))
+                self.assertIs(manager.get_cached_data('vessel_combined'), manager.data_cache['vessel_combined'])
+    
+    @patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'})
+    def test_real_time_vessel_refresh_retries_failed_load(self):
+        """Test that a refresh failing after the XML files were parsed reloads them next time"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for xml_file in VESSEL_XML_FILES:
+                shutil.copy(VESSEL_DATA_DIR / xml_file, temp_dir)
+            
+            manager = RealTimeDataManager(RealTimeDataConfig(enable_file_monitoring=False,
+                                                             enable_vessel_history=False))
+            deltas = []
+            manager.register_update_callback('vessel_changes', deltas.append)
+            with patch('utils.data_loader.VESSEL_DATA_DIR', Path(temp_dir)):
+                with patch('utils.data_loader.combine_vessel_data', side_effect=RuntimeError("bad frame")):
+                    with self.assertRaises(RuntimeError):
+                        manager._update_vessel_data()
+                self.assertEqual(manager.vessel_frames, {})
+                
+                # The unchanged files are loaded again and the whole snapshot is published
+                manager._update_vessel_data()
+                self.assertIn('vessel_combined', manager.data_cache)
+                self.assertEqual(len(deltas), 1)
+                self.assertEqual(len(deltas[0].inserted), len(manager.data_cache['vessel_combined']))
+    
     def test_enhanced_validate_data_quality_integration(self):
         """Test enhanced validate_data_quality function with all data types"""
         # Mock all data loading functions
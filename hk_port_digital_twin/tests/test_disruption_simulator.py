@@ -99,6 +99,44 @@ class TestDisruptionSimulator(unittest.TestCase):
         self.assertIn('timeline', result)
         self.assertIn('recovery_recommendations', result)
         
+    def test_analytic_queue_impact(self):
+        """Test queue and waiting time impacts come from the analytic queue model"""
+        def make_event(capacity_reduction, processing_increase):
+            return DisruptionEvent(
+                event_id="test_queue",
+                disruption_type=DisruptionType.CRANE_FAILURE,
+                severity=DisruptionSeverity.HIGH,
+                start_time=self.start_time,
+                duration_hours=12.0,
+                capacity_reduction=capacity_reduction,
+                processing_time_increase=processing_increase
+            )
+        
+        check_time = self.start_time + timedelta(hours=6)
+        baseline_metrics = {'average_queue_length': 3.0, 'average_waiting_time': 4.0}
+        
+        # No capacity or processing impact leaves the baseline unchanged
+        unaffected = make_event(0.0, 0.0)
+        self.assertAlmostEqual(
+            self.simulator._calculate_waiting_time_impact(unaffected, check_time, baseline_metrics), 4.0
+        )
+        self.assertAlmostEqual(
+            self.simulator._calculate_queue_impact(unaffected, check_time, baseline_metrics), 3.0
+        )
+        
+        # Severe capacity loss overloads the berths and waiting grows over time
+        severe = make_event(0.9, 1.0)
+        later_time = self.start_time + timedelta(hours=10)
+        self.assertGreater(
+            self.simulator._calculate_waiting_time_impact(severe, check_time),
+            self.simulator._calculate_waiting_time_impact(unaffected, check_time)
+        )
+        self.assertGreater(
+            self.simulator._calculate_queue_impact(severe, later_time),
+            self.simulator._calculate_queue_impact(severe, check_time)
+        )
+        
+
     def test_weather_impact_severity(self):
         """Test weather impact with different severity levels"""
         weather_low = self.simulator._calculate_disruption_impact(
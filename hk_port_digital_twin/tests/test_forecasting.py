@@ -0,0 +1,110 @@
+# Test suite for the batched linear-trend forecasting kernel
+# Tests for forecasting.py and the forecasts built on it in data_loader.py and business_intelligence.py
+
+import pytest
+import numpy as np
+import pandas as pd
+
+try:
+    from src.utils.forecasting import fit_linear_trends
+    from src.utils.data_loader import forecast_cargo_throughput
+    from src.analytics.business_intelligence import BusinessIntelligenceEngine
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.forecasting import fit_linear_trends
+    from src.utils.data_loader import forecast_cargo_throughput
+    from src.analytics.business_intelligence import BusinessIntelligenceEngine
+
+
+@pytest.fixture
+def series_batch():
+    rng = np.random.default_rng(0)
+    x = np.arange(2010, 2024)
+    values = 1000 + np.outer(rng.normal(5, 3, 20), x - 2010) + rng.normal(0, 20, (20, len(x)))
+    values[0, -3:] = np.nan
+    values[1, :4] = np.nan
+    values[2, [3, 7]] = np.nan
+    return x, values
+
+
+class TestFitLinearTrends:
+    """Test the batched least-squares fit against per-series fits"""
+
+    def test_matches_per_series_polyfit(self, series_batch):
+        x, values = series_batch
+        fit = fit_linear_trends(x, values)
+
+        for i, row in enumerate(values):
+            observed = ~np.isnan(row)
+            slope, intercept = np.polyfit(x[observed], row[observed], 1)
+            residuals = row[observed] - (intercept + slope * x[observed])
+
+            assert fit.slopes[i] == pytest.approx(slope)
+            assert fit.intercepts[i] == pytest.approx(intercept)
+            assert fit.n_obs[i] == observed.sum()
+            assert fit.mae[i] == pytest.approx(np.abs(residuals).mean())
+            assert fit.rmse[i] == pytest.approx(np.sqrt((residuals ** 2).mean()))
+            assert fit.r_squared[i] == pytest.approx(1 - (residuals ** 2).sum() / ((row[observed] - row[observed].mean()) ** 2).sum())
+
+    def test_degenerate_series(self):
+        fit = fit_linear_trends(np.arange(4), np.array([
+            [np.nan, np.nan, np.nan, 5.0],
+            [3.0, 3.0, 3.0, 3.0]
+        ]))
+
+        assert np.isnan(fit.slopes[0]) and np.isnan(fit.r_squared[0])
+        assert fit.slopes[1] == 0.0
+        assert fit.r_squared[1] == 1.0
+
+    def test_prediction_interval(self, series_batch):
+        statsmodels = pytest.importorskip('statsmodels.api')
+        x, values = series_batch
+        fit = fit_linear_trends(x, values)
+        future = np.arange(2024, 2027)
+
+        lower, upper = fit.prediction_interval(future, level=0.9)
+
+        observed = ~np.isnan(values[1])
+        model = statsmodels.OLS(values[1][observed], statsmodels.add_constant(x[observed])).fit()
+        expected = model.get_prediction(statsmodels.add_constant(future)).conf_int(obs=True, alpha=0.1)
+        np.testing.assert_allclose(lower[1], expected[:, 0])
+        np.testing.assert_allclose(upper[1], expected[:, 1])
+        # Intervals widen further from the data
+        assert np.all(np.diff(upper - lower, axis=1) > 0)
+
+
+class TestForecastConsumers:
+    """Test the forecasts built on the kernel"""
+
+    def test_forecast_cargo_throughput(self):
+        years = np.arange(2018, 2024)
+        time_series = {'shipment_types': pd.DataFrame({
+            'Direct': 100.0 + 10 * (years - 2018),
+            'Sparse': [1.0, np.nan, np.nan, np.nan, 2.0, np.nan],
+            'Trailing gap': [50.0, 52.0, 54.0, 56.0, np.nan, np.nan]
+        }, index=years)}
+
+        forecasts = forecast_cargo_throughput(time_series, forecast_years=2)['shipment_types']
+
+        assert set(forecasts) == {'Direct', 'Trailing gap'}
+        assert forecasts['Direct']['forecast_years'] == [2024, 2025]
+        assert forecasts['Direct']['forecast_values'] == pytest.approx([160.0, 170.0])
+        assert forecasts['Direct']['model_metrics']['r2'] == pytest.approx(1.0)
+        assert forecasts['Trailing gap']['forecast_years'] == [2022, 2023]
+        assert forecasts['Trailing gap']['forecast_values'] == pytest.approx([58.0, 60.0])
+
+    def test_business_intelligence_linear_forecast(self):
+        engine = BusinessIntelligenceEngine()
+        values = [10.0 + 0.5 * i + (-1) ** i for i in range(20)]
+
+        result = engine._generate_linear_forecast(values, 5)
+
+        slope, intercept = np.polyfit(np.arange(20), values, 1)
+        assert result['trend_slope'] == pytest.approx(slope)
+        assert result['forecast'] == pytest.approx(list(intercept + slope * np.arange(20, 25)))
+        assert 0 < result['confidence'] < 1
+        assert all(low < value < high for low, value, high in zip(
+            result['prediction_interval']['lower'], result['forecast'], result['prediction_interval']['upper']
+        ))
@@ -0,0 +1,167 @@
+# Test suite for the predictive model store
+# Tests for model_store.py and the get_state()/set_state() hooks in predictive_models.py
+
+import json
+
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+try:
+    from src.ai.model_store import ModelStore, data_fingerprint, MODEL_STORE_FORMAT_VERSION
+    from src.ai.predictive_models import (
+        ShipArrivalPredictor, ProcessingTimeEstimator, QueueLengthForecaster, create_sample_predictions
+    )
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.ai.model_store import ModelStore, data_fingerprint, MODEL_STORE_FORMAT_VERSION
+    from src.ai.predictive_models import (
+        ShipArrivalPredictor, ProcessingTimeEstimator, QueueLengthForecaster, create_sample_predictions
+    )
+
+
+@pytest.fixture
+def arrival_data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'arrival_time': pd.date_range(start='2024-01-01', periods=200, freq='5h'),
+        'ship_type': rng.choice(['container', 'bulk', 'tanker'], 200),
+        'size': rng.uniform(1000, 8000, 200)
+    })
+
+
+def train_arrival_predictor(predictor, data):
+    predictor.load_historical_data(data)
+    predictor.train_arrival_model()
+
+
+class TestDataFingerprint:
+    """Test training data fingerprints"""
+
+    def test_fingerprint_is_stable(self, arrival_data):
+        assert data_fingerprint(arrival_data) == data_fingerprint(arrival_data.copy())
+
+    def test_fingerprint_changes_with_data(self, arrival_data):
+        changed = arrival_data.copy()
+        changed.loc[5, 'size'] += 1
+
+        assert data_fingerprint(arrival_data) != data_fingerprint(changed)
+        assert data_fingerprint(arrival_data) != data_fingerprint(arrival_data.rename(columns={'size': 'tonnage'}))
+        assert data_fingerprint(pd.DataFrame()) == data_fingerprint(None)
+
+
+class TestModelStore:
+    """Test saving and restoring trained model state"""
+
+    def test_arrival_predictor_round_trip(self, tmp_path, arrival_data):
+        store = ModelStore(tmp_path)
+        predictor = ShipArrivalPredictor()
+        train_arrival_predictor(predictor, arrival_data)
+        store.save('arrivals', predictor, data_fingerprint(arrival_data))
+
+        restored = ShipArrivalPredictor()
+        assert store.load('arrivals', restored, data_fingerprint(arrival_data))
+
+        assert restored.is_trained
+        assert restored.seasonal_patterns == predictor.seasonal_patterns
+        np.testing.assert_allclose(restored.hourly_factors, predictor.hourly_factors)
+        np.testing.assert_allclose(restored.monthly_factors, predictor.monthly_factors)
+        times = pd.date_range(start='2024-06-01', periods=48, freq='h')
+        original = predictor.predict_arrivals(times, 'bulk', rng=np.random.default_rng(1))
+        loaded = restored.predict_arrivals(times, 'bulk', rng=np.random.default_rng(1))
+        pd.testing.assert_frame_equal(original, loaded)
+
+    def test_processing_estimator_round_trip(self, tmp_path):
+        store = ModelStore(tmp_path)
+        estimator = ProcessingTimeEstimator()
+        estimator.load_processing_data(pd.DataFrame({
+            'ship_type': ['container', 'container', 'bulk'],
+            'processing_time': [5.0, 7.0, 11.0],
+            'size': [2000, 4000, 6000]
+        }))
+        store.save('processing', estimator, 'fingerprint')
+
+        restored = ProcessingTimeEstimator()
+        assert store.load('processing', restored, 'fingerprint')
+
+        # The single bulk record has no standard deviation
+        assert np.isnan(restored.historical_processing_times['bulk']['std'])
+        expected = estimator.estimate_processing_time('container', 3500, containers=100)
+        actual = restored.estimate_processing_time('container', 3500, containers=100)
+        assert actual.estimated_hours == pytest.approx(expected.estimated_hours)
+        assert actual.confidence_interval == pytest.approx(expected.confidence_interval)
+
+    def test_queue_forecaster_round_trip(self, tmp_path):
+        store = ModelStore(tmp_path)
+        forecaster = QueueLengthForecaster()
+        forecaster.load_queue_history(pd.DataFrame({
+            'timestamp': pd.date_range(start='2024-01-01', periods=72, freq='h'),
+            'arrivals': np.random.default_rng(0).poisson(1.0, 72)
+        }))
+        store.save('queue', forecaster, 'fingerprint')
+
+        restored = QueueLengthForecaster()
+        assert store.load('queue', restored)
+
+        np.testing.assert_allclose(restored.expected_arrivals_table, forecaster.expected_arrivals_table)
+        assert restored.data_confidence == forecaster.data_confidence
+        start = datetime(2024, 2, 1, 8)
+        assert [f.predicted_queue_length for f in restored.forecast_queue_length(48, start)] == \
+            [f.predicted_queue_length for f in forecaster.forecast_queue_length(48, start)]
+
+    def test_stale_artifacts_are_rejected(self, tmp_path, arrival_data):
+        store = ModelStore(tmp_path)
+        predictor = ShipArrivalPredictor()
+        train_arrival_predictor(predictor, arrival_data)
+        store.save('arrivals', predictor, 'old-fingerprint')
+
+        assert not store.load('arrivals', ShipArrivalPredictor(), 'new-fingerprint')
+        assert not store.load('arrivals', QueueLengthForecaster())
+        assert not store.load('missing', ShipArrivalPredictor())
+
+        artifact = json.loads(store.artifact_path('arrivals').read_text())
+        artifact['state_version'] = ShipArrivalPredictor.STATE_VERSION + 1
+        store.artifact_path('arrivals').write_text(json.dumps(artifact))
+        assert not store.load('arrivals', ShipArrivalPredictor(), 'old-fingerprint')
+        assert store.stats == {'hits': 0, 'misses': 4, 'saves': 1}
+
+    def test_load_or_train_retrains_only_on_data_change(self, tmp_path, arrival_data):
+        store = ModelStore(tmp_path)
+        calls = []
+
+        def run(data):
+            predictor = ShipArrivalPredictor()
+            retrained = store.load_or_train(
+                'arrivals', predictor,
+                lambda: (calls.append(1), train_arrival_predictor(predictor, data)), data
+            )
+            return predictor, retrained
+
+        first, retrained = run(arrival_data)
+        assert retrained and first.is_trained
+
+        second, retrained = run(arrival_data)
+        assert not retrained and second.is_trained
+        assert second.ship_type_patterns.keys() == first.ship_type_patterns.keys()
+
+        _, retrained = run(arrival_data.iloc[:150])
+        assert retrained
+        assert len(calls) == 2
+
+        summary = store.list_artifacts()
+        assert [item['name'] for item in summary] == ['arrivals']
+        assert summary[0]['fingerprint'] == data_fingerprint(arrival_data.iloc[:150])
+
+    def test_create_sample_predictions_uses_store(self, tmp_path):
+        store = ModelStore(tmp_path)
+
+        create_sample_predictions(store)
+        predictions = create_sample_predictions(store)
+
+        assert store.stats['saves'] == 1
+        assert store.stats['hits'] == 1
+        assert predictions['arrival_predictions']['next_container'].probability > 0.5
+        assert store.read_artifact('ship_arrival_predictor')['format_version'] == MODEL_STORE_FORMAT_VERSION
@@ -0,0 +1,110 @@
+# Test suite for the persisted historical simulation-parameter snapshot
+# Tests for parameter_snapshot.py and its use by get_enhanced_simulation_config
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+try:
+    from src.utils.parameter_snapshot import ParameterSnapshot, PARAMETER_SNAPSHOT_FORMAT_VERSION
+    from src.utils import data_loader
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.parameter_snapshot import ParameterSnapshot, PARAMETER_SNAPSHOT_FORMAT_VERSION
+    from src.utils import data_loader
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """config.settings, importing the data loader under test"""
+    # settings imports the data loader through the hk_port_digital_twin package
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2]))
+    monkeypatch.setitem(sys.modules, 'hk_port_digital_twin.src.utils.data_loader', data_loader)
+    from hk_port_digital_twin.config import settings
+    return settings
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'raw' / 'throughput.csv'
+    path.parent.mkdir()
+    path.write_text('Year,Month,TEUs\n2024,Jan,100\n2024,Feb,120\n')
+    return path
+
+
+class TestParameterSnapshot:
+    """Test persisting and validating the parameter snapshot"""
+
+    def test_snapshot_is_reused_until_sources_change(self, tmp_path, source_file):
+        snapshot = ParameterSnapshot(tmp_path / 'cache' / 'params.json')
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {'ship_arrival_rate': np.float64(1.25), 'total_data_points': np.int64(len(builds))}
+
+        first = snapshot.load_or_build([source_file], build)
+        assert first['total_data_points'] == 1
+
+        # Another worker loads the saved snapshot instead of extracting again
+        other = ParameterSnapshot(snapshot.path)
+        assert other.load_or_build([source_file], build) == {'ship_arrival_rate': 1.25, 'total_data_points': 1}
+        assert len(builds) == 1
+
+        # Touching a source without changing it keeps the snapshot
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        other.load_or_build([source_file], build)
+        assert len(builds) == 1
+
+        source_file.write_text('Year,Month,TEUs\n2024,Jan,100\n2024,Feb,130\n')
+        assert other.load_or_build([source_file], build)['total_data_points'] == 2
+        assert other.stats == {'hits': 2, 'misses': 1, 'builds': 1}
+
+    def test_stale_format_and_failed_extractions(self, tmp_path, source_file):
+        snapshot = ParameterSnapshot(tmp_path / 'params.json')
+        assert snapshot.load_or_build([source_file], dict) == {}
+        assert not snapshot.path.exists()
+
+        snapshot.save({'ship_arrival_rate': 1.0}, [source_file])
+        contents = json.loads(snapshot.path.read_text())
+        contents['format_version'] = PARAMETER_SNAPSHOT_FORMAT_VERSION + 1
+        snapshot.path.write_text(json.dumps(contents))
+        assert snapshot.load([source_file]) is None
+
+        snapshot.clear()
+        assert not snapshot.path.exists()
+
+    def test_data_loader_uses_snapshot(self, tmp_path):
+        snapshot = ParameterSnapshot(tmp_path / 'params.json')
+        expected = data_loader.extract_historical_simulation_parameters()
+        if not expected:
+            pytest.skip("historical data files are not available")
+
+        with patch.object(data_loader, 'parameter_snapshot', snapshot), \
+                patch.object(data_loader, 'extract_historical_simulation_parameters',
+                             wraps=data_loader.extract_historical_simulation_parameters) as mock_extract:
+            data_loader.build_parameter_snapshot(rebuild=True)
+            loaded = data_loader.load_historical_simulation_parameters()
+            assert mock_extract.call_count == 1
+
+        assert loaded['ship_arrival_rate'] == pytest.approx(expected['ship_arrival_rate'])
+        assert loaded['seasonal_patterns'] == expected['seasonal_patterns']
+
+    def test_enhanced_simulation_config_matches_direct_extraction(self, tmp_path, settings):
+        with patch.object(data_loader, 'load_historical_simulation_parameters',
+                          data_loader.extract_historical_simulation_parameters):
+            expected = settings.get_enhanced_simulation_config()
+
+        snapshot = ParameterSnapshot(tmp_path / 'params.json')
+        with patch.object(data_loader, 'parameter_snapshot', snapshot):
+            built = settings.get_enhanced_simulation_config()
+            loaded = settings.get_enhanced_simulation_config()
+
+        assert built == expected
+        assert loaded == expected
@@ -0,0 +1,230 @@
+import unittest
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add project root to path
+from pathlib import Path
+project_root = Path(__file__).resolve().parents[2]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from hk_port_digital_twin.src.scenarios import peak_season_optimizer
+from hk_port_digital_twin.src.scenarios.peak_season_optimizer import (
+    PeakSeasonOptimizer, PeakSeasonStrategy, OptimizationConfiguration, PeakSeasonProblem, EvolutionResult,
+    Ship, Berth
+)
+
+
+class TestPeakSeasonGeneticAlgorithm(unittest.TestCase):
+    """Test cases for the vectorized genetic algorithm in PeakSeasonOptimizer"""
+
+    def setUp(self):
+        """Set up a small peak season scenario"""
+        self.base_time = datetime(2025, 1, 1, 8, 0)
+        self.ships = [
+            Ship(id="SHIP_001", arrival_time=self.base_time, ship_type="container",
+                 size=20000, containers_to_load=300, containers_to_unload=400),
+            Ship(id="SHIP_002", arrival_time=self.base_time + timedelta(hours=1), ship_type="container",
+                 size=15000, containers_to_load=200, containers_to_unload=100),
+            Ship(id="SHIP_003", arrival_time=self.base_time + timedelta(hours=2), ship_type="bulk",
+                 size=35000, containers_to_load=0, containers_to_unload=0),
+            Ship(id="SHIP_004", arrival_time=self.base_time - timedelta(hours=1), ship_type="tanker",
+                 size=60000, containers_to_load=0, containers_to_unload=0),
+        ]
+        self.berths = [
+            Berth(id="BERTH_A1", capacity=30000, crane_count=4, suitable_ship_types=['container', 'general']),
+            Berth(id="BERTH_B1", capacity=40000, crane_count=2, suitable_ship_types=['bulk', 'tanker']),
+        ]
+        config = OptimizationConfiguration(
+            strategy=PeakSeasonStrategy.DYNAMIC_ALLOCATION,
+            max_iterations=50,
+            population_size=20,
+            random_seed=7
+        )
+        self.optimizer = PeakSeasonOptimizer(config)
+        self.optimizer.add_ships(self.ships)
+        self.optimizer.add_berths(self.berths)
+        self.optimizer.current_time = self.base_time
+
+    def test_build_problem_arrays(self):
+        """Test that the problem matrices reflect suitability and service times"""
+        problem = self.optimizer.build_problem()
+
+        self.assertIsInstance(problem, PeakSeasonProblem)
+        self.assertEqual(problem.suitability.shape, (4, 2))
+        np.testing.assert_array_equal(
+            problem.suitability,
+            [[True, False], [True, False], [False, True], [False, False]]
+        )
+        np.testing.assert_array_equal(problem.suitable_counts, [1, 1, 1, 0])
+        np.testing.assert_allclose(problem.arrival_hours, [0.0, 1.0, 2.0, -1.0])
+        self.assertAlmostEqual(
+            problem.service_times[0, 0],
+            self.optimizer.estimate_service_time_advanced(self.ships[0], self.berths[0])
+        )
+        self.assertEqual(problem.service_times[0, 1], 0.0)
+
+    def test_random_genes_use_suitable_berths(self):
+        """Test that random chromosomes only pick suitable berths"""
+        problem = self.optimizer.build_problem()
+        genes = problem.random_genes(100, np.random.default_rng(0))
+
+        self.assertEqual(genes.shape, (100, 4))
+        self.assertTrue(np.all(genes[:, 0] == 0))
+        self.assertTrue(np.all(genes[:, 2] == 1))
+        # No suitable berth: defaults to the first berth
+        self.assertTrue(np.all(genes[:, 3] == 0))
+
+    def test_evaluate_matches_sequential_schedule(self):
+        """Test population fitness against a hand-built berth schedule"""
+        problem = self.optimizer.build_problem()
+        service = problem.service_times
+        population = np.array([[0, 0, 1, 0], [1, 0, 1, 1]])
+
+        fitness = problem.evaluate(population, efficiency_weight=1.5)
+
+        # Chromosome 0: ships 1 and 2 queue at berth A1, ship 3 at B1, ship 4 unsuitable
+        ship2_start = max(1.0, service[0, 0])
+        waiting = 0.0 + (ship2_start - 1.0) + 0.0 + 24.0
+        revenue = (700 + 300) * 50
+        utilization = (service[0, 0] + service[1, 0] + service[2, 1]) / 2
+        expected = revenue * 0.4 - waiting / 4 * 1000 * 1.5 - (24 - utilization) * 100
+        self.assertAlmostEqual(fitness[0], expected, places=6)
+
+        # Chromosome 1: ship 1 and ship 4 unsuitable, ship 2 starts on arrival
+        waiting = 24.0 + 0.0 + 0.0 + 24.0
+        revenue = 300 * 50
+        utilization = (service[1, 0] + service[2, 1]) / 2
+        expected = revenue * 0.4 - waiting / 4 * 1000 * 1.5 - (24 - utilization) * 100
+        self.assertAlmostEqual(fitness[1], expected, places=6)
+
+    def test_genetic_algorithm_assigns_suitable_berths(self):
+        """Test that the genetic algorithm returns a valid assignment for every ship"""
+        assignments = self.optimizer.genetic_algorithm_optimization()
+
+        self.assertEqual(set(assignments), {ship.id for ship in self.ships})
+        self.assertEqual(assignments["SHIP_001"], "BERTH_A1")
+        self.assertEqual(assignments["SHIP_002"], "BERTH_A1")
+        self.assertEqual(assignments["SHIP_003"], "BERTH_B1")
+
+    def test_genetic_algorithm_is_reproducible_with_seed(self):
+        """Test that a fixed random seed gives identical results"""
+        first = self.optimizer.genetic_algorithm_optimization()
+        second = self.optimizer.genetic_algorithm_optimization()
+        self.assertEqual(first, second)
+
+    def test_optimize_peak_season_with_genetic_algorithm(self):
+        """Test the full peak season optimization run"""
+        result = self.optimizer.optimize_peak_season(self.base_time)
+
+        self.assertEqual(result['strategy'], 'dynamic_allocation')
+        self.assertEqual(result['ships_count'], 4)
+        self.assertEqual(len(result['schedule']), 4)
+        self.assertGreaterEqual(result['metrics'].average_waiting_time, 0)
+
+    def test_time_limit_stops_genetic_algorithm(self):
+        """Test that an expired wall-clock deadline stops the run early"""
+        self.optimizer.config.max_iterations = 100000
+        self.optimizer.config.convergence_threshold = -1
+        self.optimizer.config.time_limit_seconds = 0.0
+
+        assignments = self.optimizer.genetic_algorithm_optimization()
+        self.assertEqual(len(assignments), 4)
+
+    def test_migrate_replaces_worst_with_neighbour_elites(self):
+        """Test ring migration between islands"""
+        self.optimizer.config.migration_size = 1
+        results = [
+            EvolutionResult(population=np.array([[0, 0], [1, 1], [0, 1]]), fitness_scores=np.array([1.0, 5.0, 3.0]),
+                            best_solution=np.array([1, 1]), best_fitness=5.0, generations=1, converged=False),
+            EvolutionResult(population=np.array([[1, 0], [0, 0], [1, 1]]), fitness_scores=np.array([2.0, 0.0, 4.0]),
+                            best_solution=np.array([1, 1]), best_fitness=4.0, generations=1, converged=False),
+        ]
+
+        populations = self.optimizer._migrate(results)
+
+        np.testing.assert_array_equal(populations[1], [[1, 0], [1, 1], [1, 1]])
+        np.testing.assert_array_equal(populations[0], [[1, 1], [1, 1], [0, 1]])
+
+    def test_island_model_genetic_algorithm(self):
+        """Test the island-model run across worker processes"""
+        self.optimizer.config.island_count = 2
+        self.optimizer.config.max_workers = 2
+        self.optimizer.config.max_iterations = 20
+        self.optimizer.config.migration_interval = 5
+
+        assignments = self.optimizer.genetic_algorithm_optimization()
+
+        self.assertEqual(set(assignments), {ship.id for ship in self.ships})
+        self.assertEqual(assignments["SHIP_001"], "BERTH_A1")
+        self.assertEqual(assignments["SHIP_003"], "BERTH_B1")
+
+    def test_island_worker_closes_shared_blocks(self):
+        """Test that a worker's shared memory views are closed when it exits"""
+        problem = self.optimizer.build_problem()
+        problem_spec, shared_blocks = peak_season_optimizer._share_problem(problem)
+        try:
+            peak_season_optimizer._init_island_worker(problem_spec, self.optimizer.config)
+            attached = list(peak_season_optimizer._island_shared_blocks)
+            self.assertEqual(len(attached), len(shared_blocks))
+            np.testing.assert_array_equal(peak_season_optimizer._island_problem.service_times, problem.service_times)
+
+            peak_season_optimizer._release_island_worker()
+
+            self.assertEqual(peak_season_optimizer._island_shared_blocks, [])
+            self.assertIsNone(peak_season_optimizer._island_problem)
+            # Closed blocks no longer map the shared memory
+            self.assertTrue(all(block.buf is None for block in attached))
+        finally:
+            for block in shared_blocks:
+                block.close()
+                block.unlink()
+
+    def test_seed_solutions_include_greedy_plans(self):
+        """Test that greedy seeds are built when there is no previous solution"""
+        problem = self.optimizer.build_problem()
+        seeds = self.optimizer._seed_solutions(problem, np.random.default_rng(0))
+
+        self.assertEqual(seeds.shape[1], 4)
+        self.assertGreaterEqual(len(seeds), 1)
+        # Every seed keeps the only suitable berth for the first three ships
+        np.testing.assert_array_equal(seeds[:, :3], np.tile([0, 0, 1], (len(seeds), 1)))
+
+    def test_warm_start_repairs_added_and_removed_ships(self):
+        """Test that the previous best assignment is repaired for a changed ship list"""
+        self.optimizer.config.greedy_seeding = False
+        self.optimizer.genetic_algorithm_optimization()
+        self.assertEqual(len(self.optimizer.best_assignment), 4)
+
+        new_ship = Ship(id="SHIP_005", arrival_time=self.base_time, ship_type="tanker",
+                        size=30000, containers_to_load=0, containers_to_unload=0)
+        self.optimizer.clear()
+        self.optimizer.add_ships(self.ships[1:] + [new_ship])
+        self.optimizer.add_berths(self.berths)
+
+        problem = self.optimizer.build_problem()
+        seeds = self.optimizer._seed_solutions(problem, np.random.default_rng(0))
+
+        self.assertEqual(seeds.shape, (1, 4))
+        # Kept ships retain their berths, the new tanker is repaired onto B1
+        np.testing.assert_array_equal(seeds[0, :2], [0, 1])
+        self.assertEqual(seeds[0, 3], 1)
+
+    def test_stagnation_window_stops_early(self):
+        """Test early stopping when the best fitness stops improving"""
+        self.optimizer.config.max_iterations = 1000
+        self.optimizer.config.convergence_threshold = 0.0
+        self.optimizer.config.stagnation_window = 5
+        problem = self.optimizer.build_problem()
+        rng = np.random.default_rng(0)
+
+        result = self.optimizer._evolve(problem, problem.random_genes(20, rng), 1000, rng)
+
+        self.assertTrue(result.converged)
+        self.assertLess(result.generations, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
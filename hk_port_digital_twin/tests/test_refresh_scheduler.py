@@ -0,0 +1,157 @@
+# Test suite for the asyncio refresh scheduler
+# Tests for refresh_scheduler.py and RealTimeDataManager's refresh jobs
+
+import os
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+try:
+    from src.utils.refresh_scheduler import RefreshScheduler, RefreshJob
+    from src.utils import data_loader
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.refresh_scheduler import RefreshScheduler, RefreshJob
+    from src.utils import data_loader
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = RefreshScheduler(max_workers=2)
+    yield scheduler
+    scheduler.stop()
+
+
+class TestRefreshScheduler:
+    """Test periodic, triggered and failing refresh jobs"""
+
+    def test_periodic_job_runs_in_executor(self, scheduler):
+        threads = []
+        scheduler.add_job('periodic', lambda: threads.append(threading.current_thread().name), interval=0.05)
+        scheduler.start()
+
+        assert wait_for(lambda: scheduler.get_status()['jobs']['periodic']['runs'] >= 3)
+        assert all(name.startswith('refresh-scheduler-worker') for name in threads)
+        status = scheduler.get_status()
+        assert status['running']
+        assert status['jobs']['periodic']['last_error'] is None
+
+    def test_triggered_job_runs_only_when_triggered(self, scheduler):
+        runs = []
+        scheduler.add_job('on_change', lambda: runs.append(1))
+        assert not scheduler.trigger('on_change')
+        scheduler.start()
+
+        time.sleep(0.1)
+        assert runs == []
+        assert scheduler.trigger('on_change')
+        assert wait_for(lambda: len(runs) == 1)
+        assert not scheduler.trigger('unknown')
+
+    def test_failures_back_off_with_jitter(self, scheduler):
+        def fail():
+            raise RuntimeError("feed unavailable")
+
+        job = scheduler.add_job('failing', fail, interval=60, backoff_base=10, backoff_max=30, jitter=0.1)
+        with patch('random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            scheduler.start()
+            # Triggering the job skips the wait, so every retry delay is checked without sleeping
+            for failures, delay in [(1, 11), (2, 22), (3, 33), (4, 33)]:
+                if failures > 1:
+                    assert scheduler.trigger('failing')
+                assert wait_for(lambda: job.consecutive_failures == failures and job.next_run is not None)
+                assert job.retry_delay() == pytest.approx(delay)
+                assert delay - 1 < (job.next_run - datetime.now()).total_seconds() <= delay
+
+        mock_uniform.assert_called_with(0.9, 1.1)
+        assert scheduler.get_status()['jobs']['failing']['last_error'] == "feed unavailable"
+
+    def test_retry_delay_is_bounded(self):
+        job = RefreshJob(name='job', func=lambda: None, backoff_base=10, backoff_max=60, jitter=0.2)
+        job.consecutive_failures = 1
+        assert 8 <= job.retry_delay() <= 12
+        job.consecutive_failures = 10
+        assert 48 <= job.retry_delay() <= 72
+
+    def test_deadline_and_cancellation(self, scheduler):
+        release = threading.Event()
+        job = scheduler.add_job('slow', lambda: release.wait(5), interval=0.05, timeout=0.05, backoff_base=0.05)
+        scheduler.start()
+
+        assert wait_for(lambda: job.timeouts >= 1)
+        assert 'deadline' in job.status()['last_error']
+        # The timed-out run still occupies the executor, so no second run starts on top of it
+        assert wait_for(lambda: job.failures >= 2)
+        assert job.timeouts == 1
+
+        assert scheduler.cancel('slow')
+        assert wait_for(lambda: job.task.done())
+        assert scheduler.get_status()['jobs']['slow']['cancelled']
+        release.set()
+
+    def test_duplicate_jobs_rejected_and_stop(self, scheduler):
+        scheduler.add_job('job', lambda: None, interval=1)
+        with pytest.raises(ValueError):
+            scheduler.add_job('job', lambda: None)
+        scheduler.start()
+        assert scheduler.stop()
+        assert not scheduler.get_status()['running']
+
+
+class TestRealTimeDataManagerScheduling:
+    """Test RealTimeDataManager's refresh jobs"""
+
+    def test_manager_runs_refreshes_on_scheduler(self):
+        config = data_loader.RealTimeDataConfig(enable_file_monitoring=False, vessel_update_interval=3600)
+        with patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'}), \
+                patch.object(data_loader.RealTimeDataManager, '_update_vessel_data') as mock_vessel, \
+                patch.object(data_loader, 'load_port_cargo_statistics', return_value={'Table_1_Eng': None}):
+            manager = data_loader.RealTimeDataManager(config)
+            manager.start_real_time_updates()
+            try:
+                assert wait_for(lambda: mock_vessel.call_count == 1)
+                jobs = manager.get_status()['scheduler_status']['jobs']
+                assert set(jobs) == {'vessel_data', 'cargo_statistics'}
+                assert jobs['vessel_data']['interval'] == 3600
+
+                # File changes are handed to the scheduler
+                manager._on_vessel_file_change('Arrived_in_last_36_hours.xml')
+                manager._on_cargo_file_change('Table_1_Eng.CSV')
+                assert wait_for(lambda: mock_vessel.call_count == 2)
+                assert wait_for(lambda: 'cargo_statistics' in manager.data_cache)
+            finally:
+                manager.stop_real_time_updates()
+        assert not manager.scheduler.is_running
+
+    def test_failed_vessel_refresh_backs_off(self):
+        config = data_loader.RealTimeDataConfig(enable_file_monitoring=False, vessel_update_interval=3600)
+        with patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'}), \
+                patch.object(data_loader, 'load_all_vessel_data', side_effect=RuntimeError("corrupt feed")), \
+                patch.object(data_loader, 'load_port_cargo_statistics', return_value={'Table_1_Eng': None}):
+            manager = data_loader.RealTimeDataManager(config)
+            # The error reaches the scheduler after the circuit breaker counted it
+            with pytest.raises(RuntimeError):
+                manager._update_vessel_data()
+            assert manager.error_counts['vessel_update'] == 1
+
+            manager.start_real_time_updates()
+            try:
+                job = manager.scheduler.jobs['vessel_data']
+                assert wait_for(lambda: job.consecutive_failures == 1 and job.next_run is not None)
+                assert job.last_error == "corrupt feed"
+                # The retry comes after the backoff, not the refresh interval
+                assert (job.next_run - datetime.now()).total_seconds() < 60 * (1 + job.jitter)
+                assert manager.error_counts['vessel_update'] == 2
+            finally:
+                manager.stop_real_time_updates()
@@ -0,0 +1,156 @@
+# Test suite for single-flight loading
+# Tests for single_flight.py and the data_loader caches that use it
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+try:
+    from src.utils.single_flight import SingleFlight, single_flight
+    from src.utils import data_loader
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.single_flight import SingleFlight, single_flight
+    from src.utils import data_loader
+
+
+def run_concurrently(function, count=8):
+    """Call function from count threads at once and return the results"""
+    results = [None] * count
+    errors = []
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = function()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def slow_computation(calls, value='value', delay=0.2):
+    def compute():
+        calls.append(1)
+        time.sleep(delay)
+        return value
+    return compute
+
+
+class TestSingleFlight:
+    """Test deduplication of concurrent computations"""
+
+    def test_concurrent_callers_share_one_computation(self):
+        group = SingleFlight()
+        calls = []
+
+        results, errors = run_concurrently(lambda: group.do('key', slow_computation(calls)))
+
+        assert errors == []
+        assert results == ['value'] * 8
+        assert len(calls) == 1
+        stats = group.get_stats()
+        assert stats['shared'] == 7
+        assert stats['in_flight'] == 0
+
+        # Later calls compute again
+        group.do('key', slow_computation(calls, delay=0))
+        assert len(calls) == 2
+
+    def test_failures_reach_every_waiter(self):
+        group = SingleFlight()
+
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("feed unavailable")
+
+        results, errors = run_concurrently(lambda: group.do('key', fail), count=4)
+        assert len(errors) == 4
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert group.get_stats()['executions'] == 1
+
+    def test_nested_call_for_own_key_does_not_deadlock(self):
+        group = SingleFlight()
+        assert group.do('key', lambda: group.do('key', lambda: 1) + 1) == 2
+
+    def test_stale_value_served_while_revalidating(self):
+        group = SingleFlight()
+        calls = []
+        assert group.get('key', slow_computation(calls, 'old', delay=0), max_age=60) == 'old'
+        assert group.get('key', slow_computation(calls, 'new', delay=0), max_age=60) == 'old'
+        assert len(calls) == 1
+
+        with patch('time.time', return_value=time.time() + 120):
+            results, errors = run_concurrently(
+                lambda: group.get('key', slow_computation(calls, 'new'), max_age=60, stale_while_revalidate=True))
+        assert results == ['old'] * 8
+
+        # A single background refresh computes the new value
+        deadline = time.time() + 5
+        while group.get_stats()['in_flight'] and time.time() < deadline:
+            time.sleep(0.01)
+        assert group.get('key', slow_computation(calls, 'other', delay=0), max_age=60) == 'new'
+        assert len(calls) == 2
+        assert group.get_stats()['stale_served'] == 8
+
+    def test_decorator_shares_copies(self):
+        calls = []
+
+        @single_flight(share=lambda df: df.copy())
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return pd.DataFrame({'value': [1, 2]})
+
+        results, errors = run_concurrently(load, count=4)
+        assert len(calls) == 1
+        results[0].loc[0, 'value'] = 99
+        assert results[1].loc[0, 'value'] == 1
+        assert load.single_flight.get_stats()['shared'] == 3
+
+
+class TestDataLoaderSingleFlight:
+    """Test concurrent misses in the data loader caches"""
+
+    def test_parse_cache_misses_share_one_parse(self, tmp_path):
+        csv_file = tmp_path / 'throughput.csv'
+        csv_file.write_text('year,teus\n2023,100\n2024,120\n')
+        cache = data_loader.ParseCache()
+        parses = []
+
+        def parse():
+            parses.append(1)
+            time.sleep(0.2)
+            return pd.read_csv(csv_file)
+
+        results, errors = run_concurrently(lambda: cache.get_or_parse('throughput', [csv_file], parse))
+        assert errors == []
+        assert len(parses) == 1
+        assert cache.get_stats()['misses'] == 1
+
+        # Every caller gets its own frame
+        results[0].loc[0, 'teus'] = -1
+        assert results[1].loc[0, 'teus'] == 100
+
+    def test_concurrent_vessel_loads_share_one_load(self):
+        load_in_parallel = data_loader._load_in_parallel
+
+        def slow_load(*args, **kwargs):
+            time.sleep(0.2)
+            return load_in_parallel(*args, **kwargs)
+
+        with patch.object(data_loader, '_load_in_parallel', side_effect=slow_load) as mock_load:
+            results, errors = run_concurrently(data_loader.load_all_vessel_data, count=4)
+        assert errors == []
+        assert mock_load.call_count == 1
+        assert all(set(result) == set(results[0]) for result in results)
@@ -0,0 +1,134 @@
+# Test suite for the on-disk statistics table cache
+# Tests for table_cache.py and its use by the data_loader statistics loaders
+
+import os
+
+import pytest
+import pandas as pd
+
+try:
+    from src.utils.table_cache import TableCache, TABLE_CACHE_FORMAT_VERSION
+    from src.utils import data_loader, table_cache
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.table_cache import TableCache, TABLE_CACHE_FORMAT_VERSION
+    from src.utils import data_loader, table_cache
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'raw' / 'throughput.csv'
+    path.parent.mkdir()
+    path.write_text('Year,Month,TEUs\n2024,Jan,100\n2024,Feb,120\n')
+    return path
+
+
+def read_source(path):
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Year'].astype(str) + '-' + df['Month'], format='%Y-%b')
+    return df.set_index('Date')
+
+
+class TestTableCache:
+    """Test materializing and validating cached tables"""
+
+    def test_round_trip_keeps_index_and_dtypes(self, tmp_path, source_file):
+        cache = TableCache(tmp_path / 'cache')
+        table = read_source(source_file)
+        cache.save('throughput', table, [source_file])
+
+        loaded = TableCache(tmp_path / 'cache').load('throughput', [source_file])
+
+        pd.testing.assert_frame_equal(loaded, table)
+        manifest = cache.read_manifest()
+        assert manifest['format_version'] == TABLE_CACHE_FORMAT_VERSION
+        assert manifest['tables']['throughput']['rows'] == 2
+        assert str(source_file) in manifest['tables']['throughput']['sources']
+
+    def test_tables_follow_source_changes(self, tmp_path, source_file):
+        cache = TableCache(tmp_path / 'cache')
+        builds = []
+
+        def build():
+            builds.append(1)
+            return read_source(source_file)
+
+        cache.load_or_build('throughput', [source_file], build)
+        cache.load_or_build('throughput', [source_file], build)
+        assert len(builds) == 1
+
+        # Touching the file without changing it keeps the cached table
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        cache.load_or_build('throughput', [source_file], build)
+        assert len(builds) == 1
+
+        source_file.write_text('Year,Month,TEUs\n2024,Jan,100\n2024,Feb,130\n')
+        rebuilt = cache.load_or_build('throughput', [source_file], build)
+        assert len(builds) == 2
+        assert rebuilt['TEUs'].iloc[-1] == 130
+        assert cache.stats == {'hits': 2, 'misses': 2, 'builds': 2}
+
+    def test_empty_results_are_not_cached(self, tmp_path, source_file):
+        cache = TableCache(tmp_path / 'cache')
+        cache.load_or_build('failed', [source_file], pd.DataFrame)
+
+        assert 'failed' not in cache.read_manifest()['tables']
+        assert cache.load('failed', [source_file]) is None
+
+
+class TestDataLoaderIntegration:
+    """Test the statistics loaders read through the table cache"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_caches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_loader, 'table_cache', TableCache(tmp_path / 'tables'))
+        monkeypatch.setenv('TABLE_CACHE_ENABLED', 'true')
+        data_loader.parse_cache.clear()
+        yield
+        data_loader.parse_cache.clear()
+
+    def test_cached_tables_match_raw_loaders(self):
+        expected_throughput = data_loader._read_container_throughput()
+        if expected_throughput.empty:
+            pytest.skip("Container throughput data not available")
+
+        summary = data_loader.build_table_cache()
+        assert summary['container_throughput'] == len(expected_throughput)
+
+        data_loader.parse_cache.clear()
+        throughput = data_loader.load_container_throughput()
+        cargo_stats = data_loader.load_port_cargo_statistics()
+
+        assert data_loader.table_cache.stats['hits'] >= 1 + len(cargo_stats)
+        pd.testing.assert_frame_equal(throughput, expected_throughput)
+        for table_name, table in cargo_stats.items():
+            csv_file = next(path for path in data_loader._cargo_statistics_files() if path.stem.endswith(table_name))
+            expected = data_loader._clean_cargo_statistics_data(
+                data_loader._read_cargo_statistics_csv(csv_file, table_name), table_name
+            )
+            pd.testing.assert_frame_equal(table, expected)
+
+    def test_disabled_cache_reads_raw_files(self, monkeypatch):
+        monkeypatch.setenv('TABLE_CACHE_ENABLED', 'false')
+
+        data_loader.load_container_throughput()
+
+        assert data_loader.table_cache.stats == {'hits': 0, 'misses': 0, 'builds': 0}
+        assert data_loader.build_table_cache() == {}
+
+    def test_missing_pyarrow_disables_cache_with_one_warning(self, monkeypatch, caplog):
+        monkeypatch.setattr(table_cache, 'feather', None)
+        monkeypatch.setattr(table_cache, '_pyarrow_warning_logged', False)
+
+        with caplog.at_level('WARNING', logger=table_cache.logger.name):
+            assert not table_cache.table_cache_enabled()
+            data_loader.load_container_throughput()
+
+        assert data_loader.table_cache.stats == {'hits': 0, 'misses': 0, 'builds': 0}
+        assert [record.message for record in caplog.records].count(
+            "pyarrow is not installed - the statistics table cache is disabled "
+            "and tables are parsed from the raw files") == 1
@@ -0,0 +1,115 @@
+# Test suite for the vessel snapshot diff engine
+# Tests for vessel_diff.py and the deltas RealTimeDataManager publishes
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+try:
+    from src.utils.vessel_diff import VesselDiffEngine, diff_vessel_snapshots
+    from src.utils import data_loader
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.vessel_diff import VesselDiffEngine, diff_vessel_snapshots
+    from src.utils import data_loader
+
+
+def make_snapshot(rows):
+    df = pd.DataFrame(rows, columns=['call_sign', 'source_file', 'timestamp', 'current_location', 'ship_category'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['ship_category'] = df['ship_category'].astype('category')
+    return df
+
+
+@pytest.fixture
+def previous():
+    return make_snapshot([
+        ['VESSEL1', 'Arrived_in_last_36_hours.xml', '2024-01-01 08:00', 'KWAI TSING', 'container'],
+        ['VESSEL2', 'Arrived_in_last_36_hours.xml', '2024-01-01 09:00', 'WESTERN ANCHORAGE', 'tanker'],
+        ['VESSEL3', 'Expected_arrivals.xml', None, None, 'bulk_carrier'],
+    ])
+
+
+class TestDiffVesselSnapshots:
+    """Test inserted, updated and removed rows between snapshots"""
+
+    def test_first_snapshot_is_all_inserted(self, previous):
+        delta = diff_vessel_snapshots(None, previous)
+        assert delta.summary()['inserted'] == 3
+        assert delta.updated.empty and delta.removed.empty
+
+    def test_identical_snapshot_has_no_changes(self, previous):
+        # Missing timestamps and locations compare equal; row order does not matter
+        current = previous.iloc[::-1].copy()
+        current['ship_category'] = current['ship_category'].astype(str).astype('category')
+        assert diff_vessel_snapshots(previous, current).is_empty
+
+    def test_changes_are_classified(self, previous):
+        current = make_snapshot([
+            ['VESSEL1', 'Arrived_in_last_36_hours.xml', '2024-01-01 08:00', 'KWAI TSING', 'container'],
+            ['VESSEL2', 'Arrived_in_last_36_hours.xml', '2024-01-01 09:00', 'KWAI TSING', 'tanker'],
+            ['VESSEL4', 'Arrived_in_last_36_hours.xml', '2024-01-01 10:00', 'KWAI TSING', 'container'],
+        ])
+        delta = diff_vessel_snapshots(previous, current)
+
+        assert delta.inserted['call_sign'].tolist() == ['VESSEL4']
+        assert delta.updated['call_sign'].tolist() == ['VESSEL2']
+        assert delta.updated['current_location'].tolist() == ['KWAI TSING']
+        assert delta.removed['call_sign'].tolist() == ['VESSEL3']
+        assert delta.for_source('Expected_arrivals.xml').summary()['removed'] == 1
+        assert delta.for_source('Expected_arrivals.xml').inserted.empty
+
+    def test_missing_key_column_rejected(self, previous):
+        with pytest.raises(ValueError):
+            diff_vessel_snapshots(previous, previous.drop(columns=['source_file']))
+
+    def test_engine_tracks_snapshots(self, previous):
+        engine = VesselDiffEngine()
+        assert engine.update(previous).summary() == {'sequence': 1, 'inserted': 3, 'updated': 0, 'removed': 0}
+        assert engine.update(previous.iloc[:2]).summary() == {'sequence': 2, 'inserted': 0, 'updated': 0, 'removed': 1}
+        stats = engine.get_stats()
+        assert stats['snapshots'] == 2
+        assert stats['tracked_vessels'] == 2
+
+
+class TestRealTimeVesselChanges:
+    """Test that vessel refreshes hand subscribers only the changed rows"""
+
+    def test_refresh_publishes_deltas(self, tmp_path):
+        for xml_file in data_loader.VESSEL_XML_FILES:
+            shutil.copy(data_loader.VESSEL_DATA_DIR / xml_file, tmp_path)
+
+        config = data_loader.RealTimeDataConfig(enable_file_monitoring=False, enable_vessel_history=False)
+        with patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'}), \
+                patch.object(data_loader, 'VESSEL_DATA_DIR', Path(tmp_path)):
+            manager = data_loader.RealTimeDataManager(config)
+            deltas = []
+            manager.register_update_callback('vessel_changes', deltas.append)
+
+            manager._update_vessel_data()
+            assert len(deltas) == 1
+            assert len(deltas[0].inserted) == len(manager.data_cache['vessel_combined'])
+
+            # Touching a file without changing its vessels notifies nobody
+            arrivals_file = Path(tmp_path) / 'Arrived_in_last_36_hours.xml'
+            stat = arrivals_file.stat()
+            os.utime(arrivals_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            manager._update_vessel_data()
+            assert len(deltas) == 1
+
+            # Moving one arrived vessel yields a one-row update
+            content = arrivals_file.read_text()
+            arrivals_file.write_text(content.replace('SOUTH LAMMA DG ANCHORAGE', 'KWAI TSING', 1))
+            os.utime(arrivals_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+            manager._update_vessel_data()
+
+        assert len(deltas) == 2
+        assert deltas[1].summary() == {'sequence': 3, 'inserted': 0, 'updated': 1, 'removed': 0}
+        assert deltas[1].updated['current_location'].tolist() == ['KWAI TSING']
+        assert deltas[1].for_source('Departed_in_last_36_hours.xml').is_empty
+        assert manager.get_status()['vessel_changes']['last_delta']['sequence'] == 3
@@ -0,0 +1,170 @@
+# Test suite for the vessel history store
+# Tests for vessel_history.py and its ingest from the data loader
+
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+try:
+    from src.utils.vessel_history import VesselHistoryStore
+    from src.utils import data_loader
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from src.utils.vessel_history import VesselHistoryStore
+    from src.utils import data_loader
+
+ARRIVALS = 'Arrived_in_last_36_hours.xml'
+
+
+def make_snapshot(rows):
+    df = pd.DataFrame(rows, columns=['call_sign', 'source_file', 'timestamp', 'current_location', 'ship_category'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VesselHistoryStore(tmp_path / 'history' / 'vessel_history.sqlite3')
+    yield store
+    store.close()
+
+
+class TestVesselHistoryStore:
+    """Test deduplicated ingest and range/group-by queries"""
+
+    def test_ingest_deduplicates_movements(self, store):
+        first = make_snapshot([
+            ['VESSEL1', ARRIVALS, '2024-01-01 08:00', 'KWAI TSING', 'container'],
+            ['VESSEL2', ARRIVALS, '2024-01-01 09:00', 'WESTERN ANCHORAGE', 'tanker'],
+            ['VESSEL3', 'Expected_arrivals.xml', None, None, 'bulk_carrier'],
+        ])
+        # VESSEL3 has no movement time and cannot be keyed
+        assert store.ingest(first, observed_at=datetime(2024, 1, 1, 10)) == {'rows': 2, 'inserted': 2, 'rejected': 1}
+
+        # The next snapshot repeats VESSEL2 (moved) and adds a later call of VESSEL1
+        second = make_snapshot([
+            ['VESSEL2', ARRIVALS, '2024-01-01 09:00', 'KWAI TSING', 'tanker'],
+            ['VESSEL1', ARRIVALS, '2024-01-03 07:00', 'KWAI TSING', 'container'],
+        ])
+        assert store.ingest(second, observed_at=datetime(2024, 1, 3, 10)) == {'rows': 2, 'inserted': 1, 'rejected': 0}
+
+        stats = store.get_stats()
+        assert stats['movements'] == 3
+        assert stats['vessels'] == 2
+        assert stats['rejected'] == 1
+        vessel2 = store.vessel_calls('VESSEL2')
+        assert vessel2['current_location'].tolist() == ['KWAI TSING']
+        assert vessel2['times_seen'].tolist() == [2]
+        assert vessel2['first_seen'].tolist() == ['2024-01-01 10:00:00']
+
+    def test_range_and_group_by_queries(self, store):
+        store.ingest(make_snapshot([
+            ['VESSEL1', ARRIVALS, '2024-01-01 08:00', 'KWAI TSING', 'container'],
+            ['VESSEL2', ARRIVALS, '2024-01-01 09:00', 'WESTERN ANCHORAGE', 'tanker'],
+            ['VESSEL1', ARRIVALS, '2024-01-03 07:00', 'KWAI TSING', 'container'],
+            ['VESSEL1', 'Departed_in_last_36_hours.xml', '2024-01-01 20:00', 'KWAI TSING', 'container'],
+        ]))
+
+        calls = store.vessel_calls('VESSEL1', start='2024-01-01', end='2024-01-02')
+        assert calls['source_file'].tolist() == [ARRIVALS, 'Departed_in_last_36_hours.xml']
+        assert len(store.query(location='KWAI TSING', source_file=ARRIVALS)) == 2
+
+        daily = store.daily_counts()
+        assert daily['count'].tolist() == [2, 1]
+        assert daily['date'].tolist() == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03')]
+        by_category = store.daily_counts(start='2024-01-01', end='2024-01-02', by='ship_category')
+        assert by_category[['ship_category', 'count']].values.tolist() == [['container', 1], ['tanker', 1]]
+        with pytest.raises(ValueError):
+            store.daily_counts(by='timestamp; DROP TABLE vessel_movements')
+
+    def test_queries_use_indexes(self, store):
+        store.ingest(make_snapshot([['VESSEL1', ARRIVALS, '2024-01-01 08:00', 'KWAI TSING', 'container']]))
+        connection = store._connect()
+        for sql, params in [
+            ("SELECT * FROM vessel_movements WHERE call_sign = ? AND timestamp >= ?", ('VESSEL1', '2024')),
+            ("SELECT * FROM vessel_movements WHERE current_location = ?", ('KWAI TSING',)),
+            ("SELECT COUNT(*) FROM vessel_movements WHERE source_file = ? AND timestamp >= ?", (ARRIVALS, '2024')),
+        ]:
+            plan = ' '.join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+            assert 'USING' in plan and 'INDEX' in plan, plan
+
+
+class TestVesselHistoryIngest:
+    """Test backfilling from feed backups and recording refreshed feed files"""
+
+    def test_backfill_from_backups(self, store, tmp_path):
+        feed_dir, backup_dir = tmp_path / 'feeds', tmp_path / 'backups'
+        feed_dir.mkdir()
+        backup_dir.mkdir()
+        shutil.copy(data_loader.VESSEL_DATA_DIR / ARRIVALS, feed_dir)
+        shutil.copy(data_loader.VESSEL_DATA_DIR / ARRIVALS, backup_dir / 'Arrived_in_last_36_hours_20250820_101500.xml')
+        (backup_dir / 'notes.xml').write_text('<notes/>')
+
+        with patch.object(data_loader, 'vessel_history', store), \
+                patch.object(data_loader, 'VESSEL_DATA_DIR', feed_dir):
+            result = data_loader.backfill_vessel_history(backup_dir)
+            # The backup and the current feed are the same file, so it is only ingested once
+            assert result['files'] == 1 and result['skipped'] == 1
+            assert data_loader.backfill_vessel_history(backup_dir) == {'files': 0, 'skipped': 2, 'inserted': 0,
+                                                                       'rejected': 0}
+
+        history = store.query(source_file=ARRIVALS)
+        assert len(history) == result['inserted'] > 0
+        assert set(history['first_seen']) == {'2025-08-20 10:15:00'}
+
+    def test_refresh_records_changed_files(self, store, tmp_path):
+        for xml_file in data_loader.VESSEL_XML_FILES:
+            shutil.copy(data_loader.VESSEL_DATA_DIR / xml_file, tmp_path)
+
+        config = data_loader.RealTimeDataConfig(enable_file_monitoring=False)
+        with patch.dict(os.environ, {'VESSEL_DATA_PIPELINE_ENABLED': 'false'}), \
+                patch.object(data_loader, 'vessel_history', store), \
+                patch.object(data_loader, 'VESSEL_DATA_DIR', Path(tmp_path)):
+            manager = data_loader.RealTimeDataManager(config)
+            manager._update_vessel_data()
+            first = store.get_stats()
+            assert first['movements'] > 0
+            assert first['snapshots'] == len(data_loader.VESSEL_XML_FILES)
+
+            # A restarted manager sees the same files and records no new sightings
+            data_loader.RealTimeDataManager(config)._update_vessel_data()
+            assert store.get_stats()['rows_ingested'] == first['rows_ingested']
+
+            arrivals_file = Path(tmp_path) / ARRIVALS
+            arrivals_rows = len(store.query(source_file=ARRIVALS))
+            stat = arrivals_file.stat()
+            arrivals_file.write_text(arrivals_file.read_text().replace('SOUTH LAMMA DG ANCHORAGE', 'KWAI TSING', 1))
+            os.utime(arrivals_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            manager._update_vessel_data()
+
+        # Only the edited file is ingested again; every arrival is seen a second time
+        stats = store.get_stats()
+        assert stats['snapshots'] == first['snapshots'] + 1
+        assert stats['movements'] == first['movements']
+        assert stats['rows_ingested'] == first['rows_ingested'] + arrivals_rows
+        arrivals = store.query(source_file=ARRIVALS)
+        assert set(arrivals['times_seen']) == {2}
+        assert 'KWAI TSING' in arrivals['current_location'].tolist()
+
+    def test_untimed_feed_rows_are_rejected(self, store):
+        # The departure feeds carry their times in fields the parser does not read
+        departures = 'Departed_in_last_36_hours.xml'
+        vessel_df = data_loader.load_vessel_data_from_xml(data_loader.VESSEL_DATA_DIR / departures)
+        untimed = int(vessel_df['timestamp'].isna().sum())
+        assert untimed > 0
+
+        with patch.object(data_loader, 'vessel_history', store):
+            result = data_loader._ingest_vessel_feed_snapshot(data_loader.VESSEL_DATA_DIR / departures, departures,
+                                                              datetime(2025, 8, 20, 10))
+            assert data_loader._ingest_vessel_feed_snapshot(data_loader.VESSEL_DATA_DIR / departures, departures,
+                                                            datetime(2025, 8, 20, 11)) is None
+
+        assert result['rejected'] == untimed
+        assert result['rows'] == len(vessel_df) - untimed
+        assert len(store.query(source_file=departures)) == result['rows']